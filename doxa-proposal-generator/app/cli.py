@@ -0,0 +1,233 @@
+"""Command-line interface for bulk proposal generation.
+
+    python -m app.cli generate leads.jsonl [more.csv ...] --manifest run.jsonl
+
+Leads are read as a stream from JSONL (one ``ProposalInput`` object per
+line) or CSV (a header row with the ``ProposalInput`` field names) and
+generated across worker processes.  At most ``--max-in-flight`` leads are
+queued at once, so memory stays flat however large the input is.
+
+One JSON line per lead is appended to the manifest as soon as it
+finishes.  Re-running with the same manifest skips every lead already
+recorded as successful — leads are matched by input fingerprint, not by
+position — so a crashed run resumes where it stopped and failed leads
+are retried.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+from pydantic import ValidationError
+
+from app.config import BATCH_MAX_WORKERS
+from app.models.proposal import ALL_FORMATS, OutputFormat, ProposalInput
+from app.services.batch import _format_validation
+from app.services.cache import input_fingerprint
+from app.services.generator import generate_proposal, prerender_static_sections
+
+# ── Input ────────────────────────────────────────────────────────────────────
+
+
+def _open_text(path: str) -> TextIO:
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    return open(path, encoding="utf-8-sig", newline="")
+
+
+def _input_kind(path: str, forced: Optional[str]) -> str:
+    if forced:
+        return forced
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_leads(path: str, kind: str) -> Iterator[tuple[str, Any]]:
+    """Yield ``(source, raw lead)`` pairs; *source* is ``path:line``.
+
+    Lines that are not valid JSON are yielded as the exception, so the
+    caller can record them as failures without stopping the stream.
+    """
+    with _open_text(path) as handle:
+        if kind == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                # Empty cells mean "not given", so defaults and validation apply.
+                lead = {k: v for k, v in row.items() if k and v not in ("", None)}
+                yield f"{path}:{reader.line_num}", lead
+            return
+        for line_no, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                yield f"{path}:{line_no}", json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield f"{path}:{line_no}", exc
+
+
+# ── Manifest ─────────────────────────────────────────────────────────────────
+
+
+def load_completed(manifest: Path) -> set[str]:
+    """Fingerprints of the leads a previous run generated successfully."""
+    done: set[str] = set()
+    if not manifest.exists():
+        return done
+    with manifest.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+            if entry.get("ok") and entry.get("fingerprint"):
+                done.add(entry["fingerprint"])
+    return done
+
+
+class _Manifest:
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = path.open("a", encoding="utf-8")
+        self.ok = 0
+        self.failed = 0
+
+    def write(self, entry: dict[str, Any]) -> None:
+        if entry["ok"]:
+            self.ok += 1
+        else:
+            self.failed += 1
+        self._handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        # Flushed per lead so a crash loses at most the leads in flight.
+        self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+# ── Generation ───────────────────────────────────────────────────────────────
+
+
+def _generate_lead(data: ProposalInput, formats: frozenset[OutputFormat]) -> dict[str, Any]:
+    """Worker entry point; returns only what the manifest records.
+
+    The full proposal stays in the worker — sending sections and Markdown
+    back for every lead would dominate the cost of a large run.
+    """
+    try:
+        output = generate_proposal(data, formats)
+    except Exception as exc:
+        return {"ok": False, "error": str(exc)}
+    return {
+        "ok": True,
+        "proposal_id": output.proposal_id,
+        "files": output.files.model_dump(exclude_none=True),
+    }
+
+
+def run_generate(args: argparse.Namespace) -> int:
+    manifest_path = Path(args.manifest)
+    done = load_completed(manifest_path)
+    formats = frozenset(OutputFormat(f) for f in args.formats) if args.formats else ALL_FORMATS
+    workers = args.workers or BATCH_MAX_WORKERS
+    max_in_flight = args.max_in_flight or workers * 4
+
+    manifest = _Manifest(manifest_path)
+    skipped = 0
+    started = time.perf_counter()
+    next_report = args.progress
+    in_flight: dict[Future, tuple[str, str]] = {}
+    pending: set[str] = set()
+
+    def drain(block_until: int) -> None:
+        nonlocal next_report
+        while len(in_flight) > block_until:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                source, fingerprint = in_flight.pop(future)
+                pending.discard(fingerprint)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    result = {"ok": False, "error": f"worker failed: {exc}"}
+                manifest.write({"source": source, "fingerprint": fingerprint, **result})
+                if result["ok"]:
+                    done.add(fingerprint)
+            total = manifest.ok + manifest.failed
+            if args.progress and total >= next_report:
+                next_report = total + args.progress
+                rate = total / (time.perf_counter() - started)
+                print(f"{total} done ({manifest.failed} failed), {rate:.1f}/s", file=sys.stderr)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=prerender_static_sections) as pool:
+            for path in args.inputs:
+                for source, raw in read_leads(path, _input_kind(path, args.input_format)):
+                    if isinstance(raw, Exception):
+                        manifest.write({"source": source, "ok": False, "error": f"invalid JSON: {raw}"})
+                        continue
+                    try:
+                        data = ProposalInput.model_validate(raw)
+                    except ValidationError as exc:
+                        manifest.write({"source": source, "ok": False, "error": _format_validation(exc)})
+                        continue
+                    fingerprint = input_fingerprint(data)
+                    if fingerprint in done or fingerprint in pending:
+                        skipped += 1
+                        continue
+                    pending.add(fingerprint)
+                    in_flight[pool.submit(_generate_lead, data, formats)] = (source, fingerprint)
+                    drain(max_in_flight - 1)
+            drain(0)
+    finally:
+        manifest.close()
+
+    elapsed = time.perf_counter() - started
+    processed = manifest.ok + manifest.failed
+    print(
+        f"generated {manifest.ok}, failed {manifest.failed}, skipped {skipped} "
+        f"in {elapsed:.1f}s ({processed / elapsed if elapsed else 0:.1f} leads/s); "
+        f"manifest: {manifest_path}",
+        file=sys.stderr,
+    )
+    return 1 if manifest.failed else 0
+
+
+# ── Entry point ──────────────────────────────────────────────────────────────
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="DOXA proposal tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="generate proposals from JSONL / CSV leads")
+    gen.add_argument("inputs", nargs="+", help="JSONL or CSV files ('-' reads JSONL from stdin)")
+    gen.add_argument("--manifest", required=True, help="results manifest (JSONL, appended)")
+    gen.add_argument("--input-format", choices=("jsonl", "csv"), help="default: by file extension")
+    gen.add_argument(
+        "--formats",
+        nargs="+",
+        choices=[f.value for f in OutputFormat],
+        help="artifacts to write (default: all)",
+    )
+    gen.add_argument("--workers", type=int, default=0, help="worker processes (default: BATCH_MAX_WORKERS)")
+    gen.add_argument("--max-in-flight", type=int, default=0, help="queued leads (default: 4 per worker)")
+    gen.add_argument("--progress", type=int, default=0, metavar="N", help="report every N leads")
+    gen.set_defaults(handler=run_generate)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
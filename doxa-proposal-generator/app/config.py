@@ -3,12 +3,13 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
-load_dotenv()
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# An explicit path skips python-dotenv's search up the call stack.
+load_dotenv(BASE_DIR / ".env")
 
 # --- Paths ---
-BASE_DIR = Path(__file__).resolve().parent.parent
-OUTPUT_DIR = BASE_DIR / "output"
-OUTPUT_DIR.mkdir(exist_ok=True)
+OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", str(BASE_DIR / "output")))
 
 # --- Server ---
 HOST = os.getenv("HOST", "0.0.0.0")
@@ -29,5 +30,124 @@ DEFAULT_SETUP_FEE_MAX = int(os.getenv("DEFAULT_SETUP_FEE_MAX", "10000"))
 DEFAULT_MONTHLY_MIN = int(os.getenv("DEFAULT_MONTHLY_MIN", "500"))
 DEFAULT_MONTHLY_MAX = int(os.getenv("DEFAULT_MONTHLY_MAX", "3000"))
 
+# --- Templates ---
+# Section and WhatsApp templates are read from this directory and
+# reloaded when a file changes, checked at most this often (0 disables).
+TEMPLATE_DIR = Path(os.getenv("TEMPLATE_DIR", str(BASE_DIR / "app" / "templates" / "text")))
+TEMPLATE_RELOAD_INTERVAL = float(os.getenv("TEMPLATE_RELOAD_INTERVAL", "2"))
+
 # --- Currency ---
 CURRENCY = os.getenv("CURRENCY", "USD")
+
+# --- Batch generation ---
+# Worker processes for CPU-bound rendering; 0 means one per CPU core.
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "0")) or os.cpu_count() or 1
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+
+# --- Interactive rendering ---
+# Worker processes that render PDFs for the generation routes, separate
+# from the batch pool; 0 means one per CPU core.
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "0")) or os.cpu_count() or 1
+
+# --- PDF output ---
+# "standard", or "compact" for smaller files that render faster (one-font
+# page branding, no redundant style changes; see app/services/pdf_export.py).
+PDF_PROFILE = os.getenv("PDF_PROFILE", "standard")
+
+# --- PDF streaming ---
+# Whether /generate/pdf also keeps a copy of the PDF in OUTPUT_DIR.
+PERSIST_STREAMED_PDF = os.getenv("PERSIST_STREAMED_PDF", "true").lower() in ("1", "true", "yes")
+
+# --- Result cache ---
+# Identical inputs reuse previously rendered Markdown / PDF / JSON.
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESULT_CACHE_MEMORY_ENTRIES = int(os.getenv("RESULT_CACHE_MEMORY_ENTRIES", "256"))
+# Optional disk tier shared by the workers on one host; 0 turns it off.
+# Keep it on local scratch, not on the (possibly network-mounted) output volume.
+RESULT_CACHE_DISK_MAX_BYTES = int(os.getenv("RESULT_CACHE_DISK_MAX_BYTES", "0"))
+CACHE_DIR = Path(os.getenv("RESULT_CACHE_DIR", "/tmp/doxa-result-cache"))
+
+# --- Local state (SQLite databases) ---
+STATE_DIR = OUTPUT_DIR / ".state"
+
+# --- Background jobs ---
+JOBS_DB_PATH = STATE_DIR / "jobs.sqlite3"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# "process" hands rendering to the shared process pool, so jobs use every
+# core and never hold the server's GIL; "thread" renders in the worker
+# threads themselves (single-process deployments, debugging).
+JOB_WORKER_MODE = os.getenv("JOB_WORKER_MODE", "process")
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+# A running job whose worker died is picked up again after this long ...
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+# ... at most this many times in all, so a job that crashes its worker fails.
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# --- Proposal index ---
+INDEX_DB_PATH = STATE_DIR / "proposals.sqlite3"
+
+# --- Artifact storage ---
+# "local" writes under OUTPUT_DIR; "object" uses a local object-store
+# stand-in (a directory that several replicas can mount and share).
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+# "date" (YYYY/MM/DD), "hash" (2-level hash prefix), "date+hash" or "flat".
+STORAGE_SHARDING = os.getenv("STORAGE_SHARDING", "date+hash")
+OBJECT_STORE_DIR = Path(os.getenv("OBJECT_STORE_DIR", str(BASE_DIR / "object-store")))
+# Artifacts are written to a temp file and renamed into place; with fsync
+# on they are also flushed to disk first, so a crash never leaves a
+# truncated artifact behind a published name.
+STORAGE_FSYNC = os.getenv("STORAGE_FSYNC", "true").lower() in ("1", "true", "yes")
+# Temp files left behind by interrupted writes are removed at start-up and
+# then every this many seconds, retention or not (0 = at start-up only).
+ORPHAN_CLEANUP_INTERVAL = float(os.getenv("ORPHAN_CLEANUP_INTERVAL", "3600"))
+
+# --- Retention (0 disables a limit) ---
+RETENTION_MAX_AGE_DAYS = float(os.getenv("RETENTION_MAX_AGE_DAYS", "0"))
+RETENTION_MAX_BYTES = int(os.getenv("RETENTION_MAX_BYTES", "0"))
+RETENTION_SWEEP_INTERVAL = float(os.getenv("RETENTION_SWEEP_INTERVAL", "3600"))
+
+# --- Admission control ---
+# Generation requests allowed to run at once, and to wait for a slot, per
+# work class.  PDF work defaults to two per render worker, so each worker
+# has its next job ready.  Past the queue limit requests get 429; a request
+# queued longer than ADMISSION_QUEUE_TIMEOUT seconds gets 503 (0 = no limit).
+ADMISSION_PDF_CONCURRENCY = int(os.getenv("ADMISSION_PDF_CONCURRENCY", "0")) or RENDER_WORKERS * 2
+ADMISSION_PDF_QUEUE = int(os.getenv("ADMISSION_PDF_QUEUE", "32"))
+ADMISSION_LIGHT_CONCURRENCY = int(os.getenv("ADMISSION_LIGHT_CONCURRENCY", "8"))
+ADMISSION_LIGHT_QUEUE = int(os.getenv("ADMISSION_LIGHT_QUEUE", "64"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+
+# --- Responses ---
+# Responses at least this large are gzip-compressed for clients that
+# accept it, except PDFs and ZIPs; 0 disables compression.
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "1024"))
+
+# --- Observability ---
+# Requests slower than this are logged with their stage breakdown; 0 disables.
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))
+
+# --- Memory profiling ---
+# Trace allocations with tracemalloc: peak memory per request and per stage
+# in /metrics, and snapshot diffs under /api/v1/admin/memory.  Slows
+# allocation-heavy code; turn on to investigate, not permanently.
+MEMORY_PROFILING = os.getenv("MEMORY_PROFILING", "false").lower() in ("1", "true", "yes")
+# Stack frames recorded per allocation; more gives fuller tracebacks in
+# diffs at a higher cost.
+MEMORY_TRACE_FRAMES = int(os.getenv("MEMORY_TRACE_FRAMES", "1"))
+# Snapshots kept for diffing; the oldest is dropped past this.
+MEMORY_SNAPSHOTS_KEPT = int(os.getenv("MEMORY_SNAPSHOTS_KEPT", "4"))
+
+# --- Start-up ---
+# Prime fpdf2 fonts, templates, pydantic and NumPy in the background at
+# start-up; /ready reports 503 until this has finished.
+WARM_UP = os.getenv("WARM_UP", "true").lower() in ("1", "true", "yes")
+
+
+def ensure_directories() -> None:
+    """Create the output and state directories.
+
+    Called by the server at start-up rather than on import, so importing
+    the configuration has no side effects on the filesystem.
+    """
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
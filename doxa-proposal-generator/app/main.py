@@ -2,11 +2,62 @@
 
 from __future__ import annotations
 
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
-from app.config import AGENCY_NAME, AGENCY_TAGLINE, HOST, PORT
+from app.config import (
+    AGENCY_NAME,
+    AGENCY_TAGLINE,
+    GZIP_MIN_BYTES,
+    HOST,
+    PORT,
+    SLOW_REQUEST_MS,
+    ensure_directories,
+)
+from app.routers.admin import router as admin_router
+from app.routers.pricing import router as pricing_router
 from app.routers.proposals import router as proposals_router
+from app.services import memory
+from app.services.admission import AdmissionRejected, light_admission, pdf_admission
+from app.services.compression import SelectiveGZipMiddleware
+from app.services.jobs import job_workers
+from app.services.metrics import (
+    CONTENT_TYPE,
+    HTTP_PEAK_MEMORY,
+    HTTP_REQUESTS,
+    HTTP_SECONDS,
+    render_latest,
+    trace_request,
+)
+from app.services.pool import shutdown_process_pool, shutdown_render_pool
+from app.services.storage import orphan_cleanup, retention_sweeper
+from app.services.warmup import warm_up
+
+logger = logging.getLogger("app.requests")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ensure_directories()
+    orphan_cleanup.start()
+    # Before warm-up forks the render pool, so its workers trace as well.
+    if memory.start():
+        logger.warning("Memory profiling is on (MEMORY_PROFILING); expect slower requests")
+    # Runs in the background; /ready flips once it is done.
+    warm_up.start()
+    job_workers.start()
+    retention_sweeper.start()
+    yield
+    retention_sweeper.stop()
+    orphan_cleanup.stop()
+    job_workers.stop()
+    shutdown_render_pool()
+    shutdown_process_pool()
+
 
 app = FastAPI(
     title=f"{AGENCY_NAME} Proposal Generator",
@@ -15,6 +66,7 @@ app = FastAPI(
         "Outputs Markdown, PDF, and JSON."
     ),
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,12 +75,55 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if GZIP_MIN_BYTES:
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=GZIP_MIN_BYTES)
+
+
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    """Per-request metrics, ``Server-Timing`` header and slow-request log."""
+    window = memory.open_window() if memory.tracing() else None
+    with trace_request() as timings:
+        response = await call_next(request)
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    elapsed = timings.elapsed
+    HTTP_REQUESTS.inc(method=request.method, route=path, status=str(response.status_code))
+    HTTP_SECONDS.observe(elapsed, method=request.method, route=path)
+    if window is not None:
+        # Stages that ran in the render pool peaked in another process.
+        peak = max(memory.close_window(window), *timings.memory.values(), 0)
+        HTTP_PEAK_MEMORY.observe(peak, method=request.method, route=path)
+        memory.record_peak("requests", f"{request.method} {path}", peak)
+    response.headers["Server-Timing"] = timings.server_timing()
+    if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+        logger.warning(
+            "Slow request %s %s: %.1fms status=%d %s",
+            request.method,
+            request.url.path,
+            elapsed * 1000,
+            response.status_code,
+            timings.breakdown() or "(no stages)",
+        )
+    return response
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    return JSONResponse(
+        {"detail": str(exc)},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 
 app.include_router(proposals_router, prefix="/api/v1")
+app.include_router(pricing_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
 
 
 @app.get("/", tags=["health"])
-def root() -> dict:
+async def root() -> dict:
     return {
         "service": f"{AGENCY_NAME} Proposal Generator",
         "tagline": AGENCY_TAGLINE,
@@ -38,8 +133,26 @@ def root() -> dict:
 
 
 @app.get("/health", tags=["health"])
-def health() -> dict:
-    return {"status": "ok"}
+async def health() -> dict:
+    """Liveness probe; ``async``, so it is answered on the event loop and
+    never waits behind busy worker threads.  Includes the admission
+    counters, for autoscalers that do not scrape ``/metrics``."""
+    return {
+        "status": "ok",
+        "admission": {"pdf": pdf_admission.status(), "light": light_admission.status()},
+    }
+
+
+@app.get("/ready", tags=["health"])
+async def ready() -> JSONResponse:
+    """Readiness probe: ``503`` until start-up warm-up has finished."""
+    return JSONResponse(warm_up.status(), status_code=200 if warm_up.ready else 503)
+
+
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    return Response(render_latest(), media_type=CONTENT_TYPE)
 
 
 if __name__ == "__main__":
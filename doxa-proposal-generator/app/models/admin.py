@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+# ── Memory profiling ─────────────────────────────────────────────────────────
+
+class MemorySnapshotInfo(BaseModel):
+    snapshot_id: int
+    taken_at: datetime
+    traced_bytes: int
+
+
+class MemoryStatus(BaseModel):
+    tracing: bool
+    trace_frames: int
+    traced_bytes: Optional[int] = None
+    rss_bytes: Optional[int] = None
+    # Highest peak seen since start-up, per "METHOD route" and per stage.
+    request_peaks: dict[str, int] = {}
+    stage_peaks: dict[str, int] = {}
+    snapshots: list[MemorySnapshotInfo] = []
+
+
+class MemoryGrouping(str, Enum):
+    lineno = "lineno"
+    filename = "filename"
+    traceback = "traceback"
+
+
+class MemoryDiffEntry(BaseModel):
+    # Most recent frame first, as "file:line".
+    traceback: list[str]
+    size_bytes: int
+    size_diff_bytes: int
+    count: int
+    count_diff: int
+
+
+class MemoryDiff(BaseModel):
+    base: int
+    # None: compared with the live allocations at request time.
+    target: Optional[int] = None
+    group_by: MemoryGrouping
+    # Net change over all allocation sites, not only the listed ones.
+    total_size_diff_bytes: int
+    entries: list[MemoryDiffEntry]
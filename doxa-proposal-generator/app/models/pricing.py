@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.config import (
+    CURRENCY,
+    DEFAULT_MONTHLY_MAX,
+    DEFAULT_MONTHLY_MIN,
+    DEFAULT_SETUP_FEE_MAX,
+    DEFAULT_SETUP_FEE_MIN,
+)
+
+
+# ── Pricing parameters ───────────────────────────────────────────────────────
+
+class PricingParameters(BaseModel):
+    """Inputs to the pricing formula; defaults are the configured values.
+
+    Override any of them to run what-if scenarios.  ``industry_multipliers``
+    entries are merged over the built-in table (keys are case-insensitive).
+    """
+
+    setup_fee_min: int = DEFAULT_SETUP_FEE_MIN
+    setup_fee_max: int = DEFAULT_SETUP_FEE_MAX
+    monthly_min: int = DEFAULT_MONTHLY_MIN
+    monthly_max: int = DEFAULT_MONTHLY_MAX
+    industry_multipliers: dict[str, float] = Field(default_factory=dict)
+    default_multiplier: Optional[float] = None
+    currency: str = CURRENCY
+
+
+# ── Batch quote ──────────────────────────────────────────────────────────────
+
+class BatchQuoteInput(BaseModel):
+    """Columnar batch of leads: ``industries[i]`` goes with
+    ``monthly_customers[i]``."""
+
+    industries: list[str] = Field(..., examples=[["Agriculture", "Finance"]])
+    monthly_customers: list[int] = Field(..., examples=[[500, 5000]])
+    parameters: PricingParameters = Field(default_factory=PricingParameters)
+
+    @model_validator(mode="after")
+    def _check_columns(self) -> BatchQuoteInput:
+        if len(self.industries) != len(self.monthly_customers):
+            raise ValueError("industries and monthly_customers must have the same length")
+        if any(v <= 0 for v in self.monthly_customers):
+            raise ValueError("monthly_customers must all be greater than 0")
+        return self
+
+
+class BatchQuoteOutput(BaseModel):
+    count: int
+    currency: str
+    setup_fee: list[int]
+    monthly_subscription: list[int]
+    usage_based_pricing: list[Optional[str]]
+    total_setup_fee: int
+    total_monthly_subscription: int
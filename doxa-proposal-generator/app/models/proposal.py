@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
+from enum import Enum
 from typing import Optional
 
 from pydantic import BaseModel, Field
@@ -8,6 +9,17 @@ from pydantic import BaseModel, Field
 
 # ── Request ──────────────────────────────────────────────────────────────────
 
+class OutputFormat(str, Enum):
+    """Artifacts that can be written for a proposal."""
+
+    markdown = "markdown"
+    pdf = "pdf"
+    json = "json"
+
+
+ALL_FORMATS: frozenset[OutputFormat] = frozenset(OutputFormat)
+
+
 class ProposalInput(BaseModel):
     """Structured input the client or sales team provides."""
 
@@ -41,6 +53,18 @@ class ProposalInput(BaseModel):
     )
 
 
+class ProposalUpdate(BaseModel):
+    """Fields to change on an existing proposal; omitted fields keep their
+    recorded value."""
+
+    company_name: Optional[str] = Field(None, min_length=1)
+    industry: Optional[str] = Field(None, min_length=1)
+    main_problem: Optional[str] = Field(None, min_length=10)
+    current_process: Optional[str] = Field(None, min_length=10)
+    desired_automation: Optional[str] = Field(None, min_length=10)
+    estimated_monthly_customers: Optional[int] = Field(None, gt=0, examples=[800])
+
+
 # ── Pricing ──────────────────────────────────────────────────────────────────
 
 class PricingRecommendation(BaseModel):
@@ -75,7 +99,120 @@ class ProposalOutput(BaseModel):
     files: ProposalFiles
 
 
+class ResponseView(str, Enum):
+    """How much of a generated proposal a response carries.
+
+    ``markdown`` holds the same text as the sections, so ``full`` sends
+    the content twice; the other views drop one or both copies.
+    """
+
+    full = "full"
+    sections = "sections"
+    markdown = "markdown"
+    metadata = "metadata"
+
+
+_SECTION_TEXT = frozenset(ProposalSections.model_fields) - {"pricing"}
+
+# ``exclude`` argument for ``model_dump_json`` per view.  ``metadata``
+# keeps the pricing summary, which is small and what list screens show.
+VIEW_EXCLUDES: dict[ResponseView, Optional[dict]] = {
+    ResponseView.full: None,
+    ResponseView.sections: {"markdown": True},
+    ResponseView.markdown: {"sections": True},
+    ResponseView.metadata: {"markdown": True, "sections": dict.fromkeys(sorted(_SECTION_TEXT), True)},
+}
+
+
 class ProposalFiles(BaseModel):
-    markdown_path: str
-    pdf_path: str
-    json_path: str
+    """Paths of the artifacts written for this proposal.
+
+    Only formats that were requested are produced; the others are ``None``.
+    """
+
+    markdown_path: Optional[str] = None
+    pdf_path: Optional[str] = None
+    json_path: Optional[str] = None
+
+
+# ── Revisions ────────────────────────────────────────────────────────────────
+
+class ProposalRevision(BaseModel):
+    """Result of updating an existing proposal in place."""
+
+    proposal: ProposalOutput
+    changed_fields: list[str]
+    # Sections rendered again; the others were reused from the previous
+    # revision.
+    recomputed_sections: list[str]
+
+
+# ── Export ───────────────────────────────────────────────────────────────────
+
+class ExportRequest(BaseModel):
+    """Proposals to bundle: the given ids, or else every proposal matching
+    the filters (all proposals when none are set)."""
+
+    ids: Optional[list[str]] = None
+    client: Optional[str] = None
+    industry: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    formats: list[OutputFormat] = [OutputFormat.pdf, OutputFormat.markdown]
+
+
+# ── Batch generation ─────────────────────────────────────────────────────────
+
+class BatchItemResult(BaseModel):
+    index: int
+    ok: bool
+    proposal: Optional[ProposalOutput] = None
+    error: Optional[str] = None
+
+
+class BatchOutput(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: list[BatchItemResult]
+
+
+# ── Background jobs ──────────────────────────────────────────────────────────
+
+class JobState(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: JobState
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    attempts: int = 0
+    proposal_id: Optional[str] = None
+    files: Optional[ProposalFiles] = None
+    links: dict[str, str] = {}
+    error: Optional[str] = None
+
+
+# ── Proposal index ───────────────────────────────────────────────────────────
+
+class ProposalRecord(BaseModel):
+    proposal_id: str
+    client: str
+    industry: str
+    generated_date: date
+    pricing: PricingRecommendation
+    files: ProposalFiles
+    links: dict[str, str] = {}
+
+
+class ProposalList(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    items: list[ProposalRecord]
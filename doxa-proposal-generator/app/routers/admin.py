@@ -0,0 +1,99 @@
+"""Admin routes: memory profiling.
+
+Only useful with ``MEMORY_PROFILING=true``; otherwise the snapshot and
+diff routes answer ``409``.  They cover the server process; work done in
+the render pool shows up in the per-stage peaks instead.
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.config import MEMORY_TRACE_FRAMES
+from app.models.admin import (
+    MemoryDiff,
+    MemoryDiffEntry,
+    MemoryGrouping,
+    MemorySnapshotInfo,
+    MemoryStatus,
+)
+from app.services import memory
+
+router = APIRouter(prefix="/admin/memory", tags=["admin"])
+
+
+def _info(snapshot: memory.Snapshot) -> MemorySnapshotInfo:
+    return MemorySnapshotInfo(
+        snapshot_id=snapshot.id,
+        taken_at=snapshot.taken_at,
+        traced_bytes=snapshot.traced_bytes,
+    )
+
+
+@router.get("", response_model=MemoryStatus, summary="Memory profiling status")
+def memory_status() -> MemoryStatus:
+    """Traced and resident memory, the largest per-request and per-stage
+    peaks seen so far, and the stored snapshots."""
+    peaks = memory.peaks()
+    tracing = memory.tracing()
+    return MemoryStatus(
+        tracing=tracing,
+        trace_frames=MEMORY_TRACE_FRAMES,
+        traced_bytes=tracemalloc.get_traced_memory()[0] if tracing else None,
+        rss_bytes=memory.rss_bytes(),
+        request_peaks=peaks["requests"],
+        stage_peaks=peaks["stages"],
+        snapshots=[_info(s) for s in memory.snapshots()],
+    )
+
+
+@router.post(
+    "/snapshots",
+    response_model=MemorySnapshotInfo,
+    status_code=201,
+    summary="Take an allocation snapshot",
+)
+def take_snapshot() -> MemorySnapshotInfo:
+    """Record the live allocations for a later diff.  Taking a snapshot
+    pauses allocation tracing for its duration and holds a copy of every
+    trace; only the last ``MEMORY_SNAPSHOTS_KEPT`` are kept."""
+    try:
+        return _info(memory.take_snapshot())
+    except memory.ProfilingDisabled as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+@router.get("/diff", response_model=MemoryDiff, summary="Top allocation changes between snapshots")
+def snapshot_diff(
+    base: int = Query(..., description="Snapshot to compare from."),
+    target: Optional[int] = Query(None, description="Snapshot to compare to; default: now."),
+    limit: int = Query(20, ge=1, le=500),
+    group_by: MemoryGrouping = MemoryGrouping.lineno,
+) -> MemoryDiff:
+    """The *limit* allocation sites whose size changed most from *base*
+    to *target*, largest change first, and the net change overall."""
+    try:
+        stats, total = memory.diff(base, target, limit, group_by.value)
+    except memory.ProfilingDisabled as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return MemoryDiff(
+        base=base,
+        target=target,
+        group_by=group_by,
+        total_size_diff_bytes=total,
+        entries=[
+            MemoryDiffEntry(
+                traceback=[f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback)],
+                size_bytes=stat.size,
+                size_diff_bytes=stat.size_diff,
+                count=stat.count,
+                count_diff=stat.count_diff,
+            )
+            for stat in stats
+        ],
+    )
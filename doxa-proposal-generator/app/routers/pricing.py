@@ -0,0 +1,32 @@
+"""Pricing API routes."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from app.models.pricing import BatchQuoteInput, BatchQuoteOutput
+
+router = APIRouter(prefix="/pricing", tags=["pricing"])
+
+
+@router.post(
+    "/quote/batch",
+    response_model=BatchQuoteOutput,
+    summary="Price many leads at once",
+)
+def quote_batch(data: BatchQuoteInput) -> BatchQuoteOutput:
+    """Return columnar pricing for every lead, optionally with overridden
+    pricing parameters for what-if scenarios."""
+    # Imported here so NumPy loads on the first quote, not at start-up.
+    from app.services.pricing_batch import calculate_pricing_batch
+
+    cols = calculate_pricing_batch(data.industries, data.monthly_customers, data.parameters)
+    return BatchQuoteOutput(
+        count=len(cols.setup_fee),
+        currency=cols.currency,
+        setup_fee=cols.setup_fee.tolist(),
+        monthly_subscription=cols.monthly_subscription.tolist(),
+        usage_based_pricing=cols.usage_based_pricing,
+        total_setup_fee=int(cols.setup_fee.sum()),
+        total_monthly_subscription=int(cols.monthly_subscription.sum()),
+    )
@@ -1,27 +1,182 @@
-"""Proposal API routes."""
+"""Proposal API routes.
+
+Routes are ``async`` and never block the event loop: PDF rendering runs
+in the render process pool, lighter work (Markdown-only generation,
+SQLite and file-system calls) in worker threads.  The loop stays free to
+answer ``/health`` and ``/ready`` however busy the renderers are.
+Generation routes first take a slot from the PDF or light admission
+limiter (``app.services.admission``), so overload is refused early.
+"""
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Any, BinaryIO, Iterator, Optional
+
+from fastapi import APIRouter, Body, HTTPException, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+from app.config import BATCH_MAX_ITEMS, PERSIST_STREAMED_PDF
+from app.models.proposal import (
+    ALL_FORMATS,
+    BatchOutput,
+    ExportRequest,
+    JobStatus,
+    OutputFormat,
+    ProposalFiles,
+    ProposalInput,
+    ProposalList,
+    ProposalOutput,
+    ProposalRecord,
+    ProposalRevision,
+    ProposalUpdate,
+    ResponseView,
+    VIEW_EXCLUDES,
+)
+from app.services.admission import AdmissionLimiter, light_admission, pdf_admission
+from app.services.batch import generate_batch
+from app.services.export import stream_zip
+from app.services.generator import (
+    RenderedProposal,
+    generate_proposal,
+    plan_revision,
+    render_for_transfer,
+    render_revision,
+    save_proposal,
+    save_revision,
+)
+from app.services.index import proposal_index
+from app.services.jobs import job_store, job_workers
+from app.services.pool import run_in_render_pool
+from app.services.storage import storage
 
-from app.models.proposal import ProposalInput, ProposalOutput
-from app.services.generator import generate_proposal
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/proposals", tags=["proposals"])
 
+_FORMATS_QUERY = Query(
+    default=list(OutputFormat),
+    description="Artifacts to write to the output directory.",
+)
+
+
+_VIEW_QUERY = Query(
+    default=ResponseView.full,
+    description=(
+        "Response shape: `full` (sections and Markdown), `sections` (no "
+        "Markdown), `markdown` (no sections) or `metadata` (ids, pricing "
+        "and file paths only)."
+    ),
+)
+
+
+def _json(model: BaseModel, exclude: Optional[dict] = None) -> Response:
+    """Serialise *model* in one step with pydantic's JSON encoder.
+
+    Returning a ``Response`` skips FastAPI's response-model validation and
+    ``jsonable_encoder`` pass, which would walk the whole model again.
+    """
+    return Response(
+        content=model.model_dump_json(exclude=exclude),
+        media_type="application/json",
+    )
+
+
+def _admission(formats: frozenset[OutputFormat]) -> AdmissionLimiter:
+    """The limiter for work that writes *formats*: PDFs are the costly part."""
+    return pdf_admission if OutputFormat.pdf in formats else light_admission
+
+
+async def _generate(data: ProposalInput, formats: frozenset[OutputFormat]) -> ProposalOutput:
+    """Render (in the render pool when a PDF is needed) and save."""
+    if OutputFormat.pdf not in formats:
+        # Markdown and JSON only take a millisecond; a thread is cheaper
+        # than the round trip to another process.
+        return await asyncio.to_thread(generate_proposal, data, formats)
+    rendered = await run_in_render_pool(render_for_transfer, data, formats)
+    return await asyncio.to_thread(save_proposal, rendered, formats)
+
+
+def _links(request: Request, proposal_id: str, files: ProposalFiles) -> dict[str, str]:
+    links = {"self": str(request.url_for("get_proposal", proposal_id=proposal_id))}
+    if files.pdf_path:
+        links["pdf"] = str(request.url_for("get_proposal_pdf", proposal_id=proposal_id))
+    if files.markdown_path:
+        links["markdown"] = str(
+            request.url_for("get_proposal_markdown", proposal_id=proposal_id)
+        )
+    return links
+
 
 @router.post(
     "/generate",
     response_model=ProposalOutput,
     summary="Generate a full automation proposal",
 )
-def create_proposal(data: ProposalInput) -> ProposalOutput:
+async def create_proposal(
+    data: ProposalInput,
+    formats: list[OutputFormat] = _FORMATS_QUERY,
+    view: ResponseView = _VIEW_QUERY,
+) -> Response:
     """Accept structured input and return a complete proposal with files."""
+    formats = frozenset(formats)
+    async with _admission(formats).slot():
+        try:
+            output = await _generate(data, formats)
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return _json(output, VIEW_EXCLUDES[view])
+
+
+@router.post(
+    "/generate/batch",
+    response_model=BatchOutput,
+    summary="Generate proposals for many leads in one call",
+)
+async def create_proposal_batch(
+    leads: list[dict[str, Any]] = Body(
+        ...,
+        description=(
+            "List of ProposalInput objects. Each lead is validated on its own, "
+            "so an invalid lead is reported in its result slot instead of "
+            "rejecting the whole batch."
+        ),
+    ),
+    formats: list[OutputFormat] = _FORMATS_QUERY,
+    view: ResponseView = _VIEW_QUERY,
+) -> Response:
+    """Render a batch of proposals across worker processes.
+
+    Results come back in input order; failures are reported per item.
+    """
+    if len(leads) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(leads)} leads (max {BATCH_MAX_ITEMS})",
+        )
+    formats = frozenset(formats)
+    # A whole batch holds one slot; BATCH_MAX_ITEMS bounds its size.
+    async with _admission(formats).slot():
+        try:
+            batch = await asyncio.to_thread(generate_batch, leads, formats)
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+    exclude = VIEW_EXCLUDES[view]
+    if exclude is not None:
+        exclude = {"results": {"__all__": {"proposal": exclude}}}
+    return _json(batch, exclude)
+
+
+def _persist_streamed(rendered: RenderedProposal, formats: frozenset[OutputFormat]) -> None:
+    """Keep a copy of a PDF that has already been sent to the client."""
     try:
-        return generate_proposal(data)
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+        save_proposal(rendered, formats)
+    except Exception:
+        logger.exception("Could not persist streamed PDF %s", rendered.output.proposal_id)
 
 
 @router.post(
@@ -29,17 +184,35 @@ def create_proposal(data: ProposalInput) -> ProposalOutput:
     summary="Generate a proposal and return the PDF directly",
     responses={200: {"content": {"application/pdf": {}}}},
 )
-def create_proposal_pdf(data: ProposalInput) -> FileResponse:
-    """Generate a proposal and stream back the PDF file."""
-    try:
-        result = generate_proposal(data)
-        return FileResponse(
-            path=result.files.pdf_path,
-            media_type="application/pdf",
-            filename=f"proposal_{result.proposal_id}.pdf",
-        )
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+async def create_proposal_pdf(
+    data: ProposalInput,
+    persist: bool = Query(
+        default=PERSIST_STREAMED_PDF,
+        description="Also keep a copy of the PDF in the output directory.",
+    ),
+) -> Response:
+    """Generate a proposal and send the PDF straight from memory.
+
+    The copy kept with ``persist`` is written after the response has been
+    sent, so storage latency never reaches the client.
+    """
+    formats = frozenset({OutputFormat.pdf})
+    async with pdf_admission.slot():
+        try:
+            rendered = await run_in_render_pool(render_for_transfer, data, formats)
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return Response(
+        content=rendered.pdf,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="proposal_{rendered.output.proposal_id}.pdf"'
+            ),
+        },
+        # Sync callables run in the thread pool once the body is sent.
+        background=BackgroundTask(_persist_streamed, rendered, formats) if persist else None,
+    )
 
 
 @router.post(
@@ -47,12 +220,274 @@ def create_proposal_pdf(data: ProposalInput) -> FileResponse:
     summary="Generate a proposal and return raw Markdown",
     responses={200: {"content": {"text/markdown": {}}}},
 )
-def create_proposal_markdown(data: ProposalInput) -> JSONResponse:
+async def create_proposal_markdown(data: ProposalInput) -> JSONResponse:
     """Generate a proposal and return the Markdown content."""
-    try:
-        result = generate_proposal(data)
-        return JSONResponse(
-            content={"proposal_id": result.proposal_id, "markdown": result.markdown}
+    async with light_admission.slot():
+        try:
+            result = await _generate(data, frozenset({OutputFormat.markdown}))
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return JSONResponse(
+        content={"proposal_id": result.proposal_id, "markdown": result.markdown}
+    )
+
+
+@router.post(
+    "/jobs",
+    response_model=JobStatus,
+    status_code=202,
+    summary="Queue a proposal for background generation",
+)
+async def submit_proposal_job(
+    data: ProposalInput,
+    formats: list[OutputFormat] = _FORMATS_QUERY,
+) -> JobStatus:
+    """Queue the proposal and return a job id immediately.
+
+    Poll ``GET /proposals/jobs/{job_id}`` for the result.
+    """
+    job = await asyncio.to_thread(job_store.submit, data, frozenset(formats))
+    job_workers.notify()
+    return job
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatus,
+    summary="Get the status of a background generation job",
+)
+async def get_proposal_job(job_id: str, request: Request) -> JobStatus:
+    """Report job status and, once finished, the generated artifact paths."""
+    job = await asyncio.to_thread(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if job.proposal_id and job.files:
+        job.links = _links(request, job.proposal_id, job.files)
+    return job
+
+
+# ── Read endpoints (backed by the proposal index) ───────────────────────────
+
+@router.get(
+    "",
+    response_model=ProposalList,
+    summary="List generated proposals",
+)
+async def list_proposals(
+    request: Request,
+    client: Optional[str] = Query(None, description="Client name prefix (case-insensitive)"),
+    industry: Optional[str] = Query(None, description="Industry (case-insensitive)"),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+) -> ProposalList:
+    """Filtered, paginated listing, newest first."""
+    total, items = await asyncio.to_thread(
+        proposal_index.search,
+        client=client,
+        industry=industry,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+        offset=offset,
+    )
+    for item in items:
+        item.links = _links(request, item.proposal_id, item.files)
+    return ProposalList(total=total, limit=limit, offset=offset, items=items)
+
+
+def _export_response(export: ExportRequest) -> StreamingResponse:
+    if export.ids is not None:
+        # Duplicates would add the same archive member twice.
+        selection = proposal_index.iter_ids(dict.fromkeys(export.ids))
+    else:
+        selection = (
+            (record.proposal_id, record)
+            for record in proposal_index.iter_matching(
+                client=export.client,
+                industry=export.industry,
+                date_from=export.date_from,
+                date_to=export.date_to,
+            )
+        )
+    filename = f"proposals_{datetime.now():%Y%m%d-%H%M%S}.zip"
+    # Starlette iterates the (blocking) generator in a worker thread.
+    return StreamingResponse(
+        stream_zip(selection, dict.fromkeys(export.formats)),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+        },
+    )
+
+
+@router.get(
+    "/export",
+    summary="Download many proposals' artifacts as one ZIP",
+    responses={200: {"content": {"application/zip": {}}}},
+)
+async def export_proposals(
+    ids: Optional[list[str]] = Query(None, description="Proposal ids; overrides the filters."),
+    client: Optional[str] = Query(None, description="Client name prefix (case-insensitive)"),
+    industry: Optional[str] = Query(None, description="Industry (case-insensitive)"),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    formats: list[OutputFormat] = Query(
+        default=[OutputFormat.pdf, OutputFormat.markdown],
+        description="Artifacts to include.",
+    ),
+) -> StreamingResponse:
+    """Stream a ZIP built on the fly; memory use does not grow with its size."""
+    return _export_response(
+        ExportRequest(
+            ids=ids,
+            client=client,
+            industry=industry,
+            date_from=date_from,
+            date_to=date_to,
+            formats=formats,
+        )
+    )
+
+
+@router.post(
+    "/export",
+    summary="Download many proposals' artifacts as one ZIP (ids in the body)",
+    responses={200: {"content": {"application/zip": {}}}},
+)
+async def export_proposals_post(export: ExportRequest) -> StreamingResponse:
+    """As ``GET /proposals/export``, for id lists too long for a URL."""
+    return _export_response(export)
+
+
+async def _get_record(proposal_id: str) -> ProposalRecord:
+    record = await asyncio.to_thread(proposal_index.get, proposal_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown proposal: {proposal_id}")
+    return record
+
+
+def _iter_file(handle: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    with handle:
+        while chunk := handle.read(chunk_size):
+            yield chunk
+
+
+def _check_artifact(location: str) -> bool:
+    if not storage.exists(location):
+        return False
+    storage.touch(location)
+    return True
+
+
+async def _artifact_response(
+    location: Optional[str], media_type: str, filename: str
+) -> Response:
+    if not location or not await asyncio.to_thread(_check_artifact, location):
+        raise HTTPException(status_code=404, detail="Artifact not available")
+    path = storage.local_path(location)
+    if path is not None:
+        return FileResponse(path=path, media_type=media_type, filename=filename)
+    # Starlette iterates a plain iterator in a worker thread.
+    return StreamingResponse(
+        _iter_file(await asyncio.to_thread(storage.open, location)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/{proposal_id}",
+    response_model=ProposalRecord,
+    summary="Look up a generated proposal",
+)
+async def get_proposal(proposal_id: str, request: Request) -> ProposalRecord:
+    record = await _get_record(proposal_id)
+    record.links = _links(request, proposal_id, record.files)
+    return record
+
+
+@router.get(
+    "/{proposal_id}/pdf",
+    summary="Download a generated proposal's PDF",
+    responses={200: {"content": {"application/pdf": {}}}},
+)
+async def get_proposal_pdf(proposal_id: str) -> Response:
+    record = await _get_record(proposal_id)
+    return await _artifact_response(
+        record.files.pdf_path, "application/pdf", f"proposal_{proposal_id}.pdf"
+    )
+
+
+@router.get(
+    "/{proposal_id}/markdown",
+    summary="Download a generated proposal's Markdown",
+    responses={200: {"content": {"text/markdown": {}}}},
+)
+async def get_proposal_markdown(proposal_id: str) -> Response:
+    record = await _get_record(proposal_id)
+    return await _artifact_response(
+        record.files.markdown_path, "text/markdown", f"proposal_{proposal_id}.md"
+    )
+
+
+@router.patch(
+    "/{proposal_id}",
+    response_model=ProposalRevision,
+    summary="Change fields of a proposal and re-render it in place",
+)
+async def update_proposal(
+    proposal_id: str,
+    update: ProposalUpdate,
+    formats: Optional[list[OutputFormat]] = Query(
+        default=None,
+        description="Artifacts to write (default: the ones the proposal already has).",
+    ),
+    view: ResponseView = _VIEW_QUERY,
+) -> Response:
+    """Apply the given fields to the proposal's recorded input.
+
+    The proposal keeps its id and date.  ``recomputed_sections`` lists the
+    sections that were rendered again; the rest were reused as they were.
+    Artifacts not rewritten by this call are deleted.
+    """
+    record = await _get_record(proposal_id)
+    previous = await asyncio.to_thread(proposal_index.get_input, proposal_id)
+    if previous is None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Input of proposal {proposal_id} was not recorded; generate it again",
         )
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    data, changed = plan_revision(previous, update)
+    if formats is None:
+        written = frozenset(
+            f for f in OutputFormat if getattr(record.files, f"{f.value}_path")
+        ) or ALL_FORMATS
+    else:
+        written = frozenset(formats)
+
+    async with _admission(written if changed else frozenset()).slot():
+        try:
+            if not changed:
+                # Nothing to write; only the response needs rendering.
+                rendered, recomputed = await asyncio.to_thread(
+                    render_revision, data, (), proposal_id, record.generated_date
+                )
+                output = rendered.output
+                output.files = record.files
+            else:
+                args = (data, written, proposal_id, record.generated_date)
+                if OutputFormat.pdf in written:
+                    rendered, recomputed = await run_in_render_pool(render_revision, *args)
+                else:
+                    rendered, recomputed = await asyncio.to_thread(render_revision, *args)
+                output = await asyncio.to_thread(save_revision, rendered, written, record.files)
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    exclude = VIEW_EXCLUDES[view]
+    revision = ProposalRevision(
+        proposal=output, changed_fields=changed, recomputed_sections=recomputed
+    )
+    return _json(revision, {"proposal": exclude} if exclude is not None else None)
@@ -0,0 +1,150 @@
+"""Admission control for the generation routes.
+
+Each class of work has an :class:`AdmissionLimiter`: at most ``limit``
+requests run at once and at most ``max_queue`` more wait for a slot, in
+arrival order.  Past that, requests are turned away immediately instead
+of all slowing down together:
+
+* queue full → ``429`` (shed at once, nothing was started);
+* queued for longer than ``queue_timeout`` → ``503``.
+
+Both carry ``Retry-After``, estimated from the current backlog and the
+recent time a slot is held.  PDF rendering and the light Markdown / JSON
+work have separate limiters, so a PDF spike cannot starve cheap requests.
+In-flight and queued counts are exported as gauges for autoscaling.
+
+Limiters live on the event loop and are only used from ``async`` code, so
+their counters need no locks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from app.config import (
+    ADMISSION_LIGHT_CONCURRENCY,
+    ADMISSION_LIGHT_QUEUE,
+    ADMISSION_PDF_CONCURRENCY,
+    ADMISSION_PDF_QUEUE,
+    ADMISSION_QUEUE_TIMEOUT,
+)
+from app.services.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUED,
+    ADMISSION_REJECTED,
+    ADMISSION_WAIT_SECONDS,
+)
+
+
+class AdmissionRejected(Exception):
+    """The server is too busy to take this request now."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    def __init__(self, work: str, limit: int, max_queue: int, queue_timeout: float):
+        self.work = work
+        self.limit = max(1, limit)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        # Moving average of how long a slot is held, for Retry-After.
+        self._hold_seconds: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._publish()
+
+    def _semaphore_for_loop(self) -> asyncio.Semaphore:
+        # A semaphore belongs to one event loop; tests may run several.
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self.active = self.waiting = 0
+        return self._semaphore
+
+    def _publish(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.active, work=self.work)
+        ADMISSION_QUEUED.set(self.waiting, work=self.work)
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained."""
+        if self._hold_seconds is None:
+            return 1
+        backlog = self.active + self.waiting
+        return max(1, math.ceil(backlog * self._hold_seconds / self.limit))
+
+    def _reject(self, reason: str, status_code: int, message: str) -> AdmissionRejected:
+        ADMISSION_REJECTED.inc(work=self.work, reason=reason)
+        return AdmissionRejected(message, status_code, self.retry_after())
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot for the enclosed block, queueing if necessary."""
+        semaphore = self._semaphore_for_loop()
+        if semaphore.locked() or self.waiting:
+            if self.waiting >= self.max_queue:
+                raise self._reject(
+                    "queue_full", 429, f"Too many {self.work} requests queued; retry later"
+                )
+            self.waiting += 1
+            self._publish()
+            queued = time.perf_counter()
+            try:
+                if self.queue_timeout > 0:
+                    await asyncio.wait_for(semaphore.acquire(), self.queue_timeout)
+                else:
+                    await semaphore.acquire()
+            except asyncio.TimeoutError:
+                raise self._reject(
+                    "timeout", 503, f"Timed out waiting for a {self.work} slot; retry later"
+                ) from None
+            finally:
+                self.waiting -= 1
+                self._publish()
+            ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - queued, work=self.work)
+        else:
+            await semaphore.acquire()
+            ADMISSION_WAIT_SECONDS.observe(0.0, work=self.work)
+
+        self.active += 1
+        self._publish()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            semaphore.release()
+            self._publish()
+            held = time.perf_counter() - started
+            if self._hold_seconds is None:
+                self._hold_seconds = held
+            else:
+                self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held
+
+    def status(self) -> dict:
+        return {
+            "in_flight": self.active,
+            "queued": self.waiting,
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "retry_after": self.retry_after(),
+        }
+
+
+pdf_admission = AdmissionLimiter(
+    "pdf", ADMISSION_PDF_CONCURRENCY, ADMISSION_PDF_QUEUE, ADMISSION_QUEUE_TIMEOUT
+)
+light_admission = AdmissionLimiter(
+    "light", ADMISSION_LIGHT_CONCURRENCY, ADMISSION_LIGHT_QUEUE, ADMISSION_QUEUE_TIMEOUT
+)
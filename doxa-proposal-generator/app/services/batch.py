@@ -0,0 +1,97 @@
+"""Batch proposal generation.
+
+Fans a list of leads out across the shared process pool.  Each lead is
+validated and generated independently, so one bad lead only produces an
+error entry for itself — the rest of the batch still completes.  Results
+are returned in input order.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from pydantic import ValidationError
+
+from app.models.proposal import (
+    ALL_FORMATS,
+    BatchItemResult,
+    BatchOutput,
+    OutputFormat,
+    ProposalInput,
+)
+from app.services.generator import generate_proposal
+from app.services.pool import get_process_pool, reset_process_pool
+
+
+def _generate_one(
+    raw: dict[str, Any],
+    formats: frozenset[OutputFormat],
+) -> BatchItemResult:
+    """Worker entry point: validate and generate a single lead.
+
+    Runs inside a pool process, so it must never raise — any failure is
+    captured as an error result for this lead only.
+    """
+    try:
+        data = ProposalInput.model_validate(raw)
+    except ValidationError as exc:
+        return BatchItemResult(index=-1, ok=False, error=_format_validation(exc))
+    try:
+        return BatchItemResult(index=-1, ok=True, proposal=generate_proposal(data, formats))
+    except Exception as exc:
+        return BatchItemResult(index=-1, ok=False, error=str(exc))
+
+
+def _format_validation(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'input'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+def generate_batch(
+    leads: list[dict[str, Any]],
+    formats: Collection[OutputFormat] = ALL_FORMATS,
+) -> BatchOutput:
+    """Generate a proposal for every lead, preserving input order."""
+
+    pool = get_process_pool()
+    formats = frozenset(formats)
+    # Submit everything first so the leads run in parallel.  A pool that
+    # is broken or shut down refuses work at submit time; that failure
+    # belongs to the lead too, not to the whole batch.
+    futures: list[Future | Exception] = []
+    for lead in leads:
+        try:
+            futures.append(pool.submit(_generate_one, lead, formats))
+        except (BrokenProcessPool, RuntimeError) as exc:
+            futures.append(exc)
+
+    results: list[BatchItemResult] = []
+    broken = False
+    for index, future in enumerate(futures):
+        try:
+            if isinstance(future, Exception):
+                raise future
+            item = future.result()
+        except BrokenProcessPool as exc:
+            broken = True
+            item = BatchItemResult(index=index, ok=False, error=f"worker crashed: {exc}")
+        except Exception as exc:
+            item = BatchItemResult(index=index, ok=False, error=str(exc))
+        item.index = index
+        results.append(item)
+
+    if broken:
+        reset_process_pool(pool)
+
+    succeeded = sum(1 for r in results if r.ok)
+    return BatchOutput(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+    )
@@ -0,0 +1,290 @@
+"""Content-addressed cache of rendered proposals.
+
+The key is a hash of the normalised :class:`ProposalInput`, the generation
+date and the active template / pricing / branding configuration, so a
+re-submitted lead maps to the same entry (and the same proposal id) while
+any change to wording or prices invalidates it.
+
+Two tiers:
+
+* an in-process LRU bounded by entry count, and
+* an optional on-disk tier under ``RESULT_CACHE_DIR`` bounded by total
+  bytes, shared by every worker process on the host.  It is off unless
+  ``RESULT_CACHE_DISK_MAX_BYTES`` is set, lives on local scratch rather
+  than in ``OUTPUT_DIR``, and is written by a background thread so a miss
+  never waits on it.  Least recently used files are evicted first (hits
+  refresh the file's mtime).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from app import config
+from app.models.proposal import ProposalFiles, ProposalInput, ProposalOutput
+from app.services import pricing
+from app.services.storage import write_atomic
+
+if TYPE_CHECKING:
+    from app.services.generator import RenderedProposal
+
+logger = logging.getLogger(__name__)
+
+# Bump when a code change alters rendered output for the same input.
+RENDER_VERSION = "2"
+
+# Re-scan the disk tier at least this often to account for other workers.
+_RESCAN_EVERY = 64
+# Evict down to this fraction of the budget so eviction is amortised.
+_EVICT_TARGET = 0.9
+# Disk writes waiting for the writer thread; beyond this they are dropped.
+_WRITE_BACKLOG = 64
+
+
+def normalize_input(data: ProposalInput) -> dict:
+    """Return *data* as a plain dict with surrounding whitespace trimmed."""
+    return {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in data.model_dump().items()
+    }
+
+
+def input_fingerprint(data: ProposalInput) -> str:
+    """Stable hash of the normalised input, independent of field order."""
+    canonical = json.dumps(normalize_input(data), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def config_version() -> str:
+    """Hash of the code and settings that shape the output.
+
+    Templates can change at runtime, so their version is mixed in by
+    :func:`cache_key` instead.
+    """
+    parts = {
+        "render": RENDER_VERSION,
+        "multipliers": pricing._INDUSTRY_MULTIPLIER,
+        "default_multiplier": pricing.DEFAULT_MULTIPLIER,
+        "volume_tiers": [pricing.VOLUME_TIERS, pricing.TOP_VOLUME_FACTOR],
+        "usage": [pricing.USAGE_THRESHOLD, pricing.USAGE_RATE],
+        "settings": {
+            name: getattr(config, name)
+            for name in (
+                "AGENCY_NAME",
+                "AGENCY_EMAIL",
+                "AGENCY_WEBSITE",
+                "CURRENCY",
+                "DEFAULT_SETUP_FEE_MIN",
+                "DEFAULT_SETUP_FEE_MAX",
+                "DEFAULT_MONTHLY_MIN",
+                "DEFAULT_MONTHLY_MAX",
+                "PDF_PROFILE",
+            )
+        },
+    }
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(data: ProposalInput, today: date, template_version: str) -> str:
+    material = (
+        f"{config_version()}:{template_version}:{today.isoformat()}:{input_fingerprint(data)}"
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Two-tier (memory LRU + bounded disk) store of rendered proposals."""
+
+    def __init__(self, directory: Path, memory_entries: int, disk_max_bytes: int):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict[str, RenderedProposal] = OrderedDict()
+        self._lock = threading.Lock()
+        # Running estimate of the disk tier size; ``None`` until first scan.
+        self._disk_bytes: Optional[int] = None
+        self._puts_since_scan = 0
+        self._writes: Optional[queue.Queue] = None
+
+    # ── Public API ───────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[RenderedProposal]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None:
+            entry = self._disk_get(key)
+            if entry is None:
+                return None
+            self._memory_put(key, entry)
+        return _copy(entry)
+
+    def put(self, key: str, rendered: RenderedProposal) -> None:
+        entry = _copy(rendered)
+        self._memory_put(key, entry)
+        if self.disk_max_bytes > 0:
+            self._queue_disk_put(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    # ── Memory tier ──────────────────────────────────────────────────────
+
+    def _memory_put(self, key: str, entry: RenderedProposal) -> None:
+        if self.memory_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    # ── Disk tier ────────────────────────────────────────────────────────
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        shard = self.directory / key[:2]
+        return shard / f"{key}.json", shard / f"{key}.pdf"
+
+    def _disk_get(self, key: str) -> Optional[RenderedProposal]:
+        from app.services.generator import RenderedProposal
+
+        if self.disk_max_bytes <= 0:
+            return None
+        meta_path, pdf_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            pdf = pdf_path.read_bytes() if meta["has_pdf"] else None
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return RenderedProposal(
+            output=ProposalOutput.model_validate(meta["output"]),
+            file_stem=meta["file_stem"],
+            pdf=pdf,
+        )
+
+    def _queue_disk_put(self, key: str, entry: RenderedProposal) -> None:
+        with self._lock:
+            if self._writes is None:
+                self._writes = queue.Queue(maxsize=_WRITE_BACKLOG)
+                threading.Thread(
+                    target=self._write_loop, name="result-cache-writer", daemon=True
+                ).start()
+        try:
+            self._writes.put_nowait((key, entry))
+        except queue.Full:
+            logger.debug("Result cache write backlog full; skipping %s", key)
+
+    def _write_loop(self) -> None:
+        while True:
+            key, entry = self._writes.get()
+            self._disk_put(key, entry)
+
+    def _disk_put(self, key: str, entry: RenderedProposal) -> None:
+        meta_path, pdf_path = self._paths(key)
+        meta = {
+            "file_stem": entry.file_stem,
+            "has_pdf": entry.pdf is not None,
+            "output": entry.output.model_dump(mode="json"),
+        }
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            # PDF first: the metadata file is what marks the entry complete.
+            # Atomic, as another worker may write or read the same key; the
+            # cache can be rebuilt, so it skips fsync.
+            written = 0
+            if entry.pdf is not None:
+                write_atomic(pdf_path, entry.pdf, fsync=False)
+                written += len(entry.pdf)
+            payload = json.dumps(meta).encode("utf-8")
+            write_atomic(meta_path, payload, fsync=False)
+            written += len(payload)
+            self._account(written)
+        except OSError:
+            logger.warning("Result cache write failed for %s", key, exc_info=True)
+
+    def _account(self, written: int) -> None:
+        """Track bytes added and evict once the estimate exceeds the budget.
+
+        The full directory scan only runs when the budget looks exceeded
+        or every ``_RESCAN_EVERY`` writes, not on every put.
+        """
+        with self._lock:
+            self._puts_since_scan += 1
+            if self._disk_bytes is not None:
+                self._disk_bytes += written
+            needs_scan = (
+                self._disk_bytes is None
+                or self._disk_bytes > self.disk_max_bytes
+                or self._puts_since_scan >= _RESCAN_EVERY
+            )
+            if needs_scan:
+                self._puts_since_scan = 0
+        if needs_scan:
+            total = self._evict()
+            with self._lock:
+                self._disk_bytes = total
+
+    def _evict(self) -> int:
+        """Drop least recently used entries until under the byte budget.
+
+        Returns the size of the disk tier after eviction.
+        """
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        for meta_path in self.directory.glob("*/*.json"):
+            try:
+                st = meta_path.stat()
+                size = st.st_size
+                pdf_path = meta_path.with_suffix(".pdf")
+                if pdf_path.exists():
+                    size += pdf_path.stat().st_size
+            except OSError:
+                continue
+            entries.append((st.st_mtime, size, meta_path))
+            total += size
+        if total <= self.disk_max_bytes:
+            return total
+        target = int(self.disk_max_bytes * _EVICT_TARGET)
+        entries.sort()
+        for _, size, meta_path in entries:
+            meta_path.unlink(missing_ok=True)
+            meta_path.with_suffix(".pdf").unlink(missing_ok=True)
+            total -= size
+            if total <= target:
+                break
+        return total
+
+
+def _copy(entry: RenderedProposal) -> RenderedProposal:
+    # Callers fill in ``output.files``; never hand out the cached instance.
+    from app.services.generator import RenderedProposal
+
+    return RenderedProposal(
+        output=entry.output.model_copy(deep=True, update={"files": ProposalFiles()}),
+        file_stem=entry.file_stem,
+        pdf=entry.pdf,
+        document=entry.document,
+        state=entry.state,
+    )
+
+
+result_cache = ResultCache(
+    directory=config.CACHE_DIR,
+    memory_entries=config.RESULT_CACHE_MEMORY_ENTRIES,
+    disk_max_bytes=config.RESULT_CACHE_DISK_MAX_BYTES,
+)
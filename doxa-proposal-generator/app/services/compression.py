@@ -0,0 +1,85 @@
+"""Response compression that skips already-compressed media types.
+
+Starlette's :class:`GZipMiddleware` compresses every large enough
+response.  PDFs (deflated page streams) and ZIP archives barely shrink,
+so for them gzip only costs CPU, and streamed downloads lose their
+``Content-Length``.  :class:`SelectiveGZipMiddleware` compresses like it
+does, but decides per response from the ``http.response.start`` message:
+those media types, responses that already carry a ``Content-Encoding``
+and small bodies are sent through unchanged.
+"""
+
+from __future__ import annotations
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+INCOMPRESSIBLE_TYPES = frozenset({"application/pdf", "application/zip", "application/gzip"})
+
+
+def _media_type(headers: MutableHeaders) -> str:
+    return headers.get("content-type", "").split(";", 1)[0].strip().lower()
+
+
+class SelectiveGZipMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("Accept-Encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        start: Message = {}
+        # Decided at the first body message: pass through or compress.
+        compressor = None
+        plain = False
+
+        async def send_selectively(message: Message) -> None:
+            nonlocal start, compressor, plain
+            if message["type"] == "http.response.start":
+                # Held back until the first body shows whether to compress.
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None and not plain:
+                headers = MutableHeaders(raw=start["headers"])
+                plain = (
+                    "content-encoding" in headers
+                    or _media_type(headers) in INCOMPRESSIBLE_TYPES
+                    or (len(body) < self.minimum_size and not more_body)
+                )
+                if plain:
+                    await send(start)
+                else:
+                    compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                    body = compressor.compress(body)
+                    if not more_body:
+                        body += compressor.flush()
+                    headers["Content-Encoding"] = "gzip"
+                    headers.add_vary_header("Accept-Encoding")
+                    if more_body:
+                        del headers["Content-Length"]
+                    else:
+                        headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({**message, "body": body})
+                    return
+            if plain:
+                await send(message)
+                return
+            body = compressor.compress(body)
+            if not more_body:
+                body += compressor.flush()
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_selectively)
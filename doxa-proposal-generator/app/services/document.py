@@ -0,0 +1,270 @@
+"""Structured proposal document model.
+
+The generator builds a proposal once as a list of blocks (headings,
+paragraphs, lists, tables, code blocks, quotes, rules).  Every output
+format renders from that model — :func:`to_markdown` here and
+:func:`app.services.pdf_export.render_pdf` for PDF — so no backend has
+to re-parse Markdown text to recover structure.
+
+Section templates are still written as Markdown-flavoured text.  They are
+parsed into blocks once by :func:`compile_template`; rendering a compiled
+template only runs ``str.format`` on the blocks that contain placeholders.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field, replace
+from string import Formatter
+from typing import Union
+
+# ── Blocks ───────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Heading:
+    level: int
+    text: str
+
+
+@dataclass(frozen=True)
+class Paragraph:
+    """One or more lines of running text (``"  \\n"`` marks a hard break)."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class ListBlock:
+    items: tuple[str, ...]
+    ordered: bool = False
+
+
+@dataclass(frozen=True)
+class Table:
+    header: tuple[str, ...]
+    rows: tuple[tuple[str, ...], ...]
+
+
+@dataclass(frozen=True)
+class CodeBlock:
+    lines: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Quote:
+    lines: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Rule:
+    pass
+
+
+Block = Union[Heading, Paragraph, ListBlock, Table, CodeBlock, Quote, Rule]
+
+
+@dataclass
+class Document:
+    blocks: list[Block] = field(default_factory=list)
+
+
+# ── Markdown backend ─────────────────────────────────────────────────────────
+
+
+def _row(cells: tuple[str, ...]) -> str:
+    return "| " + " | ".join(cells) + " |"
+
+
+def block_to_markdown(block: Block) -> str:
+    if isinstance(block, Paragraph):
+        return block.text
+    if isinstance(block, Heading):
+        return f"{'#' * block.level} {block.text}"
+    if isinstance(block, ListBlock):
+        if block.ordered:
+            return "\n".join(f"{n}. {item}" for n, item in enumerate(block.items, 1))
+        return "\n".join(f"- {item}" for item in block.items)
+    if isinstance(block, Table):
+        lines = [_row(block.header), _row(("---",) * len(block.header))]
+        lines.extend(_row(row) for row in block.rows)
+        return "\n".join(lines)
+    if isinstance(block, CodeBlock):
+        return "```\n" + "\n".join(block.lines) + "\n```"
+    if isinstance(block, Quote):
+        return "\n".join(f"> {line}" for line in block.lines)
+    if isinstance(block, Rule):
+        return "---"
+    raise TypeError(f"Unknown block type: {type(block).__name__}")
+
+
+def blocks_to_markdown(blocks: list[Block]) -> str:
+    return "\n\n".join(block_to_markdown(b) for b in blocks)
+
+
+def to_markdown(doc: Document) -> str:
+    return blocks_to_markdown(doc.blocks) + "\n"
+
+
+# ── Template parsing ─────────────────────────────────────────────────────────
+# Only used when a template is compiled, never per request.
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+)$")
+_RULE_RE = re.compile(r"^-{3,}$")
+_BULLET_RE = re.compile(r"^[-*]\s+(.+)$")
+_ORDERED_RE = re.compile(r"^\d+\.\s+(.+)$")
+_TABLE_ROW_RE = re.compile(r"^\|(.+)\|$")
+_TABLE_SEP_RE = re.compile(r"^\|[\s\-:|]+\|$")
+_QUOTE_RE = re.compile(r"^>\s?(.*)$")
+
+
+def _cells(line: str) -> tuple[str, ...]:
+    return tuple(c.strip() for c in _TABLE_ROW_RE.match(line).group(1).split("|"))
+
+
+def parse_blocks(text: str) -> list[Block]:
+    """Split Markdown-flavoured *text* into blocks."""
+
+    blocks: list[Block] = []
+    lines = text.split("\n")
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.rstrip()
+
+        if not stripped:
+            i += 1
+            continue
+
+        if stripped.startswith("```"):
+            j = i + 1
+            while j < len(lines) and not lines[j].startswith("```"):
+                j += 1
+            blocks.append(CodeBlock(tuple(lines[i + 1 : j])))
+            i = j + 1
+            continue
+
+        if _RULE_RE.match(stripped):
+            blocks.append(Rule())
+            i += 1
+            continue
+
+        m = _HEADING_RE.match(stripped)
+        if m:
+            blocks.append(Heading(len(m.group(1)), m.group(2)))
+            i += 1
+            continue
+
+        if _TABLE_ROW_RE.match(stripped):
+            rows = []
+            while i < len(lines) and _TABLE_ROW_RE.match(lines[i].rstrip()):
+                if not _TABLE_SEP_RE.match(lines[i].rstrip()):
+                    rows.append(_cells(lines[i].rstrip()))
+                i += 1
+            blocks.append(Table(rows[0], tuple(rows[1:])))
+            continue
+
+        if _QUOTE_RE.match(stripped):
+            quoted = []
+            while i < len(lines) and _QUOTE_RE.match(lines[i].rstrip()):
+                quoted.append(_QUOTE_RE.match(lines[i].rstrip()).group(1))
+                i += 1
+            blocks.append(Quote(tuple(quoted)))
+            continue
+
+        for item_re, ordered in ((_BULLET_RE, False), (_ORDERED_RE, True)):
+            if item_re.match(stripped):
+                items = []
+                while i < len(lines) and item_re.match(lines[i].rstrip()):
+                    items.append(item_re.match(lines[i].rstrip()).group(1))
+                    i += 1
+                blocks.append(ListBlock(tuple(items), ordered=ordered))
+                break
+        else:
+            para = []
+            while i < len(lines) and lines[i].strip() and not _starts_block(lines[i]):
+                para.append(lines[i])
+                i += 1
+            blocks.append(Paragraph("\n".join(para)))
+
+    return blocks
+
+
+def _starts_block(line: str) -> bool:
+    line = line.rstrip()
+    return bool(
+        line.startswith("```")
+        or _RULE_RE.match(line)
+        or _HEADING_RE.match(line)
+        or _TABLE_ROW_RE.match(line)
+        or _QUOTE_RE.match(line)
+        or _BULLET_RE.match(line)
+        or _ORDERED_RE.match(line)
+    )
+
+
+# ── Compiled templates ───────────────────────────────────────────────────────
+
+
+def _has_fields(text: str) -> bool:
+    return any(name is not None for _, name, _, _ in Formatter().parse(text))
+
+
+def _format_block(block: Block, values: dict) -> Block:
+    if isinstance(block, (Paragraph, Heading)):
+        return replace(block, text=block.text.format(**values))
+    if isinstance(block, ListBlock):
+        return replace(block, items=tuple(t.format(**values) for t in block.items))
+    if isinstance(block, Table):
+        return Table(
+            header=tuple(c.format(**values) for c in block.header),
+            rows=tuple(tuple(c.format(**values) for c in row) for row in block.rows),
+        )
+    if isinstance(block, (CodeBlock, Quote)):
+        return replace(block, lines=tuple(t.format(**values) for t in block.lines))
+    return block
+
+
+def _block_text(block: Block) -> str:
+    """All template text of *block*, for placeholder detection."""
+    if isinstance(block, (Paragraph, Heading)):
+        return block.text
+    if isinstance(block, ListBlock):
+        return "\n".join(block.items)
+    if isinstance(block, Table):
+        return "\n".join("\n".join(r) for r in (block.header, *block.rows))
+    if isinstance(block, (CodeBlock, Quote)):
+        return "\n".join(block.lines)
+    return ""
+
+
+@dataclass(frozen=True)
+class SectionTemplate:
+    """A section template parsed into blocks once.
+
+    ``dynamic`` flags the blocks that contain placeholders; the others are
+    returned unchanged on every render.
+    """
+
+    blocks: tuple[Block, ...]
+    dynamic: tuple[bool, ...]
+
+    @property
+    def is_static(self) -> bool:
+        return not any(self.dynamic)
+
+    def render(self, **values) -> list[Block]:
+        return [
+            _format_block(block, values) if dynamic else block
+            for block, dynamic in zip(self.blocks, self.dynamic)
+        ]
+
+
+def compile_template(text: str) -> SectionTemplate:
+    blocks = parse_blocks(text)
+    dynamic = tuple(_has_fields(_block_text(b)) for b in blocks)
+    # Static blocks are formatted once here so escaped braces are resolved.
+    return SectionTemplate(
+        blocks=tuple(b if d else _format_block(b, {}) for b, d in zip(blocks, dynamic)),
+        dynamic=dynamic,
+    )
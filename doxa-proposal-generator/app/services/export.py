@@ -0,0 +1,98 @@
+"""Streaming ZIP export of stored proposal artifacts.
+
+:func:`stream_zip` yields the archive in chunks while it is being built:
+each artifact is read from storage in small pieces, compressed and handed
+on, and nothing is staged in memory or on disk.  ``zipfile`` writes to a
+non-seekable sink in streaming mode (sizes and checksums follow each
+entry in a data descriptor), so memory stays flat however many
+proposals are selected.  The one exception is inherent to the format:
+the central directory written at the end, a few hundred bytes per file.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from collections.abc import Iterable, Iterator
+from pathlib import PurePosixPath
+from typing import Optional
+
+from app.models.proposal import OutputFormat, ProposalRecord
+from app.services.storage import storage
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _Sink:
+    """Write-only file object whose contents are drained as chunks."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        self.size = 0
+        return data
+
+
+def _entries(
+    selection: Iterable[tuple[str, Optional[ProposalRecord]]],
+    formats: Iterable[OutputFormat],
+    missing: list[str],
+) -> Iterator[tuple[str, str, OutputFormat, ProposalRecord]]:
+    formats = tuple(formats)
+    for proposal_id, record in selection:
+        if record is None:
+            missing.append(f"{proposal_id}: unknown proposal")
+            continue
+        for fmt in formats:
+            location = getattr(record.files, f"{fmt.value}_path")
+            if location:
+                yield f"{fmt.value}/{PurePosixPath(location).name}", location, fmt, record
+            else:
+                missing.append(f"{record.proposal_id}: no {fmt.value} artifact")
+
+
+def stream_zip(
+    selection: Iterable[tuple[str, Optional[ProposalRecord]]],
+    formats: Iterable[OutputFormat],
+) -> Iterator[bytes]:
+    """Yield a ZIP archive of the *formats* artifacts of the selected
+    proposals, given as ``(proposal_id, record or None)`` pairs.
+
+    Files are grouped by format (``pdf/``, ``markdown/``, ``json/``).
+    Unknown ids and artifacts that are not recorded or no longer stored
+    are listed in a final ``MISSING.txt`` entry instead of failing the
+    download, which has already started by then.
+    """
+    sink = _Sink()
+    missing: list[str] = []
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for arcname, location, fmt, record in _entries(selection, formats, missing):
+            d = record.generated_date
+            info = zipfile.ZipInfo(arcname, date_time=(d.year, d.month, d.day, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            try:
+                source = storage.open(location)
+            except (OSError, ValueError):
+                missing.append(f"{record.proposal_id}: {fmt.value} artifact no longer stored")
+                continue
+            with source, archive.open(info, "w") as target:
+                while chunk := source.read(CHUNK_SIZE):
+                    target.write(chunk)
+                    # Small files are coalesced into one chunk.
+                    if sink.size >= CHUNK_SIZE:
+                        yield sink.drain()
+
+        if missing:
+            archive.writestr("MISSING.txt", "\n".join(missing) + "\n")
+    yield sink.drain()
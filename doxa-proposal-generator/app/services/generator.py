@@ -1,34 +1,94 @@
 """Core proposal generation engine.
 
-Orchestrates template rendering, pricing, and file output.
+Orchestrates template rendering, pricing, and file output.  Rendering
+(:func:`render_proposal`) is kept free of disk I/O so callers that only
+need the bytes — e.g. the streaming PDF endpoint — can skip the output
+directory; :func:`save_proposal` persists a rendered proposal and
+:func:`generate_proposal` does both.  :func:`plan_revision` and
+:func:`render_revision` update an existing proposal in place.
 """
 
 from __future__ import annotations
 
-import json
 import math
+import pickle
+import threading
 import uuid
+from collections.abc import Collection
+from dataclasses import dataclass
 from datetime import date
-from pathlib import Path
 
-from app.config import AGENCY_NAME, AGENCY_EMAIL, AGENCY_WEBSITE, OUTPUT_DIR
+from app.config import (
+    AGENCY_EMAIL,
+    AGENCY_NAME,
+    AGENCY_WEBSITE,
+    RESULT_CACHE_ENABLED,
+)
 from app.models.proposal import (
+    ALL_FORMATS,
+    OutputFormat,
+    PricingRecommendation,
     ProposalFiles,
     ProposalInput,
     ProposalOutput,
     ProposalSections,
+    ProposalUpdate,
+)
+from app.services.cache import cache_key, config_version, input_fingerprint, result_cache
+from app.services.document import (
+    Block,
+    Document,
+    Heading,
+    Paragraph,
+    Quote,
+    Rule,
+    Table,
+    blocks_to_markdown,
+    to_markdown,
 )
-from app.services.pdf_export import render_pdf
+from app.services.index import proposal_index
+from app.services.metrics import BYTES_WRITTEN, RESULT_CACHE, stage
+from app.services.pdf_export import Layouts, has_fragments, prerender_static, render_pdf
 from app.services.pricing import calculate_pricing
-from app.templates.sections import (
-    EXECUTIVE_SUMMARY,
-    IMPLEMENTATION_TIMELINE,
-    PROBLEM_ANALYSIS,
-    PROPOSED_SOLUTION,
-    ROI_EXPLANATION,
-    TECHNICAL_ARCHITECTURE,
+from app.services.storage import shard_key, storage
+from app.templates.registry import TemplateSet, template_registry
+
+_SECTION_TITLES = (
+    "1. Executive Summary",
+    "2. Problem Analysis",
+    "3. Proposed AI Automation Solution",
+    "4. Technical Architecture",
+    "5. Pricing",
+    "6. Return on Investment",
+    "7. Implementation Timeline",
+    "8. WhatsApp Pitch",
 )
-from app.templates.whatsapp import WHATSAPP_PITCH
+_SECTION_HEADINGS = tuple(Heading(2, title) for title in _SECTION_TITLES)
+
+
+def static_blocks(templates: TemplateSet | None = None) -> list[Block]:
+    """Blocks that are identical in every proposal."""
+    templates = templates or template_registry.current()
+    blocks: list[Block] = list(_SECTION_HEADINGS)
+    for template in templates.sections.values():
+        blocks.extend(b for b, dynamic in zip(template.blocks, template.dynamic) if not dynamic)
+    return blocks
+
+
+def prerender_static_sections(templates: TemplateSet | None = None) -> int:
+    """Pre-render PDF fragments for every static block; see ``pdf_export``."""
+    return prerender_static(static_blocks(templates))
+
+
+def _on_templates_reloaded(templates: TemplateSet) -> None:
+    # Only re-prerender where PDFs are rendered at all; off the request path.
+    if has_fragments():
+        threading.Thread(
+            target=prerender_static_sections, args=(templates,), name="prerender", daemon=True
+        ).start()
+
+
+template_registry.subscribe(_on_templates_reloaded)
 
 
 def _short_problem(text: str, max_words: int = 18) -> str:
@@ -43,94 +103,205 @@ def _estimate_hours_saved(monthly_customers: int) -> int:
     return max(10, int(monthly_customers * 0.4))
 
 
-def generate_proposal(data: ProposalInput) -> ProposalOutput:
-    """Build every section, write output files, return full result."""
+@dataclass
+class RenderState:
+    """The parts of a render that a later revision of the proposal reuses.
 
-    proposal_id = uuid.uuid4().hex[:12]
-    today = date.today()
+    Saved with the proposal in the index, so whichever process renders
+    the revision finds it.
+    """
 
-    # ── Pricing ──────────────────────────────────────────────────────────
-    pricing = calculate_pricing(data.industry, data.estimated_monthly_customers)
+    # Config and template version the sections were rendered with.
+    version: str
+    data: ProposalInput
+    pricing: PricingRecommendation
+    # Templated sections, by name.
+    blocks: dict[str, list[Block]]
+    whatsapp_pitch: str
+    # PDF layouts of the document's blocks, as far as they were recorded.
+    layouts: Layouts
 
-    # ── Section rendering ────────────────────────────────────────────────
-    common = dict(
-        agency=AGENCY_NAME,
-        company=data.company_name,
-        industry=data.industry,
-        monthly_customers=data.estimated_monthly_customers,
-        currency=pricing.currency,
-    )
 
-    executive_summary = EXECUTIVE_SUMMARY.format(
-        **common,
-        problem_short=_short_problem(data.main_problem),
-    )
+@dataclass
+class RenderedProposal:
+    """A fully rendered proposal held in memory, not yet written to disk."""
 
-    problem_analysis = PROBLEM_ANALYSIS.format(
-        **common,
-        current_process=data.current_process,
-    )
+    output: ProposalOutput
+    file_stem: str
+    pdf: bytes | None = None
+    # Only kept in memory; a cache entry loaded from disk has no document.
+    document: Document | None = None
+    # The input this was rendered from; recorded in the proposal index.
+    data: ProposalInput | None = None
+    # Also recorded; a cache entry loaded from disk has none.
+    state: RenderState | None = None
 
-    proposed_solution = PROPOSED_SOLUTION.format(
-        **common,
-        desired_automation=data.desired_automation,
-    )
 
-    technical_architecture = TECHNICAL_ARCHITECTURE  # static diagram
+def generate_proposal(
+    data: ProposalInput,
+    formats: Collection[OutputFormat] = ALL_FORMATS,
+) -> ProposalOutput:
+    """Build every section, write the requested output files, return result.
 
-    hours_saved = _estimate_hours_saved(data.estimated_monthly_customers)
-    scaled_customers = data.estimated_monthly_customers * 5
-    payback_months = max(1, math.ceil(pricing.setup_fee / max(1, pricing.monthly_subscription)))
+    The Markdown text is always assembled (it is part of the response);
+    *formats* only controls which artifacts are written to storage.
+    Skipping ``pdf`` avoids the most expensive stage entirely.
+    """
+    return save_proposal(render_proposal(data, formats), formats)
 
-    roi_explanation = ROI_EXPLANATION.format(
-        **common,
-        scaled_customers=scaled_customers,
-        hours_saved=hours_saved,
-        monthly_sub=pricing.monthly_subscription,
-        payback_months=payback_months,
-    )
 
-    implementation_timeline = IMPLEMENTATION_TIMELINE
+def render_proposal(
+    data: ProposalInput,
+    formats: Collection[OutputFormat] = ALL_FORMATS,
+) -> RenderedProposal:
+    """Build every section and the Markdown text, plus the PDF bytes when
+    ``pdf`` is among *formats*.  Nothing is written to artifact storage.
 
-    whatsapp_pitch = WHATSAPP_PITCH.format(
-        contact=data.company_name.split()[0],
-        agency=AGENCY_NAME,
-        company=data.company_name,
-        industry=data.industry.lower(),
-        setup_fee=pricing.setup_fee,
-        monthly_sub=pricing.monthly_subscription,
-        currency=pricing.currency,
-    )
+    Results are served from the result cache when an identical input was
+    already rendered today with the current templates and pricing; a hit
+    keeps the original proposal id.
+    """
+    rendered = _render_cached(data, formats)
+    rendered.data = data
+    return rendered
 
-    sections = ProposalSections(
-        executive_summary=executive_summary,
-        problem_analysis=problem_analysis,
-        proposed_solution=proposed_solution,
-        technical_architecture=technical_architecture,
-        pricing=pricing,
-        roi_explanation=roi_explanation,
-        implementation_timeline=implementation_timeline,
-        whatsapp_pitch=whatsapp_pitch,
-    )
 
-    # ── Markdown assembly ────────────────────────────────────────────────
-    md = _build_markdown(proposal_id, today, data, sections)
+def render_for_transfer(
+    data: ProposalInput,
+    formats: Collection[OutputFormat] = ALL_FORMATS,
+) -> RenderedProposal:
+    """:func:`render_proposal` for a worker process.
 
-    # ── File output ──────────────────────────────────────────────────────
-    file_stem = f"{proposal_id}_{data.company_name.replace(' ', '_')}"
-    md_path = OUTPUT_DIR / f"{file_stem}.md"
-    pdf_path = OUTPUT_DIR / f"{file_stem}.pdf"
-    json_path = OUTPUT_DIR / f"{file_stem}.json"
+    The block document is dropped: the caller has the PDF bytes already
+    and would only pay to pickle it back.
+    """
+    rendered = render_proposal(data, formats)
+    rendered.document = None
+    return rendered
 
-    md_path.write_text(md, encoding="utf-8")
-    render_pdf(md, pdf_path)
 
-    files = ProposalFiles(
-        markdown_path=str(md_path),
-        pdf_path=str(pdf_path),
-        json_path=str(json_path),
-    )
+def _render_cached(
+    data: ProposalInput,
+    formats: Collection[OutputFormat],
+) -> RenderedProposal:
+    today = date.today()
+    # One snapshot for the whole render, even if templates reload meanwhile.
+    templates = template_registry.current()
+    if not RESULT_CACHE_ENABLED:
+        return _render(data, formats, uuid.uuid4().hex[:12], today, templates)
+
+    key = cache_key(data, today, templates.version)
+    cached = result_cache.get(key)
+    if cached is not None and _revised_since(cached, data):
+        cached = None
+    RESULT_CACHE.inc(result="miss" if cached is None else "hit")
+    if cached is None:
+        rendered = _render(data, formats, uuid.uuid4().hex[:12], today, templates)
+    elif OutputFormat.pdf in formats and cached.pdf is None:
+        # Earlier request skipped the PDF; render it now and upgrade the entry.
+        if cached.document is None:
+            rendered = _render(data, formats, cached.output.proposal_id, today, templates)
+        else:
+            rendered = cached
+            rendered.pdf = render_pdf(cached.document, layouts=cached.state.layouts)
+    else:
+        return cached
+    result_cache.put(key, rendered)
+    return rendered
+
+
+def _revised_since(cached: RenderedProposal, data: ProposalInput) -> bool:
+    """Whether the cached proposal's id has since been revised to another
+    input, so serving it would put the old content back under that id."""
+    recorded = proposal_index.get_input(cached.output.proposal_id)
+    return recorded is not None and input_fingerprint(recorded) != input_fingerprint(data)
+
+
+def _render(
+    data: ProposalInput,
+    formats: Collection[OutputFormat],
+    proposal_id: str,
+    today: date,
+    templates: TemplateSet | None = None,
+    previous: RenderState | None = None,
+    recompute: Collection[str] = (),
+) -> RenderedProposal:
+    """Render a proposal in memory.
+
+    With *previous*, the sections not named in *recompute* are taken from
+    it as they are, and the PDF places unchanged blocks from its layouts.
+    """
+    templates = templates or template_registry.current()
 
+    def keep(name: str) -> bool:
+        return previous is not None and name not in recompute
+
+    # ── Pricing ──────────────────────────────────────────────────────────
+    with stage("pricing"):
+        if keep("pricing"):
+            pricing = previous.pricing
+        else:
+            pricing = calculate_pricing(data.industry, data.estimated_monthly_customers)
+
+    # ── Section rendering ────────────────────────────────────────────────
+    with stage("sections"):
+        common = dict(
+            agency=AGENCY_NAME,
+            company=data.company_name,
+            industry=data.industry,
+            monthly_customers=data.estimated_monthly_customers,
+            currency=pricing.currency,
+        )
+
+        hours_saved = _estimate_hours_saved(data.estimated_monthly_customers)
+        scaled_customers = data.estimated_monthly_customers * 5
+        payback_months = max(1, math.ceil(pricing.setup_fee / max(1, pricing.monthly_subscription)))
+
+        variables = {
+            "executive_summary": dict(common, problem_short=_short_problem(data.main_problem)),
+            "problem_analysis": dict(common, current_process=data.current_process),
+            "proposed_solution": dict(common, desired_automation=data.desired_automation),
+            # Static diagram
+            "technical_architecture": {},
+            "roi_explanation": dict(
+                common,
+                scaled_customers=scaled_customers,
+                hours_saved=hours_saved,
+                monthly_sub=pricing.monthly_subscription,
+                payback_months=payback_months,
+            ),
+            "implementation_timeline": {},
+        }
+        blocks = {
+            name: previous.blocks[name] if keep(name) else templates.section(name).render(**values)
+            for name, values in variables.items()
+        }
+
+        if keep("whatsapp_pitch"):
+            whatsapp_pitch = previous.whatsapp_pitch
+        else:
+            whatsapp_pitch = templates.whatsapp_pitch.format(
+                contact=data.company_name.split()[0],
+                agency=AGENCY_NAME,
+                company=data.company_name,
+                industry=data.industry.lower(),
+                setup_fee=pricing.setup_fee,
+                monthly_sub=pricing.monthly_subscription,
+                currency=pricing.currency,
+            )
+
+        sections = ProposalSections(
+            **{name: blocks_to_markdown(b) for name, b in blocks.items()},
+            pricing=pricing,
+            whatsapp_pitch=whatsapp_pitch,
+        )
+
+    # ── Document assembly ────────────────────────────────────────────────
+    with stage("markdown"):
+        doc = _build_document(proposal_id, today, data, sections, blocks)
+        md = to_markdown(doc)
+
+    file_stem = f"{proposal_id}_{data.company_name.replace(' ', '_')}"
     output = ProposalOutput(
         proposal_id=proposal_id,
         generated_date=today,
@@ -138,60 +309,228 @@ def generate_proposal(data: ProposalInput) -> ProposalOutput:
         industry=data.industry,
         sections=sections,
         markdown=md,
-        files=files,
+        files=ProposalFiles(),
     )
 
-    # Write JSON last so it includes file paths.
-    json_path.write_text(
-        output.model_dump_json(indent=2), encoding="utf-8"
+    layouts: Layouts = dict(previous.layouts) if previous is not None else {}
+    pdf = render_pdf(doc, layouts=layouts) if OutputFormat.pdf in formats else None
+    state = RenderState(
+        version=_state_version(templates),
+        data=data,
+        pricing=pricing,
+        blocks=blocks,
+        whatsapp_pitch=whatsapp_pitch,
+        # Only the blocks of this version, so the state does not grow.
+        layouts={block: layouts[block] for block in doc.blocks if block in layouts},
     )
+    return RenderedProposal(output=output, file_stem=file_stem, pdf=pdf, document=doc, state=state)
+
+
+def save_proposal(
+    rendered: RenderedProposal,
+    formats: Collection[OutputFormat] = ALL_FORMATS,
+) -> ProposalOutput:
+    """Write the requested artifacts of *rendered* to artifact storage.
+
+    Fills in ``output.files``, records the proposal in the index and
+    returns the output model.
+    """
+    output = rendered.output
+    files = output.files
+    day = output.generated_date
+
+    def put(fmt: OutputFormat, suffix: str, payload: bytes) -> str:
+        with stage("file_write"):
+            location = storage.put(shard_key(f"{rendered.file_stem}{suffix}", day), payload)
+        BYTES_WRITTEN.inc(len(payload), format=fmt.value)
+        return location
+
+    if OutputFormat.markdown in formats:
+        files.markdown_path = put(OutputFormat.markdown, ".md", output.markdown.encode("utf-8"))
+
+    if OutputFormat.pdf in formats:
+        pdf = rendered.pdf
+        if pdf is None:
+            layouts = rendered.state.layouts if rendered.state else None
+            pdf = rendered.pdf = render_pdf(rendered.document, layouts=layouts)
+        files.pdf_path = put(OutputFormat.pdf, ".pdf", pdf)
+
+    # Write JSON last: it includes the other artifacts' locations.
+    if OutputFormat.json in formats:
+        # The JSON describes itself by the location it is about to get.
+        files.json_path = storage.location_for(shard_key(f"{rendered.file_stem}.json", day))
+        with stage("json_dump"):
+            payload = output.model_dump_json().encode("utf-8")
+        put(OutputFormat.json, ".json", payload)
+
+    state = pickle.dumps(rendered.state, pickle.HIGHEST_PROTOCOL) if rendered.state else None
+    proposal_index.record(output, rendered.data, state)
+    return output
+
 
+# ── Revisions ────────────────────────────────────────────────────────────────
+# The input fields behind each template variable.  ``agency`` and
+# ``currency`` come from settings, so no edit of a proposal changes them.
+
+_PRICING_INPUTS = frozenset({"industry", "estimated_monthly_customers"})
+_VARIABLE_INPUTS: dict[str, frozenset[str]] = {
+    "agency": frozenset(),
+    "currency": frozenset(),
+    "company": frozenset({"company_name"}),
+    "contact": frozenset({"company_name"}),
+    "industry": frozenset({"industry"}),
+    "monthly_customers": frozenset({"estimated_monthly_customers"}),
+    "scaled_customers": frozenset({"estimated_monthly_customers"}),
+    "hours_saved": frozenset({"estimated_monthly_customers"}),
+    "problem_short": frozenset({"main_problem"}),
+    "current_process": frozenset({"current_process"}),
+    "desired_automation": frozenset({"desired_automation"}),
+    "setup_fee": _PRICING_INPUTS,
+    "monthly_sub": _PRICING_INPUTS,
+    "payback_months": _PRICING_INPUTS,
+}
+
+
+def section_inputs(templates: TemplateSet | None = None) -> dict[str, frozenset[str]]:
+    """The input fields each section depends on, in document order.
+
+    Derived from the placeholders the current templates actually use, so
+    an edited template changes the answer with it.
+    """
+    templates = templates or template_registry.current()
+    inputs: dict[str, frozenset[str]] = {}
+    for name in ProposalSections.model_fields:
+        if name == "pricing":
+            inputs[name] = _PRICING_INPUTS
+        else:
+            inputs[name] = frozenset().union(*(_VARIABLE_INPUTS[v] for v in templates.fields[name]))
+    return inputs
+
+
+def plan_revision(
+    previous: ProposalInput, update: ProposalUpdate
+) -> tuple[ProposalInput, list[str]]:
+    """Apply *update* to *previous*.
+
+    Returns the new input and the fields whose value changed.
+    """
+    changes = update.model_dump(exclude_none=True)
+    changed = [name for name, value in changes.items() if getattr(previous, name) != value]
+    return previous.model_copy(update=changes), changed
+
+
+def _state_version(templates: TemplateSet) -> str:
+    return f"{config_version()}:{templates.version}"
+
+
+def _load_state(proposal_id: str) -> RenderState | None:
+    payload = proposal_index.get_render_state(proposal_id)
+    if payload is None:
+        return None
+    try:
+        return pickle.loads(payload)
+    except Exception:
+        # Saved by a version of the code whose classes have since changed.
+        return None
+
+
+def render_revision(
+    data: ProposalInput,
+    formats: Collection[OutputFormat],
+    proposal_id: str,
+    generated_date: date,
+) -> tuple[RenderedProposal, list[str]]:
+    """Re-render an existing proposal from *data*, keeping its id and date.
+
+    Only the sections that depend on an input field changed since the
+    saved render are rendered again; the others, and the PDF layout of
+    every unchanged block, are reused.  Without a saved render, or after
+    the templates or settings changed, every section is.  Returns the
+    proposal and the sections that were rendered.
+
+    The result cache is bypassed: it maps inputs to new proposals.  Like
+    :func:`render_for_transfer`, the block document is not returned, so
+    this can run in the render pool.
+    """
+    templates = template_registry.current()
+    previous = _load_state(proposal_id)
+    inputs = section_inputs(templates)
+    if previous is not None and previous.version != _state_version(templates):
+        previous = None
+    if previous is None:
+        recomputed = list(inputs)
+    else:
+        changed = {
+            name for name in ProposalInput.model_fields
+            if getattr(previous.data, name) != getattr(data, name)
+        }
+        recomputed = [name for name, fields in inputs.items() if fields & changed]
+    rendered = _render(data, formats, proposal_id, generated_date, templates, previous, recomputed)
+    rendered.data = data
+    rendered.document = None
+    return rendered, recomputed
+
+
+def save_revision(
+    rendered: RenderedProposal,
+    formats: Collection[OutputFormat],
+    previous: ProposalFiles,
+) -> ProposalOutput:
+    """Save a revised proposal and delete the artifacts it superseded.
+
+    Artifacts of the previous revision that were not rewritten — a format
+    not requested this time, or a file renamed with the company — would
+    otherwise keep serving the old content.
+    """
+    output = save_proposal(rendered, formats)
+    current = {output.files.markdown_path, output.files.pdf_path, output.files.json_path}
+    stale = [
+        location
+        for location in (previous.markdown_path, previous.pdf_path, previous.json_path)
+        if location and location not in current
+    ]
+    for location in stale:
+        storage.delete(location)
+    if stale:
+        proposal_index.forget_locations(stale)
     return output
 
 
-# ── Markdown builder ─────────────────────────────────────────────────────────
+# ── Document builder ─────────────────────────────────────────────────────────
 
-def _build_markdown(
+def _build_document(
     proposal_id: str,
     today: date,
     data: ProposalInput,
     s: ProposalSections,
-) -> str:
-    pricing_block = (
-        f"| Item | Amount |\n"
-        f"| --- | --- |\n"
-        f"| Setup fee | {s.pricing.currency} {s.pricing.setup_fee:,} |\n"
-        f"| Monthly subscription | {s.pricing.currency} "
-        f"{s.pricing.monthly_subscription:,} |\n"
-    )
+    blocks: dict[str, list[Block]],
+) -> Document:
+    pricing_rows = [
+        ("Setup fee", f"{s.pricing.currency} {s.pricing.setup_fee:,}"),
+        ("Monthly subscription", f"{s.pricing.currency} {s.pricing.monthly_subscription:,}"),
+    ]
     if s.pricing.usage_based_pricing:
-        pricing_block += (
-            f"| Usage-based pricing | {s.pricing.usage_based_pricing} |\n"
-        )
-
-    return (
-        f"# Automation Proposal for {data.company_name}\n\n"
-        f"**Proposal ID:** {proposal_id}  \n"
-        f"**Date:** {today.isoformat()}  \n"
-        f"**Prepared by:** {AGENCY_NAME} — {AGENCY_EMAIL}  \n"
-        f"**Website:** {AGENCY_WEBSITE}\n\n"
-        f"---\n\n"
-        f"## 1. Executive Summary\n\n{s.executive_summary}\n\n"
-        f"---\n\n"
-        f"## 2. Problem Analysis\n\n{s.problem_analysis}\n\n"
-        f"---\n\n"
-        f"## 3. Proposed AI Automation Solution\n\n{s.proposed_solution}\n\n"
-        f"---\n\n"
-        f"## 4. Technical Architecture\n\n{s.technical_architecture}\n\n"
-        f"---\n\n"
-        f"## 5. Pricing\n\n{pricing_block}\n\n"
-        f"---\n\n"
-        f"## 6. Return on Investment\n\n{s.roi_explanation}\n\n"
-        f"---\n\n"
-        f"## 7. Implementation Timeline\n\n{s.implementation_timeline}\n\n"
-        f"---\n\n"
-        f"## 8. WhatsApp Pitch\n\n"
-        f"> {s.whatsapp_pitch.replace(chr(10), chr(10) + '> ')}\n\n"
-        f"---\n\n"
-        f"*Generated by {AGENCY_NAME} Proposal Generator*\n"
-    )
+        pricing_rows.append(("Usage-based pricing", s.pricing.usage_based_pricing))
+
+    def section(number: int, body: list[Block]) -> list[Block]:
+        return [_SECTION_HEADINGS[number], *body, Rule()]
+
+    return Document([
+        Heading(1, f"Automation Proposal for {data.company_name}"),
+        Paragraph(
+            f"**Proposal ID:** {proposal_id}  \n"
+            f"**Date:** {today.isoformat()}  \n"
+            f"**Prepared by:** {AGENCY_NAME} — {AGENCY_EMAIL}  \n"
+            f"**Website:** {AGENCY_WEBSITE}"
+        ),
+        Rule(),
+        *section(0, blocks["executive_summary"]),
+        *section(1, blocks["problem_analysis"]),
+        *section(2, blocks["proposed_solution"]),
+        *section(3, blocks["technical_architecture"]),
+        *section(4, [Table(("Item", "Amount"), tuple(pricing_rows))]),
+        *section(5, blocks["roi_explanation"]),
+        *section(6, blocks["implementation_timeline"]),
+        *section(7, [Quote(tuple(s.whatsapp_pitch.split("\n")))]),
+        Paragraph(f"*Generated by {AGENCY_NAME} Proposal Generator*"),
+    ])
@@ -0,0 +1,314 @@
+"""Local index of generated proposals.
+
+Every saved proposal is recorded in SQLite with its client, industry,
+date, pricing and artifact paths, so lookups by id and filtered listings
+never have to scan ``OUTPUT_DIR``.  The original input is kept as well so
+a proposal can be regenerated later, and so is the state of its latest
+render (opaque here), which a revision reuses.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from app.config import INDEX_DB_PATH
+from app.models.proposal import (
+    PricingRecommendation,
+    ProposalFiles,
+    ProposalInput,
+    ProposalOutput,
+    ProposalRecord,
+)
+from app.services.sqlite import connect, initialise, transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS proposals (
+    id                    TEXT PRIMARY KEY,
+    client                TEXT NOT NULL COLLATE NOCASE,
+    industry              TEXT NOT NULL COLLATE NOCASE,
+    generated_date        TEXT NOT NULL,
+    setup_fee             INTEGER NOT NULL,
+    monthly_subscription  INTEGER NOT NULL,
+    usage_based_pricing   TEXT,
+    currency              TEXT NOT NULL,
+    markdown_path         TEXT,
+    pdf_path              TEXT,
+    json_path             TEXT,
+    input_json            TEXT,
+    updated_at            TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS proposals_client ON proposals (client);
+CREATE INDEX IF NOT EXISTS proposals_industry ON proposals (industry, generated_date);
+CREATE INDEX IF NOT EXISTS proposals_date ON proposals (generated_date, id);
+-- A table of its own, as listings read whole rows of ``proposals``.
+CREATE TABLE IF NOT EXISTS render_states (
+    id     TEXT PRIMARY KEY,
+    state  BLOB NOT NULL
+);
+"""
+
+
+class ProposalIndex:
+    def __init__(self, path: Path):
+        self.path = path
+        self._initialised = False
+        self._init_lock = threading.Lock()
+
+    def _ensure_schema(self) -> None:
+        if self._initialised:
+            return
+        with self._init_lock:
+            if not self._initialised:
+                conn = initialise(self.path)
+                try:
+                    conn.executescript(_SCHEMA)
+                finally:
+                    conn.close()
+                self._initialised = True
+
+    def record(
+        self,
+        output: ProposalOutput,
+        data: Optional[ProposalInput] = None,
+        state: Optional[bytes] = None,
+    ) -> None:
+        """Insert or update *output*, with its input and render *state*.
+
+        Re-saving the same proposal (a cache hit, or another format being
+        written later) keeps artifact paths already recorded, and the
+        render state when none is given.
+        """
+        self._ensure_schema()
+        pricing = output.sections.pricing
+        files = output.files
+        with transaction(self.path) as conn:
+            conn.execute(
+                """
+                INSERT INTO proposals (
+                    id, client, industry, generated_date, setup_fee,
+                    monthly_subscription, usage_based_pricing, currency,
+                    markdown_path, pdf_path, json_path, input_json, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    client = excluded.client,
+                    industry = excluded.industry,
+                    generated_date = excluded.generated_date,
+                    setup_fee = excluded.setup_fee,
+                    monthly_subscription = excluded.monthly_subscription,
+                    usage_based_pricing = excluded.usage_based_pricing,
+                    currency = excluded.currency,
+                    markdown_path = COALESCE(excluded.markdown_path, markdown_path),
+                    pdf_path = COALESCE(excluded.pdf_path, pdf_path),
+                    json_path = COALESCE(excluded.json_path, json_path),
+                    input_json = COALESCE(excluded.input_json, input_json),
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    output.proposal_id,
+                    output.client,
+                    output.industry,
+                    output.generated_date.isoformat(),
+                    pricing.setup_fee,
+                    pricing.monthly_subscription,
+                    pricing.usage_based_pricing,
+                    pricing.currency,
+                    files.markdown_path,
+                    files.pdf_path,
+                    files.json_path,
+                    data.model_dump_json() if data is not None else None,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            if state is not None:
+                conn.execute(
+                    "INSERT INTO render_states (id, state) VALUES (?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET state = excluded.state",
+                    (output.proposal_id, state),
+                )
+
+    def forget_locations(self, locations: list[str]) -> None:
+        """Clear artifact paths that no longer exist (e.g. after retention)."""
+        self._ensure_schema()
+        with transaction(self.path) as conn:
+            for column in ("markdown_path", "pdf_path", "json_path"):
+                conn.executemany(
+                    f"UPDATE proposals SET {column} = NULL WHERE {column} = ?",
+                    [(loc,) for loc in locations],
+                )
+
+    def get(self, proposal_id: str) -> Optional[ProposalRecord]:
+        self._ensure_schema()
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT * FROM proposals WHERE id = ?", (proposal_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return _to_record(row) if row else None
+
+    def get_input(self, proposal_id: str) -> Optional[ProposalInput]:
+        """The input a proposal was generated from, if it was recorded."""
+        self._ensure_schema()
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT input_json FROM proposals WHERE id = ?", (proposal_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None or row["input_json"] is None:
+            return None
+        return ProposalInput.model_validate_json(row["input_json"])
+
+    def get_render_state(self, proposal_id: str) -> Optional[bytes]:
+        """The state recorded with the proposal's latest render, if any."""
+        self._ensure_schema()
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT state FROM render_states WHERE id = ?", (proposal_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row["state"] if row else None
+
+    def search(
+        self,
+        client: Optional[str] = None,
+        industry: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[int, list[ProposalRecord]]:
+        """Filtered listing, newest first.  Returns ``(total, page)``.
+
+        ``client`` matches case-insensitively as a prefix; ``industry``
+        matches case-insensitively exactly.
+        """
+        self._ensure_schema()
+        where, params = _filters(client, industry, date_from, date_to)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        conn = connect(self.path)
+        try:
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM proposals {clause}", params
+            ).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT * FROM proposals {clause} "
+                "ORDER BY generated_date DESC, id DESC LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        finally:
+            conn.close()
+        return total, [_to_record(r) for r in rows]
+
+    def iter_matching(
+        self,
+        client: Optional[str] = None,
+        industry: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        page_size: int = 500,
+    ) -> Iterator[ProposalRecord]:
+        """Every proposal matching the filters of :meth:`search`, newest first.
+
+        Reads one page at a time on a fresh connection (keyset pagination),
+        so the caller may consume it slowly, from any thread.
+        """
+        self._ensure_schema()
+        where, params = _filters(client, industry, date_from, date_to)
+        after: Optional[tuple[str, str]] = None
+        while True:
+            page_where = list(where)
+            page_params = list(params)
+            if after is not None:
+                page_where.append("(generated_date, id) < (?, ?)")
+                page_params.extend(after)
+            clause = f"WHERE {' AND '.join(page_where)}" if page_where else ""
+            conn = connect(self.path)
+            try:
+                rows = conn.execute(
+                    f"SELECT * FROM proposals {clause} "
+                    "ORDER BY generated_date DESC, id DESC LIMIT ?",
+                    [*page_params, page_size],
+                ).fetchall()
+            finally:
+                conn.close()
+            for row in rows:
+                yield _to_record(row)
+            if len(rows) < page_size:
+                return
+            after = (rows[-1]["generated_date"], rows[-1]["id"])
+
+    def iter_ids(
+        self, ids: Iterable[str], page_size: int = 500
+    ) -> Iterator[tuple[str, Optional[ProposalRecord]]]:
+        """``(id, record)`` for each of *ids* in order; ``None`` if unknown."""
+        self._ensure_schema()
+        ids = list(ids)
+        for start in range(0, len(ids), page_size):
+            chunk = ids[start : start + page_size]
+            conn = connect(self.path)
+            try:
+                rows = conn.execute(
+                    f"SELECT * FROM proposals WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+            finally:
+                conn.close()
+            found = {row["id"]: _to_record(row) for row in rows}
+            for proposal_id in chunk:
+                yield proposal_id, found.get(proposal_id)
+
+
+def _filters(
+    client: Optional[str],
+    industry: Optional[str],
+    date_from: Optional[date],
+    date_to: Optional[date],
+) -> tuple[list[str], list]:
+    where: list[str] = []
+    params: list = []
+    if client:
+        escaped = client.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        where.append("client LIKE ? ESCAPE '\\'")
+        params.append(escaped + "%")
+    if industry:
+        where.append("industry = ?")
+        params.append(industry)
+    if date_from:
+        where.append("generated_date >= ?")
+        params.append(date_from.isoformat())
+    if date_to:
+        where.append("generated_date <= ?")
+        params.append(date_to.isoformat())
+    return where, params
+
+
+def _to_record(row) -> ProposalRecord:
+    return ProposalRecord(
+        proposal_id=row["id"],
+        client=row["client"],
+        industry=row["industry"],
+        generated_date=row["generated_date"],
+        pricing=PricingRecommendation(
+            setup_fee=row["setup_fee"],
+            monthly_subscription=row["monthly_subscription"],
+            usage_based_pricing=row["usage_based_pricing"],
+            currency=row["currency"],
+        ),
+        files=ProposalFiles(
+            markdown_path=row["markdown_path"],
+            pdf_path=row["pdf_path"],
+            json_path=row["json_path"],
+        ),
+    )
+
+
+proposal_index = ProposalIndex(INDEX_DB_PATH)
@@ -0,0 +1,360 @@
+"""Background proposal generation backed by a local SQLite queue.
+
+Submitting a job only inserts a row, so the request returns at once.  A
+bounded pool of worker threads drains the queue; in ``process`` mode each
+thread hands rendering to the shared process pool.  Because the queue
+lives in SQLite, queued jobs survive a restart, and several uvicorn
+workers can share it safely: jobs are claimed in an ``IMMEDIATE``
+transaction and carry a lease, so a job whose worker died is picked up
+again once the lease expires.  While a job runs, its worker renews the
+lease every third of ``JOB_LEASE_SECONDS``, so a slow job is not taken
+over by another worker.  Each claim gets a fresh lease token, and a
+worker only renews the lease or records the outcome while it still holds
+it.  A job
+that has used up ``JOB_MAX_ATTEMPTS`` (for example one whose rendering
+keeps killing its worker) is failed instead of being leased again.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import uuid
+from collections.abc import Collection, Iterator
+from contextlib import contextmanager
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from app.config import (
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_INTERVAL,
+    JOB_WORKER_MODE,
+    JOB_WORKERS,
+    JOBS_DB_PATH,
+)
+from app.models.proposal import (
+    JobState,
+    JobStatus,
+    OutputFormat,
+    ProposalFiles,
+    ProposalInput,
+    ProposalOutput,
+)
+from app.services.generator import generate_proposal
+from app.services.pool import get_process_pool, reset_process_pool
+from app.services.sqlite import connect, initialise, transaction
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            TEXT PRIMARY KEY,
+    status        TEXT NOT NULL,
+    payload       TEXT NOT NULL,
+    formats       TEXT NOT NULL,
+    created_at    TEXT NOT NULL,
+    started_at    TEXT,
+    finished_at   TEXT,
+    lease_until   TEXT,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL DEFAULT 3,
+    lease_token   TEXT,
+    proposal_id   TEXT,
+    files         TEXT,
+    error         TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, created_at);
+"""
+
+# Columns added after the first release, for databases created before them.
+_ADDED_COLUMNS = {
+    "max_attempts": "INTEGER NOT NULL DEFAULT 3",
+    "lease_token": "TEXT",
+}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobStore:
+    """Persistent job queue."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._initialised = False
+        self._init_lock = threading.Lock()
+
+    def _ensure_schema(self) -> None:
+        if self._initialised:
+            return
+        with self._init_lock:
+            if not self._initialised:
+                conn = initialise(self.path)
+                try:
+                    conn.executescript(_SCHEMA)
+                    present = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+                    for name, definition in _ADDED_COLUMNS.items():
+                        if name not in present:
+                            conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+                finally:
+                    conn.close()
+                self._initialised = True
+
+    def submit(self, data: ProposalInput, formats: Collection[OutputFormat]) -> JobStatus:
+        self._ensure_schema()
+        job_id = uuid.uuid4().hex
+        created = _now()
+        with transaction(self.path) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, payload, formats, created_at, max_attempts) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    JobState.queued.value,
+                    data.model_dump_json(),
+                    json.dumps(sorted(f.value for f in formats)),
+                    created.isoformat(),
+                    max(1, JOB_MAX_ATTEMPTS),
+                ),
+            )
+        return JobStatus(job_id=job_id, status=JobState.queued, created_at=created)
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        self._ensure_schema()
+        conn = connect(self.path)
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return _to_status(row) if row else None
+
+    def claim(self) -> Optional[tuple[str, str, ProposalInput, frozenset[OutputFormat]]]:
+        """Take the oldest runnable job, or ``None`` if the queue is empty.
+
+        Runnable means queued, or running with an expired lease (its worker
+        crashed or was restarted mid-job).  Returns the job id, the lease
+        token to pass to :meth:`complete`, :meth:`fail` or :meth:`release`,
+        and the job's input.
+        """
+        self._ensure_schema()
+        now = _now()
+        with transaction(self.path, immediate=True) as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT id, payload, formats, attempts, max_attempts FROM jobs "
+                    "WHERE status = ? OR (status = ? AND lease_until < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (JobState.queued.value, JobState.running.value, now.isoformat()),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["attempts"] < row["max_attempts"]:
+                    break
+                # Every attempt ended with the worker gone before it finished.
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, lease_until = NULL, "
+                    "lease_token = NULL, error = ? WHERE id = ?",
+                    (
+                        JobState.failed.value,
+                        now.isoformat(),
+                        f"gave up after {row['attempts']} attempts",
+                        row["id"],
+                    ),
+                )
+            lease = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, lease_until = ?, "
+                "lease_token = ?, attempts = attempts + 1 WHERE id = ?",
+                (
+                    JobState.running.value,
+                    now.isoformat(),
+                    (now + timedelta(seconds=JOB_LEASE_SECONDS)).isoformat(),
+                    lease,
+                    row["id"],
+                ),
+            )
+        data = ProposalInput.model_validate_json(row["payload"])
+        formats = frozenset(OutputFormat(f) for f in json.loads(row["formats"]))
+        return row["id"], lease, data, formats
+
+    def renew(self, job_id: str, lease: str) -> bool:
+        """Extend a running job's lease; ``False`` if it was lost."""
+        until = _now() + timedelta(seconds=JOB_LEASE_SECONDS)
+        with transaction(self.path) as conn:
+            renewed = conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND lease_token = ?",
+                (until.isoformat(), job_id, JobState.running.value, lease),
+            ).rowcount
+        return bool(renewed)
+
+    def complete(self, job_id: str, lease: str, output: ProposalOutput) -> bool:
+        """Record success; ``False`` if the lease was lost to another worker."""
+        return self._finish(
+            job_id,
+            lease,
+            "status = ?, finished_at = ?, proposal_id = ?, files = ?",
+            (
+                JobState.succeeded.value,
+                _now().isoformat(),
+                output.proposal_id,
+                output.files.model_dump_json(),
+            ),
+        )
+
+    def fail(self, job_id: str, lease: str, error: str) -> bool:
+        """Record failure; ``False`` if the lease was lost to another worker."""
+        return self._finish(
+            job_id,
+            lease,
+            "status = ?, finished_at = ?, error = ?",
+            (JobState.failed.value, _now().isoformat(), error),
+        )
+
+    def release(self, job_id: str, lease: str, error: str) -> bool:
+        """Queue the job again after its render worker crashed, or fail it
+        if it has no attempts left."""
+        return self._finish(
+            job_id,
+            lease,
+            "status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+            "finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END, "
+            "error = ?",
+            (JobState.queued.value, JobState.failed.value, _now().isoformat(), error),
+        )
+
+    def _finish(self, job_id: str, lease: str, assignments: str, params: tuple) -> bool:
+        with transaction(self.path) as conn:
+            updated = conn.execute(
+                f"UPDATE jobs SET {assignments}, lease_until = NULL, lease_token = NULL "
+                "WHERE id = ? AND status = ? AND lease_token = ?",
+                (*params, job_id, JobState.running.value, lease),
+            ).rowcount
+        if not updated:
+            logger.warning("Job %s: lease lost before the outcome was recorded", job_id)
+        return bool(updated)
+
+
+def _to_status(row) -> JobStatus:
+    return JobStatus(
+        job_id=row["id"],
+        status=JobState(row["status"]),
+        created_at=row["created_at"],
+        started_at=row["started_at"],
+        finished_at=row["finished_at"],
+        attempts=row["attempts"],
+        proposal_id=row["proposal_id"],
+        files=ProposalFiles.model_validate_json(row["files"]) if row["files"] else None,
+        error=row["error"],
+    )
+
+
+class JobWorkers:
+    """Fixed-size pool of threads that drain a :class:`JobStore`."""
+
+    def __init__(self, store: JobStore, workers: int, mode: str):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"JOB_WORKER_MODE must be 'thread' or 'process', not {mode!r}")
+        self.store = store
+        self.workers = workers
+        self.mode = mode
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        self._stop.clear()
+        for n in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"job-worker-{n}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 30) -> None:
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads.clear()
+
+    def notify(self) -> None:
+        """Wake idle workers after a submit instead of waiting for the poll."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim()
+            except Exception:
+                logger.exception("Claiming a job failed")
+                job = None
+            if job is None:
+                self._wake.wait(JOB_POLL_INTERVAL)
+                self._wake.clear()
+                continue
+            self._execute(*job)
+
+    def _execute(
+        self,
+        job_id: str,
+        lease: str,
+        data: ProposalInput,
+        formats: frozenset[OutputFormat],
+    ) -> None:
+        with self._heartbeat(job_id, lease):
+            self._run_job(job_id, lease, data, formats)
+
+    @contextmanager
+    def _heartbeat(self, job_id: str, lease: str) -> Iterator[None]:
+        """Keep renewing the job's lease while the block runs."""
+        done = threading.Event()
+
+        def beat() -> None:
+            while not done.wait(JOB_LEASE_SECONDS / 3):
+                try:
+                    if not self.store.renew(job_id, lease) and not done.is_set():
+                        logger.warning("Job %s: lease lost while running", job_id)
+                        return
+                except Exception:
+                    logger.exception("Renewing the lease of job %s failed", job_id)
+
+        thread = threading.Thread(target=beat, name=f"job-heartbeat-{job_id[:8]}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _run_job(
+        self,
+        job_id: str,
+        lease: str,
+        data: ProposalInput,
+        formats: frozenset[OutputFormat],
+    ) -> None:
+        try:
+            if self.mode == "process":
+                pool = get_process_pool()
+                try:
+                    output = pool.submit(generate_proposal, data, formats).result()
+                except BrokenProcessPool as exc:
+                    # This job or another one sharing the pool crashed a worker.
+                    reset_process_pool(pool)
+                    logger.warning("Job %s: render worker crashed", job_id)
+                    self.store.release(job_id, lease, f"worker crashed: {exc}")
+                    return
+            else:
+                output = generate_proposal(data, formats)
+        except Exception as exc:
+            logger.exception("Job %s failed", job_id)
+            self.store.fail(job_id, lease, str(exc))
+            return
+        self.store.complete(job_id, lease, output)
+
+
+job_store = JobStore(JOBS_DB_PATH)
+job_workers = JobWorkers(job_store, workers=JOB_WORKERS, mode=JOB_WORKER_MODE)
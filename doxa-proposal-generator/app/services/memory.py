@@ -0,0 +1,206 @@
+"""Opt-in memory profiling with ``tracemalloc``.
+
+With ``MEMORY_PROFILING=true`` allocation tracing starts with the
+application, before the render pool is forked, so pool workers trace too.
+While tracing:
+
+* every request and every generation stage records its *peak* — the most
+  memory it had allocated above the level it started at — into histograms
+  (see :mod:`app.services.metrics`) and into the per-name maxima returned
+  by :func:`peaks`;
+* :func:`take_snapshot` stores snapshots of the live allocations and
+  :func:`diff` compares two of them, grouped by source line, to show what
+  grew between them.
+
+``tracemalloc`` has a single peak counter per process.  Open
+:class:`PeakWindow` objects share it: whenever a window opens or closes,
+the peak so far is credited to every open window and the counter is
+reset.  A window therefore sees its own peak exactly, but requests that
+overlap in time also see each other's allocations; at concurrency 1 the
+numbers are per request.
+
+Tracing slows allocation-heavy code noticeably and snapshots hold a copy
+of every trace, so this is a mode to investigate with, not to leave on.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import tracemalloc
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from app.config import MEMORY_PROFILING, MEMORY_SNAPSHOTS_KEPT, MEMORY_TRACE_FRAMES
+
+# Allocations made by the profiler itself and by the import system.
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class ProfilingDisabled(RuntimeError):
+    """Memory profiling is off (``MEMORY_PROFILING`` is not set)."""
+
+
+def start() -> bool:
+    """Start tracing if ``MEMORY_PROFILING`` is set; return whether on."""
+    if MEMORY_PROFILING and not tracemalloc.is_tracing():
+        tracemalloc.start(MEMORY_TRACE_FRAMES)
+    return tracemalloc.is_tracing()
+
+
+def tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+
+def _require_tracing() -> None:
+    if not tracemalloc.is_tracing():
+        raise ProfilingDisabled("Memory profiling is off; start the server with MEMORY_PROFILING=true")
+
+
+# ── Peak windows ─────────────────────────────────────────────────────────────
+
+
+class PeakWindow:
+    """Tracks the peak traced memory between :func:`open_window` and
+    :func:`close_window`."""
+
+    __slots__ = ("start", "peak")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.peak = start
+
+
+_windows: set[PeakWindow] = set()
+_window_lock = threading.Lock()
+
+
+def _fold_peak() -> int:
+    """Credit the peak so far to every open window, reset it and return
+    the current traced size.  Caller holds ``_window_lock``."""
+    current, peak = tracemalloc.get_traced_memory()
+    for window in _windows:
+        if peak > window.peak:
+            window.peak = peak
+    tracemalloc.reset_peak()
+    return current
+
+
+def open_window() -> PeakWindow:
+    with _window_lock:
+        window = PeakWindow(_fold_peak())
+        _windows.add(window)
+    return window
+
+
+def close_window(window: PeakWindow) -> int:
+    """Close *window*; return its peak in bytes above where it started."""
+    with _window_lock:
+        _fold_peak()
+        _windows.discard(window)
+    return max(0, window.peak - window.start)
+
+
+# Highest peak seen per request route and per stage, for the admin view.
+_peaks: dict[str, dict[str, int]] = {"requests": {}, "stages": {}}
+_peaks_lock = threading.Lock()
+
+
+def record_peak(kind: str, name: str, peak: int) -> None:
+    with _peaks_lock:
+        table = _peaks[kind]
+        if peak > table.get(name, -1):
+            table[name] = peak
+
+
+def peaks() -> dict[str, dict[str, int]]:
+    with _peaks_lock:
+        return {kind: dict(sorted(table.items())) for kind, table in _peaks.items()}
+
+
+# ── Snapshots ────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    id: int
+    taken_at: datetime
+    traced_bytes: int
+    snapshot: tracemalloc.Snapshot
+
+
+_snapshots: OrderedDict[int, Snapshot] = OrderedDict()
+_snapshot_lock = threading.Lock()
+_next_id = 1
+
+
+def _capture() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+
+def take_snapshot() -> Snapshot:
+    """Snapshot the live allocations and keep it for :func:`diff`.
+
+    Only the last ``MEMORY_SNAPSHOTS_KEPT`` snapshots are kept.
+    """
+    global _next_id
+    _require_tracing()
+    captured = _capture()
+    with _snapshot_lock:
+        snapshot = Snapshot(
+            id=_next_id,
+            taken_at=datetime.now(timezone.utc),
+            traced_bytes=tracemalloc.get_traced_memory()[0],
+            snapshot=captured,
+        )
+        _next_id += 1
+        _snapshots[snapshot.id] = snapshot
+        while len(_snapshots) > max(1, MEMORY_SNAPSHOTS_KEPT):
+            _snapshots.popitem(last=False)
+    return snapshot
+
+
+def snapshots() -> list[Snapshot]:
+    with _snapshot_lock:
+        return list(_snapshots.values())
+
+
+def _get(snapshot_id: int) -> Snapshot:
+    with _snapshot_lock:
+        try:
+            return _snapshots[snapshot_id]
+        except KeyError:
+            raise LookupError(f"No memory snapshot {snapshot_id}") from None
+
+
+def diff(
+    base_id: int,
+    target_id: Optional[int] = None,
+    limit: int = 20,
+    group_by: str = "lineno",
+) -> tuple[list[tracemalloc.StatisticDiff], int]:
+    """The *limit* largest changes from snapshot *base_id* to *target_id*
+    (or to the live allocations now), grouped by ``lineno``, ``filename``
+    or ``traceback``, and the net change in bytes over all groups."""
+    _require_tracing()
+    base = _get(base_id).snapshot
+    target = _get(target_id).snapshot if target_id is not None else _capture()
+    stats = target.compare_to(base, group_by)
+    return stats[:limit], sum(stat.size_diff for stat in stats)
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where ``/proc`` is available."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
@@ -0,0 +1,384 @@
+"""Stage timings and Prometheus metrics.
+
+Each stage of proposal generation runs inside :func:`stage`, which
+records its duration in a histogram and — when a request is being
+traced — in that request's :class:`StageTimings`.  The HTTP middleware in
+``app.main`` starts the trace, turns it into a ``Server-Timing`` header
+and logs a stage breakdown for slow requests.
+
+Metrics are held in-process and exposed in the Prometheus text format by
+:func:`render_latest`.  Each worker process has its own registry that
+nothing scrapes, so work in a pool only counts when it is sent back:
+the render pool runs every call under :func:`capture` and the server
+replays the result with :func:`absorb`.  Batch generation and
+process-mode jobs are not counted.
+
+When memory profiling is on (see :mod:`app.services.memory`), each stage
+also records its peak allocation, which travels back from the pool the
+same way.
+
+Work that is not traffic, such as start-up warm-up, runs under
+:func:`unrecorded` so it leaves no trace in the metrics.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from app.services import memory
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; stages range from microseconds (pricing) to seconds (large PDFs).
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Bytes, 64 KiB to 1 GiB.
+MEMORY_BUCKETS = tuple(float(2**n) for n in range(16, 31, 2))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if _unrecorded.get():
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        timings = _current.get()
+        if timings is not None and timings.counts is not None:
+            timings.counts.append((self.name, amount, labels))
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        lines.extend(
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in items
+        )
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        lines.extend(
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in items
+        )
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = REQUEST_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (non-cumulative) + overflow, sum]
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        if _unrecorded.get():
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s[0])) for k, (c, s) in self._series.items())
+        lines = self._header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = _format_labels(self.labels, key, f'le="{_format_value(float(bound))}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# ── Registry ─────────────────────────────────────────────────────────────────
+
+STAGE_SECONDS = Histogram(
+    "doxa_stage_duration_seconds",
+    "Time spent in each proposal generation stage.",
+    labels=("stage",),
+    buckets=STAGE_BUCKETS,
+)
+PDF_PAGES = Counter("doxa_pdf_pages_total", "PDF pages rendered.")
+PDF_DOCUMENTS = Counter("doxa_pdf_documents_total", "PDF documents rendered.")
+BYTES_WRITTEN = Counter(
+    "doxa_artifact_bytes_written_total",
+    "Bytes written to artifact storage.",
+    labels=("format",),
+)
+RESULT_CACHE = Counter(
+    "doxa_result_cache_lookups_total",
+    "Result cache lookups.",
+    labels=("result",),
+)
+HTTP_REQUESTS = Counter(
+    "doxa_http_requests_total",
+    "HTTP requests handled.",
+    labels=("method", "route", "status"),
+)
+HTTP_SECONDS = Histogram(
+    "doxa_http_request_duration_seconds",
+    "HTTP request latency.",
+    labels=("method", "route"),
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "doxa_admission_in_flight",
+    "Generation requests currently admitted, per work class.",
+    labels=("work",),
+)
+ADMISSION_QUEUED = Gauge(
+    "doxa_admission_queue_depth",
+    "Generation requests waiting for admission, per work class.",
+    labels=("work",),
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "doxa_admission_wait_seconds",
+    "Time admitted requests spent queued.",
+    labels=("work",),
+)
+ADMISSION_REJECTED = Counter(
+    "doxa_admission_rejected_total",
+    "Generation requests turned away (queue_full: 429, timeout: 503).",
+    labels=("work", "reason"),
+)
+STAGE_PEAK_MEMORY = Histogram(
+    "doxa_stage_peak_memory_bytes",
+    "Peak memory allocated by each generation stage (memory profiling only).",
+    labels=("stage",),
+    buckets=MEMORY_BUCKETS,
+)
+HTTP_PEAK_MEMORY = Histogram(
+    "doxa_http_request_peak_memory_bytes",
+    "Peak memory allocated while handling a request (memory profiling only).",
+    labels=("method", "route"),
+    buckets=MEMORY_BUCKETS,
+)
+
+REGISTRY: list[_Metric] = [
+    STAGE_SECONDS,
+    PDF_PAGES,
+    PDF_DOCUMENTS,
+    BYTES_WRITTEN,
+    RESULT_CACHE,
+    HTTP_REQUESTS,
+    HTTP_SECONDS,
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUED,
+    ADMISSION_WAIT_SECONDS,
+    ADMISSION_REJECTED,
+    STAGE_PEAK_MEMORY,
+    HTTP_PEAK_MEMORY,
+]
+
+
+_BY_NAME = {metric.name: metric for metric in REGISTRY}
+
+
+def render_latest() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+# ── Per-request stage timings ────────────────────────────────────────────────
+
+
+class StageTimings:
+    """Stage durations collected while handling one request.
+
+    With *record_counts*, counter increments are also recorded, so work
+    done in another process can be replayed by :func:`absorb`.
+    """
+
+    def __init__(self, record_counts: bool = False) -> None:
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        # Peak bytes per stage, recorded while memory profiling is on.
+        self.memory: dict[str, int] = {}
+        self.counts: Optional[list[tuple[str, float, dict[str, str]]]] = (
+            [] if record_counts else None
+        )
+
+    def add(self, name: str, seconds: float) -> None:
+        # Stages that run more than once (e.g. file_write) accumulate.
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_memory(self, name: str, peak: int) -> None:
+        # Repeated stages keep their largest peak.
+        self.memory[name] = max(peak, self.memory.get(name, 0))
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value, durations in milliseconds."""
+        parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items()]
+        parts.append(f"total;dur={self.elapsed * 1000:.2f}")
+        return ", ".join(parts)
+
+    def breakdown(self) -> str:
+        return " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.stages.items())
+
+
+# The collector object is shared (not copied) with the route's worker
+# thread, so stages recorded there are visible to the middleware.
+_current: ContextVar[Optional[StageTimings]] = ContextVar("doxa_stage_timings", default=None)
+_unrecorded: ContextVar[bool] = ContextVar("doxa_unrecorded", default=False)
+
+
+@contextmanager
+def unrecorded() -> Iterator[None]:
+    """Run the block without recording counters, histograms or stage peaks."""
+    token = _unrecorded.set(True)
+    try:
+        yield
+    finally:
+        _unrecorded.reset(token)
+
+
+@contextmanager
+def trace_request(record_counts: bool = False) -> Iterator[StageTimings]:
+    timings = StageTimings(record_counts)
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+Captured = tuple[
+    dict[str, float], list[tuple[str, float, dict[str, str]]], dict[str, int]
+]
+
+
+def capture(func, *args):
+    """Call ``func(*args)`` in a pool worker; return ``(result, captured)``.
+
+    *captured* holds the stage timings and counter increments of the call,
+    to be passed to :func:`absorb` in the server process.
+    """
+    with trace_request(record_counts=True) as timings:
+        result = func(*args)
+    return result, (timings.stages, timings.counts, timings.memory)
+
+
+def absorb(captured: Captured) -> None:
+    """Record metrics captured in a worker process, and add its stages to
+    the current request's timings."""
+    stages, counts, peaks = captured
+    timings = _current.get()
+    for name, seconds in stages.items():
+        STAGE_SECONDS.observe(seconds, stage=name)
+        if timings is not None:
+            timings.add(name, seconds)
+    for name, amount, labels in counts:
+        _BY_NAME[name].inc(amount, **labels)
+    for name, peak in peaks.items():
+        _record_stage_peak(name, peak, timings)
+
+
+def _record_stage_peak(name: str, peak: int, timings: Optional[StageTimings]) -> None:
+    if _unrecorded.get():
+        return
+    STAGE_PEAK_MEMORY.observe(peak, stage=name)
+    memory.record_peak("stages", name, peak)
+    if timings is not None:
+        timings.add_memory(name, peak)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as generation stage *name*."""
+    window = memory.open_window() if memory.tracing() else None
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        STAGE_SECONDS.observe(seconds, stage=name)
+        timings = _current.get()
+        if timings is not None:
+            timings.add(name, seconds)
+        if window is not None:
+            _record_stage_peak(name, memory.close_window(window), timings)
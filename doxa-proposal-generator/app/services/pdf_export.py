@@ -1,18 +1,49 @@
 """PDF export service.
 
-Uses ``fpdf2`` to convert rendered Markdown text into a clean PDF.
-Markdown formatting is intentionally simplified for PDF — tables and
+Uses ``fpdf2`` to render a structured proposal :class:`Document` into a
+clean PDF.  Formatting is intentionally simplified for PDF — tables and
 code blocks are rendered as plain text with monospace font.
+
+Two output profiles (``PDF_PROFILE``) draw the same pages:
+
+* ``standard`` — the original output;
+* ``compact`` — fewer bytes and less work per page: compression is always
+  on, the branding at the top and bottom of a page is drawn in one pass
+  with one font, and text styles are applied lazily, so a style that is
+  set and then reset before any text is drawn never reaches the file.
+  The fill colour follows the text colour, which lets fpdf2 drop the
+  save / colour / restore wrapper it otherwise puts around every cell.
+
+``fpdf2`` takes a noticeable share of start-up time, so it is imported on
+first use rather than with this module; processes that never render a
+PDF never load it.
 """
 
 from __future__ import annotations
 
-import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
 from pathlib import Path
-
-from fpdf import FPDF
-
-from app.config import AGENCY_NAME
+from typing import TYPE_CHECKING
+
+from app.config import AGENCY_NAME, PDF_PROFILE
+from app.services.metrics import PDF_DOCUMENTS, PDF_PAGES, stage
+from app.services.document import (
+    Block,
+    CodeBlock,
+    Document,
+    Heading,
+    ListBlock,
+    Paragraph,
+    Quote,
+    Rule,
+    Table,
+)
+
+if TYPE_CHECKING:
+    from fpdf import FPDF
 
 # ── Unicode → ASCII mapping for built-in PDF fonts ──────────────────────────
 _UNICODE_MAP = {
@@ -39,14 +70,46 @@ _UNICODE_MAP = {
 }
 
 
-def _safe(text: str) -> str:
-    """Replace Unicode characters that Helvetica/Courier cannot render."""
-    for uchar, replacement in _UNICODE_MAP.items():
+_REPLACEMENTS = tuple(_UNICODE_MAP.items())
+
+# Strings up to this length are memoised; long customer-supplied text is
+# rarely repeated verbatim and would only crowd the memo.
+_SAFE_MEMO_MAX_LEN = 512
+
+
+def _sanitize(text: str) -> str:
+    try:
+        text.encode("latin-1")
+    except UnicodeEncodeError:
+        pass
+    else:
+        # Every mapped character lies outside latin-1, so nothing to do.
+        return text
+    # Chained str.replace runs in C and measured faster on CPython than a
+    # single str.translate pass, whose per-character lookups are slow for
+    # non-ASCII text (see benchmarks/bench_safe.py).
+    for uchar, replacement in _REPLACEMENTS:
         text = text.replace(uchar, replacement)
-    # Final fallback: strip anything still outside latin-1
+    # Final fallback: replace anything still outside latin-1
     return text.encode("latin-1", errors="replace").decode("latin-1")
 
 
+_sanitize_memo = lru_cache(maxsize=4096)(_sanitize)
+
+
+def _safe(text: str) -> str:
+    """Replace Unicode characters that Helvetica/Courier cannot render.
+
+    Pure-ASCII and latin-1 strings are returned as-is; short strings are
+    memoised, since headers, table cells and template lines repeat.
+    """
+    if text.isascii():
+        return text
+    if len(text) <= _SAFE_MEMO_MAX_LEN:
+        return _sanitize_memo(text)
+    return _sanitize(text)
+
+
 # ── Layout constants ─────────────────────────────────────────────────────────
 PAGE_W = 210  # A4 width in mm
 MARGIN = 15
@@ -54,125 +117,358 @@ CONTENT_W = PAGE_W - 2 * MARGIN
 FONT_BODY = "Helvetica"
 FONT_MONO = "Courier"
 
+PDF_PROFILES = ("standard", "compact")
+_BRANDING_COLOR = (120, 120, 120)
+
+
+@lru_cache(maxsize=None)
+def _pdf_class(profile: str = "standard") -> type[FPDF]:
+    """The branded FPDF subclass for *profile*, defined on first use
+    (imports fpdf2)."""
+    from fpdf import FPDF
+
+    class _ProposalPDF(FPDF):
+        """Thin wrapper that adds header / footer branding."""
+
+        compact = False
+
+        def header(self) -> None:
+            self.set_font(FONT_BODY, "B", 10)
+            self.set_text_color(100, 100, 100)
+            self.cell(0, 8, _safe(f"{AGENCY_NAME} -- Confidential"), align="R", new_x="LMARGIN", new_y="NEXT")
+            self.ln(2)
+
+        def footer(self) -> None:
+            self.set_y(-15)
+            self.set_font(FONT_BODY, "I", 8)
+            self.set_text_color(140, 140, 140)
+            self.cell(0, 10, f"Page {self.page_no()}/{{nb}}", align="C")
+
+    class _CompactPDF(_ProposalPDF):
+        """Compact profile: single-pass branding and lazily applied styles."""
+
+        compact = True
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.set_compression(True)
+            # Style requested by _apply and the one last written to the page.
+            self.pending_style: Style | None = None
+            self.applied_style: Style | None = None
+
+        def header(self) -> None:
+            # Header and footer text in one font switch; fpdf2 restores the
+            # body font and colours afterwards.  Both lines go at fixed
+            # positions, as page 1's header runs before the margins are set.
+            # ``cell`` (not ``text``) fills in the ``{nb}`` page count; page
+            # breaks are off meanwhile, the footer line being past the
+            # trigger, and the pending body style is left for the body.
+            self.set_font(FONT_BODY, "", 8)
+            self.set_text_color(*_BRANDING_COLOR)
+            self.set_fill_color(*_BRANDING_COLOR)
+            auto, margin = self.auto_page_break, self.b_margin
+            self.set_auto_page_break(False)
+            self.set_xy(MARGIN, MARGIN)
+            super().cell(CONTENT_W, 5, _safe(f"{AGENCY_NAME} -- Confidential"), align="R")
+            self.set_xy(MARGIN, self.h - 15)
+            super().cell(CONTENT_W, 10, f"Page {self.page_no()}/{{nb}}", align="C")
+            self.set_auto_page_break(auto, margin)
+            # The body starts where the standard header leaves it.
+            self.set_y(self.t_margin + 10)
+
+        def footer(self) -> None:
+            pass  # drawn by header()
+
+        def apply_pending_style(self) -> None:
+            style, self.pending_style = self.pending_style, None
+            if style == self.applied_style:
+                return
+            family, font_style, size, color = style
+            self.set_font(family, font_style, size)
+            if self.applied_style is None or self.applied_style[3] != color:
+                self.set_text_color(*color)
+                self.set_fill_color(*color)
+            self.applied_style = style
+
+        def cell(self, *args, **kwargs):
+            if self.pending_style is not None:
+                self.apply_pending_style()
+            return super().cell(*args, **kwargs)
+
+        def multi_cell(self, *args, **kwargs):
+            if self.pending_style is not None:
+                self.apply_pending_style()
+            return super().multi_cell(*args, **kwargs)
+
+    return _CompactPDF if profile == "compact" else _ProposalPDF
+
+
+# ── Document-to-PDF renderer ────────────────────────────────────────────────
+# Each block sets its style once and restores the body style once,
+# rather than once per line.  Text cells always return to the left margin
+# so consecutive lines stack vertically.
+
+_HEADING_SIZES = {1: 18, 2: 14, 3: 12}
+_NEXT_LINE = dict(new_x="LMARGIN", new_y="NEXT")
+
+# (family, style, size, (r, g, b)) for each kind of text.
+Style = tuple[str, str, int, tuple[int, int, int]]
+_BODY: Style = (FONT_BODY, "", 11, (0, 0, 0))
+_TABLE: Style = (FONT_BODY, "", 10, (0, 0, 0))
+_QUOTE: Style = (FONT_BODY, "I", 10, (80, 80, 80))
+_CODE: Style = (FONT_MONO, "", 9, (60, 60, 60))
+
+# Placement operations: ("style", Style) | ("ln", h) | ("x", x)
+#                       | ("cell", w, h, text, border, next_line)
+_Op = tuple
+# Recorded placement of laid-out blocks, by block value.
+Layouts = dict[Block, tuple[_Op, ...]]
+
+
+def _heading_style(level: int) -> Style:
+    return (FONT_BODY, "B", _HEADING_SIZES.get(level, 12), (30, 30, 30))
+
+
+def _plain(text: str) -> str:
+    """Drop Markdown bold markers, which PDF output does not style."""
+    return _safe(text.replace("**", ""))
+
+
+def _apply(pdf: FPDF, style: Style) -> None:
+    if getattr(pdf, "compact", False):
+        # Written to the page just before the next text is drawn.
+        pdf.pending_style = style
+        return
+    family, font_style, size, color = style
+    pdf.set_font(family, font_style, size)
+    pdf.set_text_color(*color)
+
+
+def _body_style(pdf: FPDF) -> None:
+    _apply(pdf, _BODY)
+
+
+# The renderers draw their block and, given *ops*, record the placement
+# operations that redraw it (see below) as they go.
+
+def _style(pdf: FPDF, style: Style, ops: list[_Op] | None) -> None:
+    _apply(pdf, style)
+    if ops is not None:
+        ops.append(("style", style))
+
+
+def _ln(pdf: FPDF, h: float | None, ops: list[_Op] | None) -> None:
+    pdf.ln(h)
+    if ops is not None:
+        ops.append(("ln", h))
+
+
+def _cell(
+    pdf: FPDF, ops: list[_Op] | None, w: float, h: float, text: str,
+    border: int = 0, next_line: bool = False,
+) -> None:
+    if next_line:
+        pdf.cell(w, h, text, border=border, **_NEXT_LINE)
+    else:
+        pdf.cell(w, h, text, border=border)
+    if ops is not None:
+        ops.append(("cell", w, h, text, border, next_line))
 
-class _ProposalPDF(FPDF):
-    """Thin wrapper that adds header / footer branding."""
-
-    def header(self) -> None:
-        self.set_font(FONT_BODY, "B", 10)
-        self.set_text_color(100, 100, 100)
-        self.cell(0, 8, _safe(f"{AGENCY_NAME} -- Confidential"), align="R", new_x="LMARGIN", new_y="NEXT")
-        self.ln(2)
-
-    def footer(self) -> None:
-        self.set_y(-15)
-        self.set_font(FONT_BODY, "I", 8)
-        self.set_text_color(140, 140, 140)
-        self.cell(0, 10, f"Page {self.page_no()}/{{nb}}", align="C")
-
-
-# ── Markdown‑to‑PDF renderer ────────────────────────────────────────────────
-
-_HEADING_RE = re.compile(r"^(#{1,3})\s+(.+)$")
-_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
-_RULE_RE = re.compile(r"^-{3,}$")
-_BULLET_RE = re.compile(r"^[-*]\s+(.+)$")
-_TABLE_ROW_RE = re.compile(r"^\|(.+)\|$")
-_TABLE_SEP_RE = re.compile(r"^\|[\s\-:|]+\|$")
-_QUOTE_RE = re.compile(r"^>\s?(.*)$")
-_CODE_FENCE_RE = re.compile(r"^```")
-
-
-def render_pdf(markdown: str, dest: Path) -> None:
-    """Write *markdown* content to a PDF at *dest*."""
-
-    pdf = _ProposalPDF()
-    pdf.alias_nb_pages()
-    pdf.set_auto_page_break(auto=True, margin=20)
-    pdf.add_page()
-    pdf.set_margins(MARGIN, MARGIN, MARGIN)
-    pdf.set_font(FONT_BODY, size=11)
-
-    in_code_block = False
-
-    for raw_line in markdown.split("\n"):
-        line = raw_line.rstrip()
-
-        # Code fences
-        if _CODE_FENCE_RE.match(line):
-            in_code_block = not in_code_block
-            continue
-
-        if in_code_block:
-            pdf.set_font(FONT_MONO, size=9)
-            pdf.set_text_color(60, 60, 60)
-            pdf.cell(0, 5, _safe(line), new_x="LMARGIN", new_y="NEXT")
-            pdf.set_font(FONT_BODY, size=11)
-            pdf.set_text_color(0, 0, 0)
-            continue
-
-        # Horizontal rule
-        if _RULE_RE.match(line):
-            y = pdf.get_y()
-            pdf.set_draw_color(200, 200, 200)
-            pdf.line(MARGIN, y, PAGE_W - MARGIN, y)
-            pdf.ln(4)
-            continue
-
-        # Headings
-        m = _HEADING_RE.match(line)
-        if m:
-            level = len(m.group(1))
-            sizes = {1: 18, 2: 14, 3: 12}
-            pdf.ln(3)
-            pdf.set_font(FONT_BODY, "B", sizes.get(level, 12))
-            pdf.set_text_color(30, 30, 30)
-            pdf.multi_cell(CONTENT_W, 7, _safe(m.group(2)))
-            pdf.set_font(FONT_BODY, size=11)
-            pdf.set_text_color(0, 0, 0)
-            pdf.ln(2)
-            continue
-
-        # Block quotes
-        qm = _QUOTE_RE.match(line)
-        if qm:
-            pdf.set_text_color(80, 80, 80)
-            pdf.set_font(FONT_BODY, "I", 10)
-            pdf.multi_cell(CONTENT_W - 10, 5, _safe(qm.group(1)))
-            pdf.set_font(FONT_BODY, size=11)
-            pdf.set_text_color(0, 0, 0)
-            continue
-
-        # Table separator — skip
-        if _TABLE_SEP_RE.match(line):
-            continue
-
-        # Table rows
-        tm = _TABLE_ROW_RE.match(line)
-        if tm:
-            cells = [c.strip() for c in tm.group(1).split("|")]
-            col_w = CONTENT_W / max(len(cells), 1)
-            pdf.set_font(FONT_BODY, size=10)
-            for cell_text in cells:
-                clean = _BOLD_RE.sub(r"\1", cell_text)
-                pdf.cell(col_w, 6, _safe(clean), border=1)
-            pdf.ln()
-            pdf.set_font(FONT_BODY, size=11)
-            continue
-
-        # Bullet points
-        bm = _BULLET_RE.match(line)
-        if bm:
-            clean = _BOLD_RE.sub(r"\1", bm.group(1))
-            pdf.cell(6, 6, "-")
-            pdf.multi_cell(CONTENT_W - 6, 6, _safe(clean))
-            continue
-
-        # Regular paragraph text
-        if line.strip():
-            clean = _BOLD_RE.sub(r"\1", line)
-            pdf.multi_cell(CONTENT_W, 6, _safe(clean))
+
+def _lines(pdf: FPDF, ops: list[_Op] | None, w: float, h: float, text: str, indent: float = 0) -> None:
+    """``multi_cell`` *text*; recorded as one cell per wrapped line."""
+    if ops is None:
+        pdf.multi_cell(w, h, text, align="L", **_NEXT_LINE)
+        return
+    for k, line in enumerate(pdf.multi_cell(w, h, text, align="L", output="LINES", **_NEXT_LINE)):
+        if k and indent:
+            ops.append(("x", MARGIN + indent))
+        ops.append(("cell", w, h, line, 0, True))
+
+
+def _render_heading(pdf: FPDF, block: Heading, ops: list[_Op] | None = None) -> None:
+    _ln(pdf, 3, ops)
+    _style(pdf, _heading_style(block.level), ops)
+    _lines(pdf, ops, CONTENT_W, 7, _safe(block.text))
+    _style(pdf, _BODY, ops)
+    _ln(pdf, 2, ops)
+
+
+def _render_paragraph(pdf: FPDF, block: Paragraph, ops: list[_Op] | None = None) -> None:
+    for line in block.text.split("\n"):
+        line = line.rstrip()
+        if line:
+            _lines(pdf, ops, CONTENT_W, 6, _plain(line))
         else:
+            _ln(pdf, 3, ops)
+
+
+def _render_list(pdf: FPDF, block: ListBlock, ops: list[_Op] | None = None) -> None:
+    for n, item in enumerate(block.items, 1):
+        _cell(pdf, ops, 6, 6, f"{n}." if block.ordered else "-")
+        _lines(pdf, ops, CONTENT_W - 6, 6, _plain(item), indent=6)
+
+
+def _render_table(pdf: FPDF, block: Table, ops: list[_Op] | None = None) -> None:
+    col_w = CONTENT_W / max(len(block.header), 1)
+    _style(pdf, _TABLE, ops)
+    for row in (block.header, *block.rows):
+        for cell_text in row:
+            _cell(pdf, ops, col_w, 6, _plain(cell_text), border=1)
+        _ln(pdf, None, ops)
+    _style(pdf, _BODY, ops)
+
+
+def _render_code(pdf: FPDF, block: CodeBlock, ops: list[_Op] | None = None) -> None:
+    _style(pdf, _CODE, ops)
+    for line in block.lines:
+        _cell(pdf, ops, 0, 5, _safe(line.rstrip()), next_line=True)
+    _style(pdf, _BODY, ops)
+
+
+def _render_quote(pdf: FPDF, block: Quote, ops: list[_Op] | None = None) -> None:
+    _style(pdf, _QUOTE, ops)
+    for line in block.lines:
+        _lines(pdf, ops, CONTENT_W - 10, 5, _safe(line))
+    _style(pdf, _BODY, ops)
+
+
+def _render_rule(pdf: FPDF, block: Rule, ops: list[_Op] | None = None) -> None:
+    # Never recorded: a rule is placed by drawing it.
+    y = pdf.get_y()
+    pdf.set_draw_color(200, 200, 200)
+    pdf.line(MARGIN, y, PAGE_W - MARGIN, y)
+    pdf.ln(4)
+
+
+_RENDERERS = {
+    Heading: _render_heading,
+    Paragraph: _render_paragraph,
+    ListBlock: _render_list,
+    Table: _render_table,
+    CodeBlock: _render_code,
+    Quote: _render_quote,
+    Rule: _render_rule,
+}
+
+
+# ── Pre-rendered fragments for static blocks ─────────────────────────────────
+# Blocks that never change between proposals (the architecture diagram, the
+# timeline table, fixed bullet lists, section headings) are sanitised and
+# line-wrapped once.  Placing a fragment is then a plain sequence of
+# ``cell`` calls — no ``_safe``, no line breaking.
+
+_MAX_FRAGMENTS = 512
+
+_fragments: OrderedDict[Block, tuple[_Op, ...]] = OrderedDict()
+_fragment_lock = threading.Lock()
+
+
+def _place(pdf: FPDF, ops: tuple[_Op, ...]) -> None:
+    for op in ops:
+        kind = op[0]
+        if kind == "cell":
+            _, w, h, text, border, next_line = op
+            if next_line:
+                pdf.cell(w, h, text, border=border, **_NEXT_LINE)
+            else:
+                pdf.cell(w, h, text, border=border)
+        elif kind == "style":
+            _apply(pdf, op[1])
+        elif kind == "ln":
+            pdf.ln(op[1])
+        elif kind == "x":
+            pdf.set_x(op[1])
+
+
+def prerender_static(blocks: Iterable[Block]) -> int:
+    """Lay out *blocks* once so later renders can place them directly.
+
+    Called at startup and whenever templates change.  Fragments are keyed
+    by block value, so an edited template simply produces new entries;
+    the oldest are dropped once ``_MAX_FRAGMENTS`` is exceeded.  Returns
+    the number of fragments built.
+    """
+    from fpdf import FPDF
+
+    with _fragment_lock:
+        missing = [b for b in dict.fromkeys(blocks) if not isinstance(b, Rule) and b not in _fragments]
+    # Recorded while drawn on a scratch document; line breaks depend only
+    # on width and font, not on where the block lands.
+    scratch = FPDF()
+    scratch.add_page()
+    scratch.set_margins(MARGIN, MARGIN, MARGIN)
+    _body_style(scratch)
+    built: Layouts = {}
+    for block in missing:
+        ops: list[_Op] = []
+        _RENDERERS[type(block)](scratch, block, ops)
+        built[block] = tuple(ops)
+    with _fragment_lock:
+        _fragments.update(built)
+        while len(_fragments) > _MAX_FRAGMENTS:
+            _fragments.popitem(last=False)
+    return len(built)
+
+
+def has_fragments() -> bool:
+    """Whether :func:`prerender_static` has run in this process."""
+    return bool(_fragments)
+
+
+def render_block(pdf: FPDF, block: Block, layouts: Layouts | None = None) -> None:
+    """Render *block*.  With *layouts*, place it from its recorded layout
+    if there is one, or else record the layout there while drawing it."""
+    ops = _fragments.get(block)
+    if ops is None and layouts is not None and not isinstance(block, Rule):
+        ops = layouts.get(block)
+        if ops is None:
+            recorded: list[_Op] = []
+            _RENDERERS[type(block)](pdf, block, recorded)
+            layouts[block] = tuple(recorded)
+            return
+    if ops is not None:
+        _place(pdf, ops)
+    else:
+        _RENDERERS[type(block)](pdf, block)
+
+
+def render_pdf(
+    doc: Document,
+    dest: Path | None = None,
+    profile: str = PDF_PROFILE,
+    layouts: Layouts | None = None,
+) -> bytes:
+    """Render *doc* to PDF and return the document bytes.
+
+    Blocks registered through :func:`prerender_static` are placed from
+    their cached fragments; everything else is laid out here.  With
+    *layouts* — those of a previous version of the same proposal — blocks
+    found there are placed without line breaking, and the layouts of the
+    others are added, so the caller can keep them for the next version.
+    *profile* is one of :data:`PDF_PROFILES`.  When *dest* is given the
+    bytes are also written there.
+    """
+    if profile not in PDF_PROFILES:
+        raise ValueError(f"Unknown PDF profile {profile!r} (expected one of {', '.join(PDF_PROFILES)})")
+
+    with stage("pdf_layout"):
+        pdf = _pdf_class(profile)()
+        pdf.alias_nb_pages()
+        pdf.set_auto_page_break(auto=True, margin=20)
+        pdf.add_page()
+        pdf.set_margins(MARGIN, MARGIN, MARGIN)
+        _body_style(pdf)
+
+        for block in doc.blocks:
+            render_block(pdf, block, layouts)
+            # Blank line between blocks, as in the Markdown rendering.
             pdf.ln(3)
 
-    pdf.output(str(dest))
+    with stage("pdf_write"):
+        data = bytes(pdf.output())
+    PDF_DOCUMENTS.inc()
+    PDF_PAGES.inc(pdf.pages_count)
+    if dest is not None:
+        dest.write_bytes(data)
+    return data
@@ -0,0 +1,129 @@
+"""Process pools for CPU-bound proposal rendering.
+
+fpdf2 layout is pure Python and holds the GIL, so threads cannot render
+two PDFs at once.  Two pools sized to the host's cores let rendering use
+every CPU:
+
+* the *batch* pool (``BATCH_MAX_WORKERS``) for batch generation and
+  process-mode background jobs;
+* the *render* pool (``RENDER_WORKERS``) for the interactive generation
+  routes, so a large batch cannot starve single requests.
+
+Pools are created lazily on first use and torn down when the application
+shuts down.
+
+Workers are forked from the server process, so no pool is created until
+start-up warm-up has finished: children then inherit the warm fonts and
+PDF fragments, and no warm-up lock can be held mid-fork.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from app.config import BATCH_MAX_WORKERS, RENDER_WORKERS
+from app.services.metrics import absorb, capture
+from app.services.warmup import warm_up
+
+T = TypeVar("T")
+
+
+class _LazyPool:
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            warm_up.wait()
+        return self.start()
+
+    def start(self) -> ProcessPoolExecutor:
+        if self._pool is not None:
+            return self._pool
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    def reset(self, broken: ProcessPoolExecutor) -> None:
+        """Drop *broken* so the next :meth:`get` starts a fresh pool.
+
+        A crashed worker poisons the whole pool: every pending and later
+        submission fails with ``BrokenProcessPool``.  Only *broken* is
+        dropped, so callers that saw the same crash cannot tear down a
+        replacement another caller has already started.
+        """
+        with self._lock:
+            if self._pool is broken:
+                self._pool = None
+        broken.shutdown(wait=True, cancel_futures=True)
+
+
+_batch_pool = _LazyPool(BATCH_MAX_WORKERS)
+_render_pool = _LazyPool(RENDER_WORKERS)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared batch pool, creating it on first call."""
+    return _batch_pool.get()
+
+
+def shutdown_process_pool() -> None:
+    """Stop the batch pool (if running) and wait for workers to exit."""
+    _batch_pool.shutdown()
+
+
+def reset_process_pool(broken: ProcessPoolExecutor) -> None:
+    """Discard the batch pool after ``BrokenProcessPool`` (see
+    :meth:`_LazyPool.reset`)."""
+    _batch_pool.reset(broken)
+
+
+async def run_in_render_pool(func: Callable[..., T], *args: Any) -> T:
+    """Await ``func(*args)`` in the render pool without blocking the loop.
+
+    *func* must be a picklable module-level function.  Stage timings and
+    counters recorded in the worker are added to this process's metrics
+    and to the current request's ``Server-Timing``.
+    """
+    if not warm_up.ready:
+        await asyncio.to_thread(warm_up.wait)
+    loop = asyncio.get_running_loop()
+    pool = _render_pool.get()
+    try:
+        result, captured = await loop.run_in_executor(pool, capture, func, *args)
+    except BrokenProcessPool:
+        await asyncio.to_thread(_render_pool.reset, pool)
+        raise
+    absorb(captured)
+    return result
+
+
+def prestart_render_pool() -> None:
+    """Fork the render workers now, from the end of warm-up, so the first
+    request does not pay for it."""
+    # With the fork start method all workers are created on first submit.
+    _render_pool.start().submit(int).result()
+
+
+def prestart_process_pool() -> None:
+    """Fork the batch workers now, from the end of warm-up, rather than
+    from a job thread while requests are in flight."""
+    _batch_pool.start().submit(int).result()
+
+
+def shutdown_render_pool() -> None:
+    """Stop the render pool (if running) and wait for workers to exit."""
+    _render_pool.shutdown()
@@ -31,16 +31,27 @@ _INDUSTRY_MULTIPLIER: dict[str, float] = {
 
 DEFAULT_MULTIPLIER = 1.1
 
+# Volume tiers: (inclusive upper bound on monthly customers, scale factor).
+# Above the last bound the factor is ``TOP_VOLUME_FACTOR``.
+VOLUME_TIERS: tuple[tuple[int, float], ...] = ((100, 0.0), (500, 0.3), (2000, 0.6))
+TOP_VOLUME_FACTOR = 1.0
+
+# Usage-based pricing applies above this many customers per month.
+USAGE_THRESHOLD = 1000
+USAGE_RATE = 0.05
+
 
 def _volume_factor(monthly_customers: int) -> float:
     """Return a 0-1 scale factor based on customer volume."""
-    if monthly_customers <= 100:
-        return 0.0
-    if monthly_customers <= 500:
-        return 0.3
-    if monthly_customers <= 2000:
-        return 0.6
-    return 1.0
+    for upper, factor in VOLUME_TIERS:
+        if monthly_customers <= upper:
+            return factor
+    return TOP_VOLUME_FACTOR
+
+
+def usage_based_note(multiplier: float) -> str:
+    per_unit = round(USAGE_RATE * multiplier, 3)
+    return f"${per_unit} per additional customer interaction above 1 000/month"
 
 
 def calculate_pricing(
@@ -60,11 +71,8 @@ def calculate_pricing(
 
     # Usage-based pricing kicks in above 1 000 customers / month.
     usage_based = None
-    if monthly_customers > 1000:
-        per_unit = round(0.05 * multiplier, 3)
-        usage_based = (
-            f"${per_unit} per additional customer interaction above 1 000/month"
-        )
+    if monthly_customers > USAGE_THRESHOLD:
+        usage_based = usage_based_note(multiplier)
 
     return PricingRecommendation(
         setup_fee=setup_fee,
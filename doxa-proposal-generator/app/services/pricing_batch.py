@@ -0,0 +1,115 @@
+"""Vectorised pricing for whole portfolios.
+
+Prices arrays of leads in one pass with NumPy and matches
+:func:`app.services.pricing.calculate_pricing` exactly: the same float64
+arithmetic, truncated the same way, and the usage-based note is built
+with Python's ``round`` once per distinct multiplier.
+"""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from app.models.pricing import PricingParameters
+from app.services.pricing import (
+    _INDUSTRY_MULTIPLIER,
+    DEFAULT_MULTIPLIER,
+    TOP_VOLUME_FACTOR,
+    USAGE_THRESHOLD,
+    VOLUME_TIERS,
+    usage_based_note,
+)
+
+_TIER_BOUNDS = np.array([upper for upper, _ in VOLUME_TIERS], dtype=np.int64)
+_TIER_FACTORS = np.array([f for _, f in VOLUME_TIERS] + [TOP_VOLUME_FACTOR])
+
+
+@dataclass
+class PricingColumns:
+    """Columnar pricing results, one entry per lead."""
+
+    setup_fee: np.ndarray
+    monthly_subscription: np.ndarray
+    usage_based_pricing: list[Optional[str]]
+    multiplier: np.ndarray
+    volume_factor: np.ndarray
+    currency: str
+
+
+def volume_factors(monthly_customers: np.ndarray) -> np.ndarray:
+    # side="left": a volume equal to a tier bound belongs to that tier.
+    return _TIER_FACTORS[np.searchsorted(_TIER_BOUNDS, monthly_customers, side="left")]
+
+
+def calculate_pricing_batch(
+    industries: Sequence[str],
+    monthly_customers: Sequence[int] | np.ndarray,
+    params: Optional[PricingParameters] = None,
+) -> PricingColumns:
+    """Price every ``(industries[i], monthly_customers[i])`` pair."""
+
+    params = params or PricingParameters()
+    volumes = np.asarray(monthly_customers, dtype=np.int64)
+    if len(industries) != len(volumes):
+        raise ValueError("industries and monthly_customers must have the same length")
+
+    table = {**_INDUSTRY_MULTIPLIER, **{k.lower(): v for k, v in params.industry_multipliers.items()}}
+    default = DEFAULT_MULTIPLIER if params.default_multiplier is None else params.default_multiplier
+
+    # Look each distinct industry up once, then broadcast.
+    unique, inverse = np.unique(np.asarray(industries, dtype=object), return_inverse=True)
+    unique_mult = np.array([table.get(name.lower(), default) for name in unique], dtype=np.float64)
+    multiplier = unique_mult[inverse] if len(unique) else np.empty(0)
+
+    vf = volume_factors(volumes)
+    setup_range = params.setup_fee_max - params.setup_fee_min
+    monthly_range = params.monthly_max - params.monthly_min
+    setup_fee = np.trunc((params.setup_fee_min + setup_range * vf) * multiplier).astype(np.int64)
+    monthly = np.trunc((params.monthly_min + monthly_range * vf) * multiplier).astype(np.int64)
+
+    notes = [usage_based_note(float(m)) for m in unique_mult]
+    usage: list[Optional[str]] = [None] * len(volumes)
+    for i in np.flatnonzero(volumes > USAGE_THRESHOLD):
+        usage[i] = notes[inverse[i]]
+
+    return PricingColumns(
+        setup_fee=setup_fee,
+        monthly_subscription=monthly,
+        usage_based_pricing=usage,
+        multiplier=multiplier,
+        volume_factor=vf,
+        currency=params.currency,
+    )
+
+
+def sensitivity_grid(
+    industries: Sequence[str],
+    monthly_customers: Sequence[int] | np.ndarray,
+    base: Optional[PricingParameters] = None,
+    **axes: Iterable[Any],
+) -> list[dict[str, Any]]:
+    """Re-price the portfolio for every combination of parameter values.
+
+    Each keyword names a :class:`PricingParameters` field and gives the
+    values to try, e.g. ``setup_fee_min=[1500, 2000, 2500]``.  Returns one
+    row per scenario with the overrides and portfolio totals.
+    """
+    base = base or PricingParameters()
+    names = list(axes)
+    rows = []
+    for values in itertools.product(*(list(axes[n]) for n in names)):
+        overrides = dict(zip(names, values))
+        cols = calculate_pricing_batch(
+            industries, monthly_customers, base.model_copy(update=overrides)
+        )
+        rows.append({
+            **overrides,
+            "total_setup_fee": int(cols.setup_fee.sum()),
+            "total_monthly_subscription": int(cols.monthly_subscription.sum()),
+        })
+    return rows
@@ -0,0 +1,49 @@
+"""Small helpers for the local SQLite databases under ``STATE_DIR``."""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+def initialise(path: Path) -> sqlite3.Connection:
+    """Create *path* if needed, switch it to WAL mode and open it.
+
+    Called once per database, before the schema is applied.  WAL lets
+    readers proceed while a writer holds the lock; it is stored in the
+    database file, so later connections need not set it again.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open an initialised database for use by one thread.
+
+    The busy timeout makes concurrent writers (threads or uvicorn workers)
+    wait instead of failing immediately.
+    """
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+@contextmanager
+def transaction(path: Path, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+    """Run a block in a single transaction on a fresh connection."""
+    conn = connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
@@ -0,0 +1,469 @@
+"""Artifact storage backends and retention.
+
+Generated artifacts are written through a :class:`StorageBackend` rather
+than straight into one flat directory:
+
+* keys are sharded into date and/or hash subdirectories, so no single
+  directory grows without bound;
+* :func:`sweep` applies a :class:`RetentionPolicy` (max age, max total
+  bytes evicted least-recently-accessed first), and
+  :class:`RetentionSweeper` runs it in the background;
+* the backend is pluggable — :class:`LocalStorage` keeps the current
+  on-disk layout under ``OUTPUT_DIR`` and :class:`LocalObjectStore` is an
+  object-store stand-in whose locations are opaque URIs, for replicas
+  that share one artifact volume;
+* writes are atomic (:func:`write_atomic`): an artifact appears under its
+  name complete or not at all, even with several workers sharing the
+  directory.  Temp files left by a crash are removed by
+  :class:`OrphanCleanup`, at start-up and periodically.
+
+A *location* is the string recorded in ``ProposalFiles``; only the backend
+that produced it knows how to resolve it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator, Optional
+
+from app.config import (
+    CACHE_DIR,
+    OBJECT_STORE_DIR,
+    ORPHAN_CLEANUP_INTERVAL,
+    OUTPUT_DIR,
+    RETENTION_MAX_AGE_DAYS,
+    RETENTION_MAX_BYTES,
+    RETENTION_SWEEP_INTERVAL,
+    STORAGE_BACKEND,
+    STORAGE_FSYNC,
+    STORAGE_SHARDING,
+)
+from app.services.index import proposal_index
+
+logger = logging.getLogger(__name__)
+
+
+def shard_key(name: str, day: date, sharding: str = STORAGE_SHARDING) -> str:
+    """Relative key for artifact *name* written on *day*.
+
+    The hash covers the file stem only, so a proposal's Markdown, PDF and
+    JSON land in the same directory.
+    """
+    digest = hashlib.sha1(PurePosixPath(name).stem.encode("utf-8")).hexdigest()
+    day_parts = [f"{day.year:04d}", f"{day.month:02d}", f"{day.day:02d}"]
+    if sharding == "date":
+        parts = day_parts
+    elif sharding == "hash":
+        parts = [digest[:2], digest[2:4]]
+    elif sharding == "date+hash":
+        parts = [*day_parts, digest[:2]]
+    elif sharding == "flat":
+        parts = []
+    else:
+        raise ValueError(f"Unknown STORAGE_SHARDING: {sharding!r}")
+    return "/".join([*parts, name])
+
+
+# ── Atomic writes ────────────────────────────────────────────────────────────
+# Temp files are dot-prefixed, so listings and retention skip them, and
+# named per writer, so concurrent writers never share one.
+
+_TEMP_SUFFIX = ".tmp"
+# Younger temp files may belong to a write still in progress in another
+# worker sharing the directory, so orphan cleanup leaves them alone.
+ORPHAN_MIN_AGE = 15 * 60
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Makes the rename itself durable; not possible on Windows.
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: Path, data: bytes, fsync: bool = STORAGE_FSYNC) -> None:
+    """Write *data* to *path* so that readers see either the previous
+    file or the complete new one, never a partial write.
+
+    The data goes to a temp file in the same directory, which is renamed
+    over *path*.  With *fsync* the file is flushed to disk before the
+    rename and the directory after it, so the write also survives a crash.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}-{secrets.token_hex(4)}{_TEMP_SUFFIX}")
+    try:
+        with open(tmp, "xb") as fh:
+            fh.write(data)
+            if fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if fsync:
+        _fsync_directory(path.parent)
+
+
+def remove_orphaned_temp_files(
+    root: Path,
+    min_age: float = ORPHAN_MIN_AGE,
+    now: Optional[float] = None,
+) -> int:
+    """Delete temp files under *root* left behind by interrupted writes.
+
+    Only files older than *min_age* seconds are removed.  Returns how many
+    were deleted.
+    """
+    cutoff = (time.time() if now is None else now) - min_age
+    removed = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if not (name.startswith(".") and name.endswith(_TEMP_SUFFIX)):
+                continue
+            path = Path(dirpath) / name
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue  # finished or removed by another worker
+    return removed
+
+
+@dataclass
+class StoredObject:
+    location: str
+    size: int
+    modified: float
+    accessed: float
+
+
+class StorageBackend(ABC):
+    """Where artifacts live."""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> str:
+        """Store *data* under *key* and return its location."""
+
+    @abstractmethod
+    def location_for(self, key: str) -> str:
+        """The location *key* has (or will have) once stored."""
+
+    @abstractmethod
+    def open(self, location: str) -> BinaryIO:
+        """Open a stored artifact for reading."""
+
+    @abstractmethod
+    def exists(self, location: str) -> bool: ...
+
+    @abstractmethod
+    def delete(self, location: str) -> None: ...
+
+    @abstractmethod
+    def touch(self, location: str) -> None:
+        """Record an access, for least-recently-used eviction."""
+
+    @abstractmethod
+    def iter_objects(self) -> Iterator[StoredObject]: ...
+
+    def local_path(self, location: str) -> Optional[Path]:
+        """Filesystem path of *location*, if it may be served directly."""
+        return None
+
+    def remove_orphans(self) -> int:
+        """Delete leftovers of interrupted writes; return how many."""
+        return 0
+
+
+class _DirectoryStorage(StorageBackend):
+    """Shared implementation for backends that keep objects in a directory.
+
+    Dot-prefixed entries (``.cache``, ``.state``, ``.gitkeep``) are never
+    listed, so the cache and databases under ``OUTPUT_DIR`` are left alone.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    @abstractmethod
+    def _path(self, location: str) -> Path: ...
+
+    @abstractmethod
+    def _location(self, path: Path) -> str: ...
+
+    def put(self, key: str, data: bytes) -> str:
+        path = self.root / key
+        for attempt in range(2):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                write_atomic(path, data)
+                break
+            except FileNotFoundError:
+                # A concurrent delete() removed the shard directory after
+                # it emptied; create it again once.
+                if attempt:
+                    raise
+        return self._location(path)
+
+    def location_for(self, key: str) -> str:
+        return self._location(self.root / key)
+
+    def open(self, location: str) -> BinaryIO:
+        return self._path(location).open("rb")
+
+    def exists(self, location: str) -> bool:
+        return self._path(location).is_file()
+
+    def delete(self, location: str) -> None:
+        path = self._path(location)
+        path.unlink(missing_ok=True)
+        # Drop shard directories that became empty.
+        parent = path.parent
+        while parent != self.root and self.root in parent.parents:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+
+    def touch(self, location: str) -> None:
+        path = self._path(location)
+        try:
+            os.utime(path, (time.time(), path.stat().st_mtime))
+        except OSError:
+            pass
+
+    def remove_orphans(self) -> int:
+        return remove_orphaned_temp_files(self.root)
+
+    def iter_objects(self) -> Iterator[StoredObject]:
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                if name.startswith("."):
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                yield StoredObject(
+                    location=self._location(path),
+                    size=st.st_size,
+                    modified=st.st_mtime,
+                    accessed=max(st.st_atime, st.st_mtime),
+                )
+
+
+class LocalStorage(_DirectoryStorage):
+    """Artifacts on the local filesystem; locations are absolute paths."""
+
+    def _path(self, location: str) -> Path:
+        path = Path(location)
+        if self.root.resolve() not in path.resolve().parents:
+            raise ValueError(f"Location outside storage root: {location}")
+        return path
+
+    def _location(self, path: Path) -> str:
+        return str(path)
+
+    def local_path(self, location: str) -> Optional[Path]:
+        return self._path(location)
+
+
+class LocalObjectStore(_DirectoryStorage):
+    """Object-store stand-in backed by a (possibly shared) directory.
+
+    Locations are ``objstore://<key>`` URIs rather than paths, so callers
+    go through :meth:`open` exactly as they would with a real bucket.
+    """
+
+    SCHEME = "objstore://"
+
+    def _path(self, location: str) -> Path:
+        if not location.startswith(self.SCHEME):
+            raise ValueError(f"Not an object-store location: {location}")
+        key = location[len(self.SCHEME):]
+        if ".." in key.split("/"):
+            raise ValueError(f"Invalid object key: {key}")
+        return self.root / key
+
+    def _location(self, path: Path) -> str:
+        return self.SCHEME + path.relative_to(self.root).as_posix()
+
+
+# ── Retention ────────────────────────────────────────────────────────────────
+
+@dataclass
+class RetentionPolicy:
+    max_age_days: float = 0
+    max_total_bytes: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age_days > 0 or self.max_total_bytes > 0
+
+
+@dataclass
+class SweepResult:
+    deleted: list[str]
+    freed_bytes: int
+    remaining_bytes: int
+
+
+def sweep(
+    backend: StorageBackend,
+    policy: RetentionPolicy,
+    now: Optional[float] = None,
+) -> SweepResult:
+    """Delete artifacts older than the age limit, then the least recently
+    accessed ones until the total fits the byte budget."""
+    now = time.time() if now is None else now
+    cutoff = now - policy.max_age_days * 86400 if policy.max_age_days > 0 else None
+
+    deleted: list[str] = []
+    freed = 0
+    kept: list[StoredObject] = []
+    for obj in backend.iter_objects():
+        if cutoff is not None and obj.modified < cutoff:
+            backend.delete(obj.location)
+            deleted.append(obj.location)
+            freed += obj.size
+        else:
+            kept.append(obj)
+
+    total = sum(obj.size for obj in kept)
+    if policy.max_total_bytes > 0 and total > policy.max_total_bytes:
+        kept.sort(key=lambda obj: obj.accessed)
+        for obj in kept:
+            if total <= policy.max_total_bytes:
+                break
+            backend.delete(obj.location)
+            deleted.append(obj.location)
+            freed += obj.size
+            total -= obj.size
+
+    return SweepResult(deleted=deleted, freed_bytes=freed, remaining_bytes=total)
+
+
+class RetentionSweeper:
+    """Background thread that applies the retention policy periodically."""
+
+    def __init__(self, backend: StorageBackend, policy: RetentionPolicy, interval: float):
+        self.backend = backend
+        self.policy = policy
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if not self.policy.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="retention-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def run_once(self) -> SweepResult:
+        result = sweep(self.backend, self.policy)
+        if result.deleted:
+            proposal_index.forget_locations(result.deleted)
+            logger.info(
+                "Retention sweep removed %d artifacts (%d bytes)",
+                len(result.deleted),
+                result.freed_bytes,
+            )
+        return result
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Retention sweep failed")
+            self._stop.wait(self.interval)
+
+
+def _make_backend(kind: str) -> StorageBackend:
+    if kind == "local":
+        return LocalStorage(OUTPUT_DIR)
+    if kind == "object":
+        return LocalObjectStore(OBJECT_STORE_DIR)
+    raise ValueError(f"STORAGE_BACKEND must be 'local' or 'object', not {kind!r}")
+
+
+def clean_up_orphans(extra_roots: tuple[Path, ...] = ()) -> int:
+    """Remove temp files left by interrupted writes from artifact storage
+    and *extra_roots*; return how many were deleted."""
+    removed = storage.remove_orphans()
+    for root in extra_roots:
+        removed += remove_orphaned_temp_files(root)
+    if removed:
+        logger.info("Removed %d orphaned temp files", removed)
+    return removed
+
+
+class OrphanCleanup:
+    """Background thread that runs :func:`clean_up_orphans` at start-up and
+    then every *interval* seconds (0: at start-up only).
+
+    Independent of retention, which is off by default.  In the background
+    because it walks the whole storage tree, which should not delay
+    start-up.
+    """
+
+    def __init__(self, interval: float, extra_roots: tuple[Path, ...] = ()):
+        self.interval = interval
+        self.extra_roots = extra_roots
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="orphan-cleanup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                clean_up_orphans(self.extra_roots)
+            except Exception:
+                logger.exception("Orphaned temp file cleanup failed")
+            if self.interval <= 0:
+                return
+            self._stop.wait(self.interval)
+
+
+storage = _make_backend(STORAGE_BACKEND)
+retention_sweeper = RetentionSweeper(
+    storage,
+    RetentionPolicy(max_age_days=RETENTION_MAX_AGE_DAYS, max_total_bytes=RETENTION_MAX_BYTES),
+    interval=RETENTION_SWEEP_INTERVAL,
+)
+orphan_cleanup = OrphanCleanup(ORPHAN_CLEANUP_INTERVAL, extra_roots=(CACHE_DIR,))
@@ -0,0 +1,143 @@
+"""Start-up warm-up and readiness.
+
+Heavy dependencies are imported lazily (``fpdf2`` on the first PDF,
+NumPy on the first batch quote), which keeps imports fast for short-lived
+processes.  A server should not make its first real request pay for
+them instead, so at start-up :class:`WarmUp` runs in a background thread:
+
+* ``pdf`` — import fpdf2, load the core fonts and pre-render the static
+  section fragments;
+* ``proposal`` — validate a sample input and render it (pricing,
+  templates, Markdown, PDF, JSON serialisation) in memory;
+* ``pricing_batch`` — import NumPy and price a one-lead portfolio;
+* ``render_pool`` — fork the render workers, which inherit all of the above;
+* ``batch_pool`` — likewise fork the batch workers when background jobs
+  render there (``JOB_WORKER_MODE=process``).
+
+``/ready`` reports ``503`` until this has finished, while ``/health``
+answers at once.  Nothing is written to artifact storage or the proposal
+index, and the steps run with metrics off.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import date
+from typing import Optional
+
+from app.config import JOB_WORKER_MODE, JOB_WORKERS, WARM_UP
+from app.models.proposal import ALL_FORMATS, ProposalInput
+from app.services.generator import _render, prerender_static_sections
+from app.services.metrics import unrecorded
+
+logger = logging.getLogger(__name__)
+
+_SAMPLE_INPUT = {
+    "company_name": "Warm-up Ltd",
+    "industry": "Retail",
+    "main_problem": "Orders are re-typed by hand — slow and error-prone",
+    "current_process": "Orders arrive on WhatsApp and are entered into a spreadsheet.",
+    "desired_automation": "Automated order intake and invoicing",
+    "estimated_monthly_customers": 1500,
+}
+
+
+def _warm_pdf() -> None:
+    with unrecorded():
+        prerender_static_sections()
+
+
+def _warm_proposal() -> None:
+    data = ProposalInput.model_validate(_SAMPLE_INPUT)
+    with unrecorded():
+        rendered = _render(data, ALL_FORMATS, "warmup", date.today())
+    rendered.output.model_dump_json()
+
+
+def _warm_pricing_batch() -> None:
+    from app.services.pricing_batch import calculate_pricing_batch
+
+    with unrecorded():
+        calculate_pricing_batch(["Retail"], [1500])
+
+
+# The pools are forked outside ``unrecorded``: workers inherit the forking
+# thread's context, and their metrics must count.
+def _warm_render_pool() -> None:
+    # Imported here: the pool module itself waits on this warm-up.
+    from app.services.pool import prestart_render_pool
+
+    prestart_render_pool()
+
+
+def _warm_batch_pool() -> None:
+    from app.services.pool import prestart_process_pool
+
+    if JOB_WORKERS > 0 and JOB_WORKER_MODE == "process":
+        prestart_process_pool()
+
+
+_STEPS = (
+    ("pdf", _warm_pdf),
+    ("proposal", _warm_proposal),
+    ("pricing_batch", _warm_pricing_batch),
+    ("render_pool", _warm_render_pool),
+    ("batch_pool", _warm_batch_pool),
+)
+
+
+class WarmUp:
+    """Runs the warm-up steps once and tracks readiness."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.timings: dict[str, float] = {}
+        self.error: Optional[str] = None
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if not enabled:
+            self._done.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def start(self) -> None:
+        if self._done.is_set() or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name="warm-up", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until a started warm-up finishes; never waits otherwise."""
+        if self._thread is None:
+            return self.ready
+        return self._done.wait(timeout)
+
+    def run(self) -> None:
+        started = time.perf_counter()
+        try:
+            for name, step in _STEPS:
+                step_started = time.perf_counter()
+                step()
+                self.timings[name] = round(time.perf_counter() - step_started, 4)
+        except Exception as exc:
+            # A failed warm-up only costs latency; serve traffic regardless.
+            self.error = f"{type(exc).__name__}: {exc}"
+            logger.exception("Warm-up failed")
+        finally:
+            self.timings["total"] = round(time.perf_counter() - started, 4)
+            self._done.set()
+        logger.info("Warm-up finished in %.2fs: %s", self.timings["total"], self.timings)
+
+    def status(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "warm_up_seconds": self.timings,
+            "error": self.error,
+        }
+
+
+warm_up = WarmUp(enabled=WARM_UP)
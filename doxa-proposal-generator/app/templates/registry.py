@@ -0,0 +1,220 @@
+"""Template registry: proposal wording loaded from files, hot-reloaded.
+
+Every section template and the WhatsApp pitch is a text file in
+``TEMPLATE_DIR`` (``app/templates/text/`` by default) using
+``str.format()`` placeholders.  The registry loads them all, checks each
+placeholder against the variables the generator provides (see
+:data:`TEMPLATE_FIELDS`), compiles the section templates into document
+blocks and publishes the result as one immutable :class:`TemplateSet`.
+
+At most every ``TEMPLATE_RELOAD_INTERVAL`` seconds, :meth:`current`
+compares the files' modification times with the loaded set.  When one
+changed, the whole set is reloaded and swapped in with a single
+assignment — a render sees either the old set or the new one, never a
+mix.  A set that fails validation is rejected with an error in the log
+and the previous one stays in use, so a typo never takes the service
+down.  :attr:`TemplateSet.version` hashes the template text; the result
+cache keys on it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from string import Formatter
+from typing import Optional
+
+from app.config import TEMPLATE_DIR, TEMPLATE_RELOAD_INTERVAL
+from app.services.document import SectionTemplate, compile_template
+
+logger = logging.getLogger(__name__)
+
+_COMMON = {
+    "agency": "DOXA",
+    "company": "Example Ltd",
+    "industry": "Retail",
+    "monthly_customers": 500,
+    "currency": "USD",
+}
+
+# Template name -> (file name, variables available to it, with sample
+# values used to test-format the template).
+TEMPLATE_FIELDS: dict[str, tuple[str, dict[str, object]]] = {
+    "executive_summary": ("executive_summary.md", {**_COMMON, "problem_short": "slow orders"}),
+    "problem_analysis": ("problem_analysis.md", {**_COMMON, "current_process": "By hand."}),
+    "proposed_solution": ("proposed_solution.md", {**_COMMON, "desired_automation": "Intake."}),
+    "technical_architecture": ("technical_architecture.md", {}),
+    "roi_explanation": (
+        "roi_explanation.md",
+        {
+            **_COMMON,
+            "scaled_customers": 2500,
+            "hours_saved": 200,
+            "monthly_sub": 1500,
+            "payback_months": 3,
+        },
+    ),
+    "implementation_timeline": ("implementation_timeline.md", {}),
+    "whatsapp_pitch": (
+        "whatsapp_pitch.txt",
+        {
+            "contact": "Example",
+            "agency": "DOXA",
+            "company": "Example Ltd",
+            "industry": "retail",
+            "setup_fee": 5000,
+            "monthly_sub": 1500,
+            "currency": "USD",
+        },
+    ),
+}
+
+# Templates kept as plain text rather than compiled into blocks.
+_PLAIN = frozenset({"whatsapp_pitch"})
+
+
+class TemplateError(ValueError):
+    """A template file is missing or uses an unknown placeholder."""
+
+
+@dataclass(frozen=True)
+class TemplateSet:
+    """One consistent, validated generation of every template."""
+
+    sections: dict[str, SectionTemplate]
+    texts: dict[str, str]
+    # Variables each template uses, e.g. {"company", "industry"}.
+    fields: dict[str, frozenset[str]]
+    version: str
+    stamps: dict[str, tuple[int, int]]
+
+    def section(self, name: str) -> SectionTemplate:
+        return self.sections[name]
+
+    @property
+    def whatsapp_pitch(self) -> str:
+        return self.texts["whatsapp_pitch"]
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _check_placeholders(name: str, text: str, sample: dict[str, object]) -> frozenset[str]:
+    """Validate *text* and return the variables it uses."""
+    try:
+        fields = {field for _, field, _, _ in Formatter().parse(text) if field is not None}
+    except ValueError as exc:
+        raise TemplateError(f"{name}: {exc}") from exc
+    roots = set()
+    for field in fields:
+        root = field.split(".", 1)[0].split("[", 1)[0]
+        if root not in sample:
+            allowed = ", ".join(sorted(sample)) or "none"
+            raise TemplateError(f"{name}: unknown placeholder {{{field}}} (available: {allowed})")
+        roots.add(root)
+    try:
+        text.format(**sample)
+    except (ValueError, KeyError, IndexError, AttributeError) as exc:
+        raise TemplateError(f"{name}: {exc}") from exc
+    return frozenset(roots)
+
+
+def load_template_set(directory: Path) -> TemplateSet:
+    """Read, validate and compile every template in *directory*."""
+    texts: dict[str, str] = {}
+    fields: dict[str, frozenset[str]] = {}
+    stamps: dict[str, tuple[int, int]] = {}
+    for name, (filename, sample) in TEMPLATE_FIELDS.items():
+        path = directory / filename
+        try:
+            stamps[name] = _stamp(path)
+            text = path.read_text(encoding="utf-8").rstrip("\n")
+        except OSError as exc:
+            raise TemplateError(f"{name}: cannot read {path}: {exc}") from exc
+        fields[name] = _check_placeholders(name, text, sample)
+        texts[name] = text
+
+    sections = {name: compile_template(text) for name, text in texts.items() if name not in _PLAIN}
+    digest = hashlib.sha256()
+    for name in sorted(texts):
+        digest.update(f"{name}\0{texts[name]}\0".encode("utf-8"))
+    return TemplateSet(
+        sections=sections,
+        texts=texts,
+        fields=fields,
+        version=digest.hexdigest()[:16],
+        stamps=stamps,
+    )
+
+
+class TemplateRegistry:
+    """Holds the current :class:`TemplateSet` and reloads it on change."""
+
+    def __init__(self, directory: Path, reload_interval: float):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.last_error: Optional[str] = None
+        self._set = load_template_set(directory)
+        self._checked_at = time.monotonic()
+        self._reload_lock = threading.Lock()
+        self._listeners: list[Callable[[TemplateSet], None]] = []
+
+    def current(self) -> TemplateSet:
+        """The current templates, reloaded first if a file has changed."""
+        if (
+            self.reload_interval > 0
+            and time.monotonic() - self._checked_at >= self.reload_interval
+            # One caller checks; the others keep using the current set.
+            and self._reload_lock.acquire(blocking=False)
+        ):
+            try:
+                self._checked_at = time.monotonic()
+                self._reload_if_changed()
+            finally:
+                self._reload_lock.release()
+        return self._set
+
+    def subscribe(self, listener: Callable[[TemplateSet], None]) -> None:
+        """Call *listener* with each newly loaded set."""
+        self._listeners.append(listener)
+
+    def _changed(self) -> bool:
+        for name, (filename, _) in TEMPLATE_FIELDS.items():
+            try:
+                if _stamp(self.directory / filename) != self._set.stamps[name]:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _reload_if_changed(self) -> None:
+        if not self._changed():
+            return
+        try:
+            new = load_template_set(self.directory)
+        except TemplateError as exc:
+            if str(exc) != self.last_error:
+                logger.error("Template reload rejected, keeping version %s: %s", self._set.version, exc)
+            self.last_error = str(exc)
+            return
+        self.last_error = None
+        if new.version == self._set.version:
+            self._set = new  # only timestamps moved
+            return
+        self._set = new
+        logger.info("Templates reloaded: version %s", new.version)
+        for listener in self._listeners:
+            try:
+                listener(new)
+            except Exception:
+                logger.exception("Template reload listener failed")
+
+
+template_registry = TemplateRegistry(Path(TEMPLATE_DIR), TEMPLATE_RELOAD_INTERVAL)
@@ -1,13 +0,0 @@
-"""WhatsApp pitch template — max 5 lines."""
-
-from __future__ import annotations
-
-WHATSAPP_PITCH = (
-    "Hi {contact} — this is {agency}.\n"
-    "We help {industry} businesses automate manual workflows using AI.\n"
-    "For {company}, we can cut processing time by 90%+ and eliminate "
-    "order errors.\n"
-    "Setup from {currency} {setup_fee:,} | Monthly from {currency} "
-    "{monthly_sub:,}.\n"
-    "Can we schedule a 15-min call this week to walk you through it?"
-)
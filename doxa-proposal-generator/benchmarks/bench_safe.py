@@ -0,0 +1,70 @@
+"""Benchmark ``_safe`` against the original multi-pass implementation.
+
+    python -m benchmarks.bench_safe [--repeat N]
+
+Checks that both produce identical output on a mixed corpus, then prints
+per-call timings for each kind of input.  The "cold" column clears the
+memo before every call and so shows the uncached path; "new" is the
+steady state with the memo warm.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from app.services.pdf_export import _UNICODE_MAP, _safe, _sanitize_memo
+
+
+def _safe_legacy(text: str) -> str:
+    """The original implementation: one ``str.replace`` pass per mapping."""
+    for uchar, replacement in _UNICODE_MAP.items():
+        text = text.replace(uchar, replacement)
+    return text.encode("latin-1", errors="replace").decode("latin-1")
+
+
+CORPUS = {
+    "ascii header": "DOXA -- Confidential",
+    "table cell": "Week 3–6",
+    "diagram line": "│  Channels    │───▶│  API Gateway /   │───▶│  Workflow Engine │",
+    "typographic paragraph": (
+        "DOXA proposes a tailored AI automation solution — reducing "
+        "operational cost, eliminating errors … “quoted” and ‘single’."
+    )
+    * 3,
+    "latin-1 customer text": "Commandes reçues via WhatsApp, saisies à la main. " * 10,
+    "non-latin customer text": "Заказы приходят через WhatsApp — 订单 — ዕቃዎች " * 20,
+    "long ascii customer text": "Orders come in via WhatsApp and are typed into Excel. " * 60,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    for name, text in CORPUS.items():
+        if _safe(text) != _safe_legacy(text):
+            raise SystemExit(f"output mismatch: {name}")
+
+    def cold(text: str) -> str:
+        _sanitize_memo.cache_clear()
+        return _safe(text)
+
+    print(
+        f"{'input':<26}{'chars':>7}{'legacy µs':>12}{'cold µs':>10}"
+        f"{'new µs':>10}{'speed-up':>10}"
+    )
+    per = 1e6 / args.repeat
+    for name, text in CORPUS.items():
+        legacy = timeit.timeit(lambda: _safe_legacy(text), number=args.repeat)
+        uncached = timeit.timeit(lambda: cold(text), number=args.repeat)
+        new = timeit.timeit(lambda: _safe(text), number=args.repeat)
+        print(
+            f"{name:<26}{len(text):>7}{legacy * per:>12.2f}{uncached * per:>10.2f}"
+            f"{new * per:>10.2f}{legacy / new:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Import-time budget check.
+
+    python -m benchmarks.import_time [--runs N] [--scale X]
+
+Imports each entry point in fresh interpreters, reports the median wall
+time and exits with status 1 when a module exceeds its budget or pulls in
+a dependency that should only load on first use.  ``--scale`` multiplies
+every budget, for slower machines.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# module -> (budget in ms, modules that must not be imported by it)
+BUDGETS: dict[str, tuple[float, tuple[str, ...]]] = {
+    "app.config": (60, ("fastapi", "pydantic", "fpdf", "numpy")),
+    "app.services.generator": (400, ("fastapi", "fpdf", "numpy")),
+    "app.main": (1200, ("fpdf", "numpy")),
+}
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def probe(module: str, lazy: tuple[str, ...]) -> dict:
+    code = _PROBE.format(module=module, lazy=lazy)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<26}{'median ms':>11}{'budget ms':>11}  eagerly loaded")
+    for module, (budget, lazy) in BUDGETS.items():
+        probe(module, lazy)  # populate bytecode caches
+        results = [probe(module, lazy) for _ in range(args.runs)]
+        median = statistics.median(r["ms"] for r in results)
+        loaded = sorted({m for r in results for m in r["loaded"]})
+        limit = budget * args.scale
+        print(f"{module:<26}{median:>11.1f}{limit:>11.0f}  {', '.join(loaded) or '-'}")
+        if median > limit:
+            failures.append(f"{module} took {median:.0f} ms (budget {limit:.0f} ms)")
+        if loaded:
+            failures.append(f"{module} imported {', '.join(loaded)} eagerly")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
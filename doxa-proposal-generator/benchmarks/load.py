@@ -0,0 +1,423 @@
+"""Load-test the HTTP service across concurrency levels.
+
+    python -m benchmarks.load                                 # 1 worker, concurrency 1 4 16
+    python -m benchmarks.load --workers 1 2 --concurrency 2 8 32 --duration 20
+    python -m benchmarks.load --mix pdf=1 --env RENDER_WORKERS=2 --json load.json
+
+Starts ``uvicorn app.main:app`` on a free local port for each worker
+count, waits for ``/ready``, then replays a weighted mix of
+``/generate``, ``/generate/pdf`` and ``/generate/markdown`` requests built
+from the synthesized inputs of :mod:`benchmarks.suite`, each one tagged
+with a unique company name and process note so that no request repeats
+another's text.  At each concurrency level that many client threads
+send requests back to back, each over its own keep-alive connection,
+for ``--duration`` seconds.
+
+For every level it reports throughput, p50/p95/p99 latency of successful
+requests, the error rate (admission rejections — 429 / 503 — shown
+separately), and the CPU use and peak RSS of each uvicorn worker and of
+its render-pool processes, read from ``/proc``.  Everything runs
+offline, against a scratch ``OUTPUT_DIR`` with the result and PDF layout
+caches off.  The client shares the machine with the server, so leave it
+a core when reading CPU numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from benchmarks.run import _configure_environment
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+ROUTES = {
+    "generate": "/api/v1/proposals/generate",
+    "pdf": "/api/v1/proposals/generate/pdf",
+    "markdown": "/api/v1/proposals/generate/markdown",
+}
+
+_SAMPLE_EVERY = 0.5
+
+
+# ── Server ───────────────────────────────────────────────────────────────────
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, env: dict[str, str]) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=env)
+
+
+def wait_ready(port: int, server: subprocess.Popen, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with status {server.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/ready")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server not ready after {timeout:.0f}s")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+# ── Process sampling (/proc) ─────────────────────────────────────────────────
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _stat(pid: int) -> tuple[int, float] | None:
+    """``(parent pid, CPU seconds)`` of *pid*, or None once it has exited."""
+    try:
+        raw = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    # The command name may contain spaces; fields resume after its ")".
+    fields = raw[raw.rindex(")") + 2:].split()
+    return int(fields[1]), (int(fields[11]) + int(fields[12])) / _CLK_TCK
+
+
+def _rss(pid: int) -> int:
+    try:
+        return int(Path(f"/proc/{pid}/statm").read_text().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return 0
+
+
+def _is_resource_tracker(pid: int) -> bool:
+    try:
+        return b"resource_tracker" in Path(f"/proc/{pid}/cmdline").read_bytes()
+    except OSError:
+        return False
+
+
+def _children() -> dict[int, list[int]]:
+    tree: dict[int, list[int]] = defaultdict(list)
+    for entry in os.scandir("/proc"):
+        if entry.name.isdigit():
+            stat = _stat(int(entry.name))
+            if stat is not None:
+                tree[stat[0]].append(int(entry.name))
+    return tree
+
+
+@dataclass
+class ProcessUsage:
+    cpu_start: float
+    cpu_end: float
+    peak_rss: int = 0
+
+    @property
+    def cpu_seconds(self) -> float:
+        return self.cpu_end - self.cpu_start
+
+
+@dataclass
+class ResourceSampler:
+    """Samples the CPU time and RSS of the server's process tree.
+
+    With one worker uvicorn serves from the process it started; with
+    several, that process supervises one child per worker.  Processes
+    below a worker (the render pool) are attributed to that worker;
+    multiprocessing's resource trackers are left out.
+    """
+
+    root: int
+    workers: int
+    usage: dict[int, ProcessUsage] = field(default_factory=dict)
+    owner: dict[int, int] = field(default_factory=dict)
+    _stop: threading.Event = field(default_factory=threading.Event)
+    _thread: threading.Thread | None = None
+
+    def _sample(self) -> None:
+        tree = _children()
+        workers = [self.root] if self.workers == 1 else tree.get(self.root, [])
+        for worker in workers:
+            stack = [worker]
+            while stack:
+                pid = stack.pop()
+                stack.extend(tree.get(pid, ()))
+                if pid not in self.usage and _is_resource_tracker(pid):
+                    self.owner[pid] = -1
+                    continue
+                if self.owner.get(pid) == -1:
+                    continue
+                stat = _stat(pid)
+                if stat is None:
+                    continue
+                usage = self.usage.get(pid)
+                if usage is None:
+                    usage = self.usage[pid] = ProcessUsage(stat[1], stat[1])
+                    self.owner[pid] = worker
+                usage.cpu_end = stat[1]
+                usage.peak_rss = max(usage.peak_rss, _rss(pid))
+
+    def _run(self) -> None:
+        while not self._stop.wait(_SAMPLE_EVERY):
+            self._sample()
+
+    def __enter__(self) -> ResourceSampler:
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def per_worker(self, elapsed: float) -> list[dict]:
+        """CPU % and peak RSS of each worker and of its helper processes."""
+        report = []
+        for worker in sorted(set(self.owner.values()) - {-1}):
+            own = self.usage[worker]
+            helpers = [
+                u for pid, u in self.usage.items() if self.owner[pid] == worker and pid != worker
+            ]
+            report.append(
+                {
+                    "pid": worker,
+                    "cpu_pct": round(100 * own.cpu_seconds / elapsed, 1),
+                    "rss_mb": round(own.peak_rss / 2**20, 1),
+                    "helpers": len(helpers),
+                    "helpers_cpu_pct": round(100 * sum(u.cpu_seconds for u in helpers) / elapsed, 1),
+                    "helpers_rss_mb": round(sum(u.peak_rss for u in helpers) / 2**20, 1),
+                }
+            )
+        return report
+
+
+# ── Client ───────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int  # 0: connection failed
+    seconds: float
+
+
+# Request numbers, unique across client threads and concurrency levels.
+_request_numbers = itertools.count(1)
+
+
+def _request_body(raw: dict) -> bytes:
+    """*raw* with a request number in its free text, so every request
+    renders content the server has not seen before."""
+    tag = f"#{next(_request_numbers)}"
+    varied = dict(
+        raw,
+        company_name=f"{raw['company_name']} {tag}",
+        current_process=f"{raw['current_process']} ({tag})",
+    )
+    return json.dumps(varied).encode("utf-8")
+
+
+def _client(
+    port: int,
+    schedule: list[str],
+    inputs: list[dict],
+    deadline: float,
+    seed: int,
+    samples: list[Sample],
+) -> None:
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    headers = {"Content-Type": "application/json"}
+    while time.perf_counter() < deadline:
+        route = rng.choice(schedule)
+        started = time.perf_counter()
+        try:
+            conn.request("POST", ROUTES[route], _request_body(rng.choice(inputs)), headers)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            status = 0
+        samples.append(Sample(route, status, time.perf_counter() - started))
+    conn.close()
+
+
+def _latency(samples: list[Sample]) -> dict:
+    from benchmarks.suite import _percentile
+
+    times = sorted(s.seconds * 1000 for s in samples if 200 <= s.status < 300)
+    if not times:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    return {f"p{p}_ms": round(_percentile(times, p), 1) for p in (50, 95, 99)}
+
+
+def run_level(
+    port: int,
+    concurrency: int,
+    duration: float,
+    schedule: list[str],
+    inputs: list[dict],
+    sampler: ResourceSampler | None,
+) -> dict:
+    per_thread: list[list[Sample]] = [[] for _ in range(concurrency)]
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_client, args=(port, schedule, inputs, deadline, n, per_thread[n]))
+        for n in range(concurrency)
+    ]
+    with sampler if sampler is not None else nullcontext():
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+    samples = list(itertools.chain.from_iterable(per_thread))
+    ok = sum(1 for s in samples if 200 <= s.status < 300)
+    statuses: dict[str, int] = defaultdict(int)
+    for s in samples:
+        statuses[str(s.status)] += 1
+    routes = {}
+    for route in sorted({s.route for s in samples}):
+        subset = [s for s in samples if s.route == route]
+        routes[route] = {"requests": len(subset), **_latency(subset)}
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "requests": len(samples),
+        "throughput_rps": round(ok / elapsed, 2),
+        **_latency(samples),
+        "error_rate": round(1 - ok / len(samples), 4) if samples else 0.0,
+        "rejected": statuses.get("429", 0) + statuses.get("503", 0),
+        "statuses": dict(statuses),
+        "routes": routes,
+        "workers": sampler.per_worker(elapsed) if sampler is not None else [],
+    }
+
+
+# ── Report ───────────────────────────────────────────────────────────────────
+
+
+def _ms(value: float | None) -> str:
+    return "—" if value is None else f"{value:.0f}"
+
+
+def print_level(level: dict) -> None:
+    print(
+        f"{level['concurrency']:>5}{level['requests']:>8}{level['throughput_rps']:>9.1f}"
+        f"{_ms(level['p50_ms']):>8}{_ms(level['p95_ms']):>8}{_ms(level['p99_ms']):>8}"
+        f"{level['error_rate']:>8.1%}{level['rejected']:>9}"
+    )
+    for route, stats in level["routes"].items():
+        print(
+            f"{'':>5}  {route:<11}{stats['requests']:>6}{'':>9}"
+            f"{_ms(stats['p50_ms']):>8}{_ms(stats['p95_ms']):>8}{_ms(stats['p99_ms']):>8}"
+        )
+    for worker in level["workers"]:
+        print(
+            f"{'':>5}  worker {worker['pid']}: cpu {worker['cpu_pct']:.0f}% rss {worker['rss_mb']:.0f} MB"
+            f" | {worker['helpers']} helper(s): cpu {worker['helpers_cpu_pct']:.0f}%"
+            f" rss {worker['helpers_rss_mb']:.0f} MB"
+        )
+
+
+def _parse_mix(text: str) -> list[str]:
+    schedule = []
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(f"unknown route {name!r} (expected {', '.join(ROUTES)})")
+        schedule += [name] * int(weight or 1)
+    if not schedule:
+        raise argparse.ArgumentTypeError("empty mix")
+    return schedule
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="uvicorn worker counts")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="client threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument(
+        "--mix", type=_parse_mix, default=_parse_mix("generate=1,pdf=1,markdown=2"),
+        help="route weights, e.g. generate=1,pdf=1,markdown=2",
+    )
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="server setting")
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    args = parser.parse_args()
+
+    sample_resources = Path("/proc/self/stat").exists()
+    if not sample_resources:
+        print("/proc not available: CPU and RSS are not reported.")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="doxa-load-") as scratch:
+        _configure_environment(scratch)
+        from benchmarks.suite import synthesize_inputs
+
+        inputs = list(synthesize_inputs().values())
+        env = dict(os.environ)
+        for setting in args.env:
+            key, _, value = setting.partition("=")
+            env[key] = value
+
+        for workers in args.workers:
+            port = _free_port()
+            server = start_server(port, workers, env)
+            try:
+                wait_ready(port, server)
+                print(f"\nworkers={workers}  mix={','.join(sorted(set(args.mix)))}  {args.duration:.0f}s per level")
+                print(f"{'conc':>5}{'reqs':>8}{'req/s':>9}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'errors':>8}{'429/503':>9}")
+                for concurrency in args.concurrency:
+                    sampler = ResourceSampler(server.pid, workers) if sample_resources else None
+                    level = run_level(port, concurrency, args.duration, args.mix, inputs, sampler)
+                    print_level(level)
+                    results.append({"workers": workers, **level})
+            finally:
+                stop_server(server)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
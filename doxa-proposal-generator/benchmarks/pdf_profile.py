@@ -0,0 +1,106 @@
+"""Compare the ``compact`` PDF profile with ``standard``: size and time.
+
+    python -m benchmarks.pdf_profile [--repeat N]
+
+Renders each synthesized input (see :mod:`benchmarks.suite`) with both
+profiles, checks that they put the same text on the same pages, and
+prints the file size, the size of the uncompressed page content and the
+median render time.  Static fragments are pre-rendered first, as at
+server start-up.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import tempfile
+import time
+import zlib
+
+from benchmarks.run import _configure_environment
+
+_STREAM = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.S)
+# A literal string shown with ``Tj``, as fpdf2 writes core-font text.
+_SHOWN_TEXT = re.compile(rb"\(((?:\\.|[^\\)])*)\)\s*Tj", re.S)
+_ESCAPE = re.compile(rb"\\([()\\])")
+
+
+def _streams(pdf: bytes) -> list[bytes]:
+    streams = []
+    for stream in _STREAM.findall(pdf):
+        try:
+            streams.append(zlib.decompress(stream))
+        except zlib.error:
+            streams.append(stream)
+    return streams
+
+
+def content_bytes(pdf: bytes) -> int:
+    """Total size of the PDF's streams after decompression."""
+    return sum(len(stream) for stream in _streams(pdf))
+
+
+def page_texts(pdf: bytes) -> list[list[bytes]]:
+    """The strings drawn on each page, sorted: the profiles draw the
+    branding in a different order, but must put the same text on every
+    page."""
+    pages = []
+    for stream in _streams(pdf):
+        shown = [_ESCAPE.sub(rb"\1", text) for text in _SHOWN_TEXT.findall(stream)]
+        if shown:
+            pages.append(sorted(shown))
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=30, help="renders per input and profile")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="doxa-bench-") as scratch:
+        _configure_environment(scratch)
+        from datetime import date
+
+        from app.models.proposal import OutputFormat, ProposalInput
+        from app.services.generator import _render, prerender_static_sections
+        from app.services.pdf_export import render_pdf
+        from benchmarks.suite import synthesize_inputs
+
+        prerender_static_sections()
+        print(
+            f"{'input':<14}{'profile':<10}{'pages':>6}{'bytes':>9}{'content':>9}"
+            f"{'p50 ms':>9}{'size':>8}{'time':>8}"
+        )
+        for name, raw in synthesize_inputs().items():
+            doc = _render(
+                ProposalInput(**raw), [OutputFormat.markdown], "bench", date(2026, 1, 1)
+            ).document
+            results = {}
+            texts = {}
+            for profile in ("standard", "compact"):
+                pdf = render_pdf(doc, profile=profile)  # warm-up
+                times = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    render_pdf(doc, profile=profile)
+                    times.append(time.perf_counter() - started)
+                pages = pdf.count(b"/Type /Page\n") + pdf.count(b"/Type /Page>")
+                texts[profile] = page_texts(pdf)
+                results[profile] = (pages, len(pdf), content_bytes(pdf), statistics.median(times))
+
+            base = results["standard"]
+            if results["compact"][0] != base[0]:
+                raise SystemExit(f"{name}: page count differs")
+            if texts["compact"] != texts["standard"]:
+                raise SystemExit(f"{name}: page text differs")
+            for profile, (pages, size, content, median) in results.items():
+                change = "" if profile == "standard" else f"{size / base[1] - 1:>+8.1%}{median / base[3] - 1:>+8.1%}"
+                print(
+                    f"{name:<14}{profile:<10}{pages:>6}{size:>9}{content:>9}"
+                    f"{median * 1000:>9.2f}{change}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Run the pipeline benchmark suite and check it against a baseline.
+
+    python -m benchmarks.run                      # run, compare with benchmarks/baseline.json
+    python -m benchmarks.run --save               # run and record a new baseline
+    python -m benchmarks.run -k render_pdf        # only cases whose name contains "render_pdf"
+    python -m benchmarks.run --threshold 0.15     # fail on a >15 % median slowdown
+
+Artifacts go to a scratch ``OUTPUT_DIR`` and the result and PDF layout
+caches are disabled, so every call does the full work.  Exits with status 1 when any case's
+median latency regressed past the threshold, and with status 2 when there
+is no baseline to compare with.  Baselines are only comparable on the
+machine that recorded them, so none is committed: record one with
+``--save`` first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _configure_environment(scratch: str) -> None:
+    # Must run before anything under ``app`` is imported: config is read once.
+    os.environ["OUTPUT_DIR"] = scratch
+    os.environ["RESULT_CACHE_ENABLED"] = "false"
+    os.environ["JOB_WORKERS"] = "0"
+    os.environ["RETENTION_MAX_AGE_DAYS"] = "0"
+    os.environ["RETENTION_MAX_BYTES"] = "0"
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a comparison table; return the names of regressed cases."""
+    regressions = []
+    print(f"\n{'case':<38}{'baseline p50':>14}{'now p50':>12}{'change':>9}")
+    for name, stats in current.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<38}{'—':>14}{stats['p50_us']:>12.1f}{'new':>9}")
+            continue
+        change = stats["p50_us"] / base["p50_us"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<38}{base['p50_us']:>14.1f}{stats['p50_us']:>12.1f}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds per case")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="record results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed median slowdown")
+    parser.add_argument("--no-routes", action="store_true", help="skip the HTTP route cases")
+    args = parser.parse_args()
+
+    if not args.save and not args.baseline.exists():
+        # Checked up front: a run with nothing to compare against is not a pass.
+        print(f"No baseline at {args.baseline}; run with --save to record one.", file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory(prefix="doxa-bench-") as scratch:
+        _configure_environment(scratch)
+        from benchmarks.suite import cases, measure
+
+        results: dict[str, dict] = {}
+        print(f"{'case':<38}{'p50 µs':>11}{'p90 µs':>11}{'p99 µs':>11}{'ops/s':>11}")
+        with cases(include_routes=not args.no_routes) as all_cases:
+            for case in all_cases:
+                if args.filter not in case.name:
+                    continue
+                stats = results[case.name] = measure(case, args.min_time)
+                print(
+                    f"{case.name:<38}{stats['p50_us']:>11.1f}{stats['p90_us']:>11.1f}"
+                    f"{stats['p99_us']:>11.1f}{stats['ops_per_s']:>11.1f}"
+                )
+
+    if args.save:
+        payload = {
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "min_time": args.min_time,
+            "results": results,
+        }
+        if args.filter and args.baseline.exists():
+            # Partial run: update only the cases that were measured.
+            previous = json.loads(args.baseline.read_text(encoding="utf-8"))
+            payload["results"] = {**previous.get("results", {}), **results}
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}:")
+        for name in regressions:
+            print(f"  {name}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Benchmark cases for the generation pipeline.
+
+Each :class:`Case` times one call of a pipeline stage on one synthesized
+input.  Inputs are derived from ``examples/example_input.json`` with size
+variations that stress different paths:
+
+* ``baseline``     — the example as shipped
+* ``long_text``    — a very long ``current_process`` description
+* ``many_bullets`` — ``desired_automation`` given as hundreds of bullet lines
+* ``non_latin``    — Cyrillic / CJK / Ge'ez text that the PDF font cannot encode
+
+Import this module only after :mod:`benchmarks.run` has configured the
+environment (scratch ``OUTPUT_DIR``, result cache off).
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+from app.models.proposal import OutputFormat, ProposalInput
+from app.services.generator import _render, generate_proposal
+from app.services.pdf_export import _safe, render_pdf
+from app.services.pricing import calculate_pricing
+
+EXAMPLE_INPUT = Path(__file__).resolve().parent.parent / "examples" / "example_input.json"
+
+
+def synthesize_inputs() -> dict[str, dict]:
+    base = json.loads(EXAMPLE_INPUT.read_text(encoding="utf-8"))
+    wanted = [part.strip() for part in base["desired_automation"].split(",")]
+    return {
+        "baseline": base,
+        "long_text": {**base, "current_process": " ".join([base["current_process"]] * 60)},
+        "many_bullets": {
+            **base,
+            "desired_automation": "\n".join(
+                f"- Step {n}: {wanted[n % len(wanted)]}"
+                for n in range(300)
+            ),
+        },
+        "non_latin": {
+            **base,
+            "company_name": "Агро Бора 农业 ግብርና",
+            "main_problem": "Заказы обрабатываются вручную — 订单处理需要三天 — ትዕዛዞች በእጅ ይመዘገባሉ",
+            "current_process": "Заказы приходят через WhatsApp — 订单 — ዕቃዎች «вручную». " * 20,
+        },
+    }
+
+
+@dataclass
+class Case:
+    name: str
+    group: str
+    func: Callable[[], object]
+    # Calls per timed sample, for operations too fast to time one by one.
+    inner: int = 1
+
+
+def _pipeline_cases(inputs: dict[str, dict]) -> Iterator[Case]:
+    today = date.today()
+    markdown_only = {OutputFormat.markdown}
+
+    for industry in ("Agriculture", "Unlisted"):
+        yield Case(
+            f"pricing/{industry.lower()}",
+            "pricing",
+            lambda industry=industry: calculate_pricing(industry, 1500),
+            inner=1000,
+        )
+
+    for variant, raw in inputs.items():
+        data = ProposalInput(**raw)
+        doc = _render(data, markdown_only, "bench", today).document
+
+        yield Case(
+            f"markdown/{variant}",
+            "markdown",
+            lambda data=data: _render(data, markdown_only, "bench", today),
+        )
+        yield Case(
+            f"safe/{variant}",
+            "safe",
+            lambda text=data.current_process: _safe(text),
+            inner=1000,
+        )
+        yield Case(f"render_pdf/{variant}", "render_pdf", lambda doc=doc: render_pdf(doc))
+        yield Case(f"generate/{variant}", "generate", lambda data=data: generate_proposal(data))
+
+
+def _route_cases(client, inputs: dict[str, dict]) -> Iterator[Case]:
+    def post(url: str, **kwargs):
+        # A failing route would otherwise benchmark its error path.
+        response = client.post(url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    for variant in ("baseline", "non_latin"):
+        raw = inputs[variant]
+        yield Case(
+            f"route/generate/{variant}",
+            "route",
+            lambda raw=raw: post("/api/v1/proposals/generate", json=raw),
+        )
+        yield Case(
+            f"route/generate_markdown/{variant}",
+            "route",
+            lambda raw=raw: post("/api/v1/proposals/generate/markdown", json=raw),
+        )
+        yield Case(
+            f"route/generate_pdf/{variant}",
+            "route",
+            lambda raw=raw: post(
+                "/api/v1/proposals/generate/pdf", params={"persist": "false"}, json=raw
+            ),
+        )
+
+    leads = {
+        "industries": ["Agriculture", "Finance", "Retail", "Unlisted"] * 250,
+        "monthly_customers": [50, 400, 1500, 5000] * 250,
+    }
+    yield Case(
+        "route/quote_batch/1000",
+        "route",
+        lambda: post("/api/v1/pricing/quote/batch", json=leads),
+    )
+
+
+@contextmanager
+def cases(include_routes: bool = True) -> Iterator[list[Case]]:
+    """All benchmark cases; route cases share one in-process test client."""
+    inputs = synthesize_inputs()
+    pipeline = list(_pipeline_cases(inputs))
+    if not include_routes:
+        yield pipeline
+        return
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield pipeline + list(_route_cases(client, inputs))
+
+
+# ── Measurement ──────────────────────────────────────────────────────────────
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> float:
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    pos = (len(sorted_samples) - 1) * pct / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_samples) - 1)
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (pos - lo)
+
+
+def measure(case: Case, min_time: float, min_samples: int = 5, warmup: int = 2) -> dict:
+    """Time *case* for at least *min_time* seconds; latencies are per call, in µs."""
+    for _ in range(warmup):
+        case.func()
+
+    samples: list[float] = []
+    started = time.perf_counter()
+    while len(samples) < min_samples or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter_ns()
+        for _ in range(case.inner):
+            case.func()
+        samples.append((time.perf_counter_ns() - t0) / case.inner / 1000)
+
+    samples.sort()
+    mean = sum(samples) / len(samples)
+    return {
+        "group": case.group,
+        "samples": len(samples),
+        "calls": len(samples) * case.inner,
+        "mean_us": round(mean, 3),
+        "p50_us": round(_percentile(samples, 50), 3),
+        "p90_us": round(_percentile(samples, 90), 3),
+        "p99_us": round(_percentile(samples, 99), 3),
+        "max_us": round(samples[-1], 3),
+        "ops_per_s": round(1e6 / mean, 1),
+    }